@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for pluggable similarity backends and the on-disk vector cache
+"""
+
+import pytest
+
+from true_lies import create_scenario, validate_against_reference_dynamic
+from true_lies.backends import (
+    HashingVectorizerBackend, LexicalBackend, SimilarityBackend, VectorBackend, VectorCache,
+    get_backend, register_backend, resolve_backend,
+)
+from true_lies.semantic import calculate_semantic_similarity_metrics
+
+
+class CountingHashingBackend(HashingVectorizerBackend):
+    """Hashing backend that counts how many texts were actually encoded"""
+    
+    def __init__(self, **kwargs):
+        self.encoded = 0
+        super().__init__(**kwargs)
+    
+    def _encode(self, texts):
+        self.encoded += len(texts)
+        return super()._encode(texts)
+
+
+def _scenario(**kwargs):
+    return create_scenario(
+        facts={'price': {'extractor': 'money', 'expected': '100'}},
+        semantic_reference='The plan costs $100 per month',
+        **kwargs
+    )
+
+
+def test_builtin_backends_follow_protocol():
+    """Both shipped backends implement the protocol"""
+    assert isinstance(LexicalBackend(), SimilarityBackend)
+    assert isinstance(HashingVectorizerBackend(), SimilarityBackend)
+
+
+def test_lexical_backend_matches_legacy_metrics():
+    """The default backend keeps the historical scores"""
+    reference = "the plan costs $100 per month"
+    candidate = "The plan is $100 monthly"
+    batch = LexicalBackend().score_batch(reference, [candidate], {'100': 2.0})
+    assert batch[0] == calculate_semantic_similarity_metrics(reference, candidate, {'100': 2.0})
+
+
+def test_hashing_backend_scores():
+    """Identical texts score 1.0 and unrelated texts score lower"""
+    backend = HashingVectorizerBackend(n_features=256)
+    scores = backend.score_batch("the plan costs 100", ["the plan costs 100", "weather is sunny"])
+    assert scores[0]['final_score'] == pytest.approx(1.0, abs=1e-6)
+    assert scores[1]['final_score'] < scores[0]['final_score']
+
+
+def test_hashing_backend_never_encodes_twice():
+    """Repeated references and candidates are served from the cache"""
+    backend = CountingHashingBackend(n_features=64)
+    backend.score_batch("reference", ["a", "b", "a"])
+    assert backend.encoded == 3
+    backend.score_batch("reference", ["a", "b", "c"])
+    assert backend.encoded == 4
+
+
+def test_vector_cache_persists_across_instances(tmp_path):
+    """Vectors written by one backend instance are reused by the next"""
+    first = CountingHashingBackend(n_features=32, cache_dir=str(tmp_path))
+    vectors = first.encode_batch(["hello world", "goodbye"])
+    first.disk_cache.close()
+    
+    second = CountingHashingBackend(n_features=32, cache_dir=str(tmp_path))
+    again = second.encode_batch(["goodbye", "hello world"])
+    assert second.encoded == 0
+    assert again[1] == pytest.approx(vectors[0], abs=1e-6)
+
+
+def test_scores_do_not_depend_on_cache_state(tmp_path):
+    """Freshly encoded and disk-cached vectors give identical scores"""
+    reference, candidate = "The plan costs $100 per month", "Monthly plan price is $100"
+    cold = HashingVectorizerBackend(n_features=64, cache_dir=str(tmp_path))
+    cold_score = cold.score_batch(reference, [candidate])[0]['final_score']
+    warm_score = cold.score_batch(reference, [candidate])[0]['final_score']
+    cold.disk_cache.close()
+    
+    from_disk = HashingVectorizerBackend(n_features=64, cache_dir=str(tmp_path))
+    disk_score = from_disk.score_batch(reference, [candidate])[0]['final_score']
+    assert cold_score == warm_score == disk_score
+
+
+def test_vector_cache_rejects_wrong_dimension(tmp_path):
+    """Vectors of the wrong size are not written"""
+    cache = VectorCache(str(tmp_path), dim=4, namespace='test')
+    with pytest.raises(ValueError):
+        cache.put_many({'key': [1.0, 2.0]})
+    assert len(cache) == 0
+
+
+def test_vector_backend_requires_encode():
+    """A vector backend without _encode fails when it is constructed"""
+    class NoEncodeBackend(VectorBackend):
+        name = 'no-encode'
+        dim = 8
+    
+    with pytest.raises(TypeError):
+        NoEncodeBackend()
+
+
+def test_scenario_selects_backend():
+    """validate_against_reference_dynamic uses the scenario's backend"""
+    lexical = validate_against_reference_dynamic("The plan costs $100 per month", _scenario())
+    hashing = validate_against_reference_dynamic(
+        "The plan costs $100 per month", _scenario(similarity_backend='hashing')
+    )
+    assert lexical['factual_accuracy'] and hashing['factual_accuracy']
+    assert hashing['similarity_score'] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_register_custom_backend():
+    """Custom backends can be registered and resolved by name"""
+    class ConstantBackend:
+        name = 'constant'
+        
+        def encode_batch(self, texts):
+            return [[1.0] for _ in texts]
+        
+        def score_batch(self, reference, candidates, fact_weights=None):
+            return [{'final_score': 0.5} for _ in candidates]
+    
+    register_backend('constant', ConstantBackend)
+    assert isinstance(resolve_backend('constant'), ConstantBackend)
+    result = validate_against_reference_dynamic("The plan costs $100", _scenario(), backend='constant')
+    assert result['similarity_score'] == 0.5
+
+
+def test_unknown_backend_raises():
+    """Unknown backend names raise ValueError"""
+    with pytest.raises(ValueError):
+        get_backend('does-not-exist')
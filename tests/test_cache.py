@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU caching layer of pure analysis functions
+"""
+
+import threading
+from unittest import mock
+
+from true_lies import POLARITY_PATTERNS, detect_polarity, extract_fact
+from true_lies import cache as cache_module
+from true_lies.cache import (
+    LRUCache, cache_stats, caching, clear_caches, is_caching_enabled,
+)
+from true_lies.semantic import apply_semantic_mappings, calculate_semantic_similarity_metrics
+
+
+def test_lru_eviction_and_counters():
+    """Least recently used entries are evicted and counted"""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1      # 'a' becomes most recent
+    cache.put('c', 3)               # evicts 'b'
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 1
+    assert len(cache) == 2
+    cache.get('b')
+    assert cache.stats()['misses'] == 1
+
+
+def test_caching_disabled_by_default():
+    """Caching is opt-in and the context manager restores the previous state"""
+    assert not is_caching_enabled()
+    with caching():
+        assert is_caching_enabled()
+    assert not is_caching_enabled()
+
+
+def test_memoized_functions_hit_on_repeated_inputs():
+    """Repeated identical calls are served from the cache"""
+    clear_caches()
+    config = {'extractor': 'money', 'expected': '100'}
+    with caching():
+        for _ in range(3):
+            assert detect_polarity("The loan was approved") == 'positive'
+            assert extract_fact("It costs $100", config) == '100'
+    stats = cache_stats()
+    assert stats['detect_polarity']['hits'] == 2
+    assert stats['detect_polarity']['misses'] == 1
+    assert stats['extract_fact']['hits'] == 2
+
+
+def test_config_change_is_a_cache_miss():
+    """Changing the config fingerprint never returns a stale value"""
+    clear_caches()
+    with caching():
+        assert apply_semantic_mappings("the cost", {'price': ['cost']}) == "the price"
+        assert apply_semantic_mappings("the cost", {'amount': ['cost']}) == "the amount"
+    assert cache_stats()['apply_semantic_mappings']['hits'] == 0
+
+
+def test_fingerprints_are_not_recomputed_per_call():
+    """The lexicon and a repeated config are fingerprinted once, not on every call"""
+    clear_caches()
+    config = {'extractor': 'money', 'expected': '100'}
+    with caching():
+        extract_fact("It costs $100", config)
+        detect_polarity("The loan was approved")
+        with mock.patch.object(cache_module.json, 'dumps', wraps=cache_module.json.dumps) as dumps:
+            for i in range(20):
+                extract_fact(f"It costs ${i}", config)
+                detect_polarity(f"The loan {i} was approved")
+    assert dumps.call_count == 0
+
+
+def test_in_place_changes_are_cache_misses():
+    """Mutating a config or the lexicon in place never returns a stale value"""
+    clear_caches()
+    mappings = {'price': ['cost']}
+    with caching():
+        assert apply_semantic_mappings("the fee", mappings) == "the fee"
+        mappings['price'].append('fee')
+        assert apply_semantic_mappings("the fee", mappings) == "the price"
+        assert detect_polarity("the deal was splendid") == 'neutral'
+        POLARITY_PATTERNS['positive'].append('splendid')
+        try:
+            assert detect_polarity("the deal was splendid") == 'positive'
+        finally:
+            POLARITY_PATTERNS['positive'].remove('splendid')
+        assert detect_polarity("the deal was splendid") == 'neutral'
+
+
+def test_cached_dicts_are_copies():
+    """Callers mutating a cached result do not corrupt the cache"""
+    clear_caches()
+    with caching():
+        first = calculate_semantic_similarity_metrics("red car", "red car")
+        first['final_score'] = -1
+        second = calculate_semantic_similarity_metrics("red car", "red car")
+    assert second['final_score'] > 0
+
+
+def test_maxsize_bounds_cache():
+    """The context manager maxsize bounds each function cache"""
+    clear_caches()
+    with caching(maxsize=5):
+        for i in range(20):
+            detect_polarity(f"text number {i}")
+        stats = cache_stats()['detect_polarity']
+    assert stats['size'] == 5
+    assert stats['evictions'] == 15
+
+
+def test_thread_safety():
+    """Concurrent access keeps consistent counters"""
+    cache = LRUCache(maxsize=50)
+    
+    def worker():
+        for i in range(200):
+            cache.get(i % 60)
+            cache.put(i % 60, i)
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 800
+    assert stats['size'] <= 50
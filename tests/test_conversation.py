@@ -13,7 +13,10 @@ import os
 # Agregar el directorio padre al path para importar true_lies
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from unittest import mock
+
 from true_lies import ConversationValidator
+from true_lies import conversation
 
 
 class TestConversationValidator(unittest.TestCase):
@@ -526,6 +529,346 @@ class TestConversationValidatorIntegration(unittest.TestCase):
         self.assertTrue(retention['annual_income_retained'])
 
 
+class TestCompiledDetectors(unittest.TestCase):
+    """Tests para los detectores compilados por fact."""
+    
+    def test_resolve_fact_type_from_name(self):
+        """Los tipos se infieren del nombre con la misma prioridad de siempre."""
+        self.assertEqual(conversation.resolve_fact_type('client_name'), 'name')
+        self.assertEqual(conversation.resolve_fact_type('loan_amount'), 'amount')
+        self.assertEqual(conversation.resolve_fact_type('ssn'), 'id')
+        self.assertEqual(conversation.resolve_fact_type('favorite_color'), 'generic')
+    
+    def test_explicit_fact_types(self):
+        """Un tipo explícito reemplaza la heurística por nombre."""
+        conv = ConversationValidator(fact_types={'ref': 'amount'})
+        conv.add_turn("Budget is $2,500", "Noted", {'ref': '2500'})
+        
+        result = conv.validate_retention("We reserved 2,500 for you", ['ref'])
+        self.assertTrue(result['ref_retained'])
+        self.assertEqual(result['ref_detected'], '2,500')
+    
+    def test_invalid_fact_type(self):
+        """Un tipo desconocido falla al crear el validador."""
+        with self.assertRaises(ValueError):
+            ConversationValidator(fact_types={'ref': 'currency'})
+    
+    def test_detectors_built_once(self):
+        """validate_retention reutiliza los detectores construidos en add_turn."""
+        conv = ConversationValidator()
+        with mock.patch.object(conversation, 'build_detector', wraps=conversation.build_detector) as build:
+            conv.add_turn("I'm Sarah Johnson, user 12345", "Hello", {'client_name': 'Sarah Johnson', 'user_id': '12345'})
+            built = build.call_count
+            for _ in range(5):
+                result = conv.validate_retention("Sarah, ID 12345", ['client_name', 'user_id'])
+            self.assertEqual(build.call_count, built)
+        self.assertTrue(result['all_retained'])
+
+
+class TestRetentionBatch(unittest.TestCase):
+    """Tests para validate_retention_batch."""
+    
+    RESPONSES = [
+        "Sarah, your $360,000 loan at TechCorp is approved",
+        "Sarah, your loan is approved",
+        "Your $360,000 loan is approved",
+    ]
+    FACTS = ['client_name', 'loan_amount', 'employer']
+    
+    def setUp(self):
+        self.conv = ConversationValidator()
+        self.conv.add_turn(
+            user_input="I'm Sarah Johnson from TechCorp, I need $360,000",
+            bot_response="Noted",
+            expected_facts={'client_name': 'Sarah Johnson', 'loan_amount': '360000', 'employer': 'TechCorp'}
+        )
+    
+    def test_batch_matches_individual_calls(self):
+        """Cada resultado coincide con validate_retention."""
+        batch = self.conv.validate_retention_batch(self.RESPONSES, self.FACTS)
+        expected = [self.conv.validate_retention(r, self.FACTS) for r in self.RESPONSES]
+        self.assertEqual(batch['results'], expected)
+    
+    def test_aggregate_statistics(self):
+        """El agregado resume la variación de retención del lote."""
+        aggregate = self.conv.validate_retention_batch(self.RESPONSES, self.FACTS)['aggregate']
+        
+        self.assertEqual(aggregate['responses'], 3)
+        self.assertAlmostEqual(aggregate['mean_retention'], (1.0 + 1 / 3 + 1 / 3) / 3)
+        self.assertAlmostEqual(aggregate['min_retention'], 1 / 3)
+        self.assertEqual(aggregate['max_retention'], 1.0)
+        self.assertAlmostEqual(aggregate['all_retained_rate'], 1 / 3)
+        self.assertAlmostEqual(aggregate['per_fact_retention']['client_name'], 2 / 3)
+        self.assertAlmostEqual(aggregate['per_fact_retention']['employer'], 1 / 3)
+    
+    def test_process_pool(self):
+        """Con workers el resultado es idéntico al secuencial."""
+        responses = self.RESPONSES * 4
+        sequential = self.conv.validate_retention_batch(responses, self.FACTS + ['missing'])
+        parallel = self.conv.validate_retention_batch(responses, self.FACTS + ['missing'], workers=2)
+        self.assertEqual(parallel, sequential)
+
+
+class TestRetentionTracking(unittest.TestCase):
+    """Tests para la curva de retención incremental (track_retention)."""
+    
+    def test_forgotten_at_summary(self):
+        """Cada fact registra en qué turno deja de aparecer."""
+        conv = ConversationValidator(track_retention=True)
+        conv.add_turn("I'm Sarah Johnson, loan $360,000", "Hi Sarah", {'client_name': 'Sarah Johnson', 'loan_amount': '360000'})
+        conv.add_turn("ok", "Sarah, your $360,000 loan is in review", {})
+        conv.add_turn("ok", "Sarah, still processing", {})
+        conv.add_turn("ok", "Done", {})
+        
+        curve = conv.get_retention_curve()
+        self.assertEqual(curve['curve'], [1.0, 1.0, 0.5, 0.0])
+        self.assertEqual(curve['matrix'][2]['retained'], {'client_name': True, 'loan_amount': False})
+        self.assertEqual(curve['facts']['loan_amount']['forgotten_at'], 3)
+        self.assertEqual(curve['facts']['client_name']['forgotten_at'], 4)
+        self.assertEqual(curve['facts']['client_name']['introduced_at'], 1)
+    
+    def test_matches_per_turn_validate_retention(self):
+        """La matriz coincide con llamar validate_retention en cada turno."""
+        turns = [
+            ("I'm Carlos, ID 12345", "Hello Carlos", {'customer_name': 'Carlos', 'user_id': '12345'}),
+            ("I work at TechCorp", "Carlos from TechCorp, noted", {'employer': 'TechCorp'}),
+            ("Thanks", "Ticket 12345 for TechCorp created", {}),
+        ]
+        tracked = ConversationValidator(track_retention=True)
+        for user_input, bot_response, facts in turns:
+            tracked.add_turn(user_input, bot_response, facts)
+        
+        rebuilt = ConversationValidator()
+        for row, (user_input, bot_response, facts) in zip(tracked.get_retention_curve()['matrix'], turns):
+            previous = list(rebuilt.conversation_facts)
+            result = rebuilt.validate_retention(bot_response, previous)
+            self.assertEqual(row['retained'], {name: result[f'{name}_retained'] for name in previous})
+            rebuilt.add_turn(user_input, bot_response, facts)
+    
+    def test_disabled_by_default(self):
+        """Sin track_retention no se calcula nada."""
+        conv = ConversationValidator()
+        conv.add_turn("I'm Sarah", "Hi Sarah", {'client_name': 'Sarah'})
+        self.assertEqual(conv.get_retention_curve()['matrix'], [])
+
+
+class TestFactTimeline(unittest.TestCase):
+    """Tests para la línea de tiempo de facts que cambian."""
+    
+    def setUp(self):
+        self.conv = ConversationValidator()
+        self.conv.add_turn("I need $300,000", "Noted, $300,000", {'loan_amount': '300000'})
+        self.conv.add_turn("My name is Ana Diaz", "Hi Ana", {'client_name': 'Ana Diaz'})
+        self.conv.add_turn("Actually make it $360,000", "Updated to $360,000", {'loan_amount': '360000'})
+        self.conv.add_turn("Confirm $360,000", "Confirmed 360,000", {'loan_amount': '360000'})
+    
+    def test_timeline_versions(self):
+        """Cada cambio real crea una versión; repetir el valor no."""
+        self.assertEqual(self.conv.get_fact_timeline('loan_amount'), [(1, '$300,000'), (3, '$360,000')])
+        self.assertEqual(self.conv.fact_value_at('loan_amount', 2), '$300,000')
+        self.assertEqual(self.conv.fact_value_at('loan_amount', 10), '$360,000')
+        self.assertIsNone(self.conv.fact_value_at('client_name', 1))
+    
+    def test_validate_as_of_turn(self):
+        """as_of_turn valida contra el valor vigente en ese turno."""
+        response = "Ana, your $300,000 loan is approved"
+        self.assertFalse(self.conv.validate_retention(response, ['loan_amount'])['loan_amount_retained'])
+        
+        result = self.conv.validate_retention(response, ['loan_amount', 'client_name'], as_of_turn=2)
+        self.assertTrue(result['all_retained'])
+        
+        result = self.conv.validate_retention(response, ['client_name'], as_of_turn=1)
+        self.assertFalse(result['client_name_retained'])
+    
+    def test_stale_value_detection(self):
+        """Repetir un valor reemplazado se reporta como obsoleto."""
+        result = self.conv.validate_retention("Your $300,000 loan is approved", ['loan_amount'])
+        self.assertEqual(result['stale_facts'], ['loan_amount'])
+        self.assertEqual(result['loan_amount_stale_value'], '$300,000')
+        
+        result = self.conv.validate_retention("Your $360,000 loan is approved", ['loan_amount'])
+        self.assertEqual(result['stale_facts'], [])
+        self.assertTrue(result['loan_amount_retained'])
+    
+    def test_corrections_sharing_a_token(self):
+        """Una corrección que comparte palabras con el valor anterior crea una versión."""
+        conv = ConversationValidator(fact_types={'code': 'generic'})
+        conv.add_turn("I'm Sarah Johnson from TechCorp Inc, code 5", "Hi Sarah",
+                      {'client_name': 'Sarah Johnson', 'employer': 'TechCorp Inc', 'code': '5'})
+        conv.add_turn("Sorry, Sarah Smith from TechCorp Labs, code 15", "Updated",
+                      {'client_name': 'Sarah Smith', 'employer': 'TechCorp Labs', 'code': '15'})
+        
+        for fact_name, old, new in [('client_name', 'Sarah Johnson', 'Sarah Smith'),
+                                    ('employer', 'TechCorp Inc', 'TechCorp Labs'),
+                                    ('code', '5', '15')]:
+            self.assertEqual(conv.get_fact_timeline(fact_name), [(1, old), (2, new)])
+            self.assertEqual(conv.fact_value_at(fact_name, 2), conv.conversation_facts[fact_name])
+        
+        facts = ['client_name', 'employer', 'code']
+        result = conv.validate_retention("Sarah Johnson at TechCorp Inc, code 5", facts)
+        self.assertEqual(result['stale_facts'], facts)
+        self.assertEqual(result['client_name_stale_value'], 'Sarah Johnson')
+        
+        result = conv.validate_retention("Sarah Smith at TechCorp Labs, code 15", facts)
+        self.assertEqual(result['stale_facts'], [])
+        self.assertTrue(result['all_retained'])
+
+
+class TestSerialization(unittest.TestCase):
+    """Tests para guardar y restaurar el estado de la conversación."""
+    
+    def setUp(self):
+        self.conv = ConversationValidator(fact_types={'ref': 'id'}, track_retention=True, max_turns_in_memory=2)
+        self.conv.add_turn("I need $300,000, ref ABC-1", "Noted", {'loan_amount': '300000', 'ref': 'ABC-1'})
+        self.conv.add_turn("My name is Ana Diaz", "Hi Ana, $300,000 noted", {'client_name': 'Ana Diaz'})
+        self.conv.add_turn("Make it $360,000", "Updated to $360,000", {'loan_amount': '360000'})
+    
+    def _assert_same_state(self, restored):
+        self.assertEqual(restored.conversation_facts, self.conv.conversation_facts)
+        self.assertEqual(restored.get_fact_timeline('loan_amount'), self.conv.get_fact_timeline('loan_amount'))
+        self.assertEqual(len(restored.turn_history), 3)
+        self.assertEqual(list(restored.turn_history), list(self.conv.turn_history))
+        self.assertEqual(restored.get_retention_curve(), self.conv.get_retention_curve())
+        response = "Ana, ref ABC-1: your $300,000 loan is approved"
+        facts = ['client_name', 'loan_amount', 'ref']
+        self.assertEqual(restored.validate_retention(response, facts),
+                         self.conv.validate_retention(response, facts))
+    
+    def test_bytes_round_trip(self):
+        """from_bytes restaura facts, historial, línea de tiempo y retención."""
+        data = self.conv.to_bytes()
+        self.assertTrue(data.startswith(b'TLCV'))
+        self.assertLess(len(data), len(self.conv.to_json().encode('utf-8')))
+        self._assert_same_state(ConversationValidator.from_bytes(data))
+    
+    def test_json_round_trip_and_resume(self):
+        """Un validador restaurado puede seguir la conversación."""
+        restored = ConversationValidator.from_json(self.conv.to_json())
+        self._assert_same_state(restored)
+        restored.add_turn("Thanks", "Ana, $360,000 approved", {})
+        self.assertEqual(len(restored.turn_history), 4)
+        self.assertEqual(restored.turn_history.in_memory, 2)
+        self.assertEqual(restored.get_retention_curve()['curve'][-1], 2 / 3)
+    
+    def test_restore_uses_stored_detector_types(self):
+        """Los tipos de detector guardados evitan inferirlos de nuevo."""
+        data = self.conv.to_bytes()
+        with mock.patch.object(conversation, 'resolve_fact_type', side_effect=AssertionError):
+            restored = ConversationValidator.from_bytes(data)
+            restored.validate_retention("Ana, $360,000", ['client_name', 'loan_amount'])
+    
+    def test_rejects_unknown_data(self):
+        """Datos ajenos o de otra versión se rechazan con ValueError."""
+        with self.assertRaises(ValueError):
+            ConversationValidator.from_bytes(b'not a validator')
+        with self.assertRaises(ValueError):
+            ConversationValidator.from_bytes(b'TLCV\x63' + self.conv.to_bytes()[5:])
+        with self.assertRaises(ValueError):
+            ConversationValidator.from_json('{"format": "true_lies.conversation", "version": 99}')
+
+
+class TestFullConversationValidation(unittest.TestCase):
+    """Tests para la validación core de validate_full_conversation."""
+    
+    def setUp(self):
+        self.conv = ConversationValidator()
+        self.conv.add_turn("I'm Sarah Johnson, SSN 123-45-6789", "Hello Sarah!",
+                           {'client_name': 'Sarah Johnson', 'ssn': '123-45-6789'})
+        self.conv.add_turn("I work at TechCorp, salary $95,000", "Noted",
+                           {'employer': 'TechCorp', 'salary': '95000'})
+        self.facts = ['client_name', 'salary', 'employer', 'ssn']
+    
+    def test_extractors_exist(self):
+        """Cada fact se mapea a un extractor existente (no 'currency')."""
+        from true_lies.utils import GENERIC_EXTRACTORS
+        
+        names = ['loan_amount', 'start_date', 'interest_percentage', 'work_hours', 'email', 'phone', 'client_name', 'ref']
+        for fact_name in names:
+            self.assertIn(self.conv._get_extractor_type(fact_name), GENERIC_EXTRACTORS)
+        self.assertEqual(self.conv._get_extractor_type('loan_amount'), 'money')
+        self.assertEqual(self.conv._get_extractor_type('start_date'), 'date')
+    
+    def test_real_core_validation(self):
+        """La similitud, la polaridad y los facts se calculan de verdad."""
+        good = self.conv.validate_full_conversation(
+            "Sarah Johnson, SSN 123-45-6789: your $95,000 salary at TechCorp is verified", self.facts,
+            similarity_threshold=0.5
+        )['core_validation']
+        self.assertTrue(good['factual_accuracy'])
+        self.assertTrue(good['is_valid'])
+        self.assertEqual(good['extracted_salary'], '$95,000')
+        
+        bad = self.conv.validate_full_conversation(
+            "Sorry Sarah, your $80,000 salary at TechCorp could not be verified", self.facts,
+            similarity_threshold=0.5
+        )['core_validation']
+        self.assertFalse(bad['salary_accuracy'])
+        self.assertFalse(bad['ssn_accuracy'])
+        self.assertLess(bad['similarity_score'], good['similarity_score'])
+        self.assertFalse(bad['is_valid'])
+    
+    def test_default_threshold_without_reference(self):
+        """Sin referencia real, una respuesta correcta es válida con el umbral por defecto."""
+        good = self.conv.validate_full_conversation(
+            "Thanks for waiting, Sarah Johnson. I reviewed your application: the $95,000 salary from "
+            "TechCorp and SSN 123-45-6789 are all verified and your file moves to underwriting today.",
+            self.facts
+        )['core_validation']
+        self.assertLess(good['similarity_score'], 0.8)
+        self.assertTrue(good['is_valid'])
+        self.assertIsNone(good['failure_reason'])
+        
+        bad = self.conv.validate_full_conversation(
+            "Sorry Sarah, your $80,000 salary at TechCorp could not be verified", self.facts
+        )['core_validation']
+        self.assertFalse(bad['is_valid'])
+        self.assertEqual(bad['failure_reason'], "Factual accuracy issues detected")
+    
+    def test_caller_reference(self):
+        """Con reference, la similitud con ella decide is_valid."""
+        reference = "Sarah Johnson, SSN 123-45-6789: your $95,000 salary at TechCorp is verified"
+        same = self.conv.validate_full_conversation(reference, self.facts, reference=reference)['core_validation']
+        self.assertTrue(same['is_valid'])
+        
+        other = self.conv.validate_full_conversation(
+            "Sarah Johnson 123-45-6789 $95,000 TechCorp", self.facts,
+            similarity_threshold=0.99, reference=reference
+        )['core_validation']
+        self.assertTrue(other['factual_accuracy'])
+        self.assertFalse(other['is_valid'])
+    
+    def test_scenario_cache_keyed_by_backend_fingerprint(self):
+        """Backends con otros parámetros compilan otro escenario; la caché está acotada."""
+        from true_lies.backends import HashingVectorizerBackend
+        response = "Sarah, $95,000 at TechCorp"
+        with mock.patch.object(conversation, 'compile_scenario', wraps=conversation.compile_scenario) as compile_mock:
+            self.conv.validate_full_conversation(response, self.facts, backend=HashingVectorizerBackend(n_features=64))
+            self.conv.validate_full_conversation(response, self.facts, backend=HashingVectorizerBackend(n_features=64))
+            self.assertEqual(compile_mock.call_count, 1)
+            self.conv.validate_full_conversation(response, self.facts, backend=HashingVectorizerBackend(n_features=128))
+            self.assertEqual(compile_mock.call_count, 2)
+        
+        for index in range(conversation.MAX_CORE_SCENARIOS + 5):
+            self.conv.validate_full_conversation(response, self.facts, reference=f"Reference {index}")
+        self.assertEqual(len(self.conv._core_scenarios), conversation.MAX_CORE_SCENARIOS)
+    
+    def test_semantic_reference_uses_all_facts(self):
+        reference = self.conv._build_semantic_reference(['employer', 'ssn'])
+        self.assertEqual(reference, "Employer: TechCorp. Ssn: 123-45-6789")
+    
+    def test_scenario_compiled_once_per_fact_version(self):
+        """El escenario se reutiliza entre respuestas y se recompila si cambian los facts."""
+        with mock.patch.object(conversation, 'compile_scenario', wraps=conversation.compile_scenario) as compile_mock:
+            for response in ("Sarah, $95,000 at TechCorp", "Sarah Johnson at TechCorp", "SSN 123-45-6789"):
+                self.conv.validate_full_conversation(response, self.facts)
+            self.assertEqual(compile_mock.call_count, 1)
+            
+            self.conv.add_turn("Actually it's $99,000", "Updated", {'salary': '99000'})
+            result = self.conv.validate_full_conversation("Sarah, $99,000 at TechCorp", self.facts)
+            self.assertEqual(compile_mock.call_count, 2)
+            self.assertTrue(result['core_validation']['salary_accuracy'])
+
+
 if __name__ == '__main__':
     # Ejecutar tests
     unittest.main(verbosity=2)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for candidate deduplication (exact duplicates and MinHash/LSH clusters)
+"""
+
+from unittest import mock
+
+from true_lies import create_scenario, runner, validate_llm_candidates
+from true_lies.dedup import deduplicate_candidates, estimate_jaccard, minhash_signature
+
+
+def _scenario():
+    return create_scenario(
+        facts={'price': {'extractor': 'money', 'expected': '100'}},
+        semantic_reference='The premium plan costs $100 per month with unlimited data'
+    )
+
+
+CANDIDATES = [
+    "The premium plan costs $100 per month with unlimited data",
+    "the premium plan   costs $100 per month with unlimited data",
+    "The premium plan costs $100 per month, with unlimited data!",
+    "Our basic plan is $20 and has no data included",
+]
+
+
+def test_exact_duplicates_after_normalization():
+    """Case and whitespace differences collapse into one representative"""
+    plan = deduplicate_candidates(CANDIDATES, near_duplicates=False)
+    
+    assert plan['exact_of'] == [0, 0, 2, 3]
+    assert plan['unique'] == [0, 2, 3]
+    assert plan['exact_counts'][0] == 2
+    assert plan['stats']['exact_duplicates'] == 1
+
+
+def test_near_duplicates_cluster_together():
+    """Punctuation-only variants share a cluster; unrelated text does not"""
+    plan = deduplicate_candidates(CANDIDATES)
+    
+    assert plan['cluster_of'] == [0, 0, 0, 3]
+    assert plan['clusters'][0] == [0, 1, 2]
+    assert plan['stats']['largest_cluster'] == 3
+    assert estimate_jaccard(minhash_signature(CANDIDATES[0]), minhash_signature(CANDIDATES[3])) < 0.5
+
+
+def test_validate_llm_candidates_dedup_validates_once():
+    """Exact duplicates are validated once and fanned out with report fields"""
+    with mock.patch.object(runner, 'validate_candidates_batch', wraps=runner.validate_candidates_batch) as batch:
+        run = validate_llm_candidates(_scenario(), CANDIDATES, threshold=0.5, dedup=True)
+    
+    assert len(batch.call_args.args[0]) == 3
+    first, duplicate = run['results'][0], run['results'][1]
+    assert first['represents'] == 2 and first['duplicate_of'] is None
+    assert duplicate['duplicate_of'] == 1 and duplicate['represents'] == 0
+    assert duplicate['result'] == first['result'] and duplicate['result'] is not first['result']
+    assert run['dedup']['unique'] == 3
+    
+    plain = validate_llm_candidates(_scenario(), CANDIDATES, threshold=0.5)
+    for entry, expected in zip(run['results'], plain['results']):
+        if entry['duplicate_of'] is None:
+            assert entry['result'] == expected['result']
+
+
+def test_approximate_mode_scores_only_leaders():
+    """Non-leader cluster members reuse the leader's semantic score"""
+    run = validate_llm_candidates(_scenario(), CANDIDATES, threshold=0.5, approximate=True)
+    
+    leader, member = run['results'][0]['result'], run['results'][2]['result']
+    assert member['approximated'] is True
+    assert member['similarity_score'] == leader['similarity_score']
+    assert member['extracted_price'] == '100'
+    assert 'approximated' not in run['results'][3]['result']
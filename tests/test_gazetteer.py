@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the conversation-level entity gazetteer
+"""
+
+import itertools
+
+import pytest
+
+from true_lies import ConversationValidator
+from true_lies.conversation import build_detector
+from true_lies.gazetteer import Gazetteer
+
+PATTERNS = ['ana', 'anabel', 'ana diaz', 'diaz', 'techcorp', 'techcorp inc', 'inc', 'user-1', 'user-12', 'a.b']
+TEXTS = ['Anabel Diaz at TechCorp Inc', 'USER-12 and user-1', 'nothing here', '', 'aXb a.b', 'ana diaz']
+
+
+@pytest.mark.parametrize('min_patterns', [0, 1000])
+def test_scan_matches_substring_search(min_patterns):
+    """Overlapping and prefix patterns are all reported, with or without the automaton"""
+    gazetteer = Gazetteer(min_patterns=min_patterns)
+    gazetteer.add(PATTERNS)
+    assert gazetteer.uses_automaton is (min_patterns == 0)
+    
+    for text in TEXTS:
+        expected = {pattern for pattern in PATTERNS if pattern in text.lower()}
+        assert set(gazetteer.entities_in(text)) == expected
+        matcher = gazetteer.matcher(text)
+        assert all(matcher(pattern) == (pattern in text.lower()) for pattern in PATTERNS + [''])
+
+
+def test_scan_is_shared_and_updated_incrementally():
+    gazetteer = Gazetteer(min_patterns=0)
+    gazetteer.add(['sarah'])
+    text = "Sarah works at TechCorp"
+    assert gazetteer.scan(text) is gazetteer.scan(text)
+    
+    gazetteer.add(['techcorp'])
+    assert gazetteer.entities_in(text) == ['sarah', 'techcorp']
+
+
+def test_gazetteer_detectors_match_plain_detectors():
+    """Name, employer and ID rules give the same answers on top of the gazetteer"""
+    values = {
+        'name': ['Ana Diaz', 'Sarah Jane Johnson', 'Bob'],
+        'employer': ['TechCorp Inc', 'Acme Co', 'Inc LLC'],
+        'id': ['USER-1', 'ABC-9'],
+    }
+    gazetteer = Gazetteer(min_patterns=0)
+    pairs = [
+        (build_detector(fact_type, value), build_detector(fact_type, value, gazetteer))
+        for fact_type, fact_values in values.items() for value in fact_values
+    ]
+    responses = TEXTS + ['Sarah Johnson, ABC-9', 'inc llc corp', 'Bob at Acme']
+    for response, (plain, indexed) in itertools.product(responses, pairs):
+        assert indexed(response) == plain(response)
+
+
+def test_validator_registers_entities_in_add_turn():
+    conv = ConversationValidator()
+    conv.add_turn("I'm Sarah Johnson from TechCorp Inc, ID USER-7", "Hello Sarah",
+                  {'client_name': 'Sarah Johnson', 'employer': 'TechCorp Inc', 'user_id': 'USER-7', 'loan_amount': '1000'})
+    
+    assert all(entity in conv.gazetteer for entity in ('sarah', 'johnson', 'techcorp inc', 'techcorp', 'user-7'))
+    assert conv.gazetteer.entities_in("Sarah, TechCorp approved it") == ['sarah', 'techcorp']
+    
+    result = conv.validate_retention("Sarah, USER-7 at TechCorp is approved", ['client_name', 'employer', 'user_id'])
+    assert result['all_retained'] is True
+    
+    conv.clear_conversation()
+    assert len(conv.gazetteer) == 0
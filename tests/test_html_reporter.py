@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming HTML report writer
+"""
+
+import base64
+import json
+import re
+from array import array
+
+import pytest
+
+from true_lies.html_reporter import HTMLReporter, MetricsAccumulator, ResultsIndex, _lttb
+
+
+def _results(count):
+    return [
+        {
+            'retention_score': (i % 10) / 10,
+            'all_retained': i % 3 == 0,
+            'facts_retained': i % 4,
+            'total_facts': 3,
+            'facts_info': {'amount': {'accuracy': i % 2 == 0, 'expected': '$1,000', 'found': '$1,000'}},
+            'timestamp': '2026-01-01T10:00:00',
+        }
+        for i in range(count)
+    ]
+
+
+def test_accumulator_matches_metrics_and_merges():
+    """Merged partial accumulators give the metrics of the whole set"""
+    results = _results(25)
+    whole = MetricsAccumulator()
+    for result in results:
+        whole.add(result)
+    left, right = MetricsAccumulator(), MetricsAccumulator()
+    for result in results[:10]:
+        left.add(result)
+    for result in results[10:]:
+        right.add(result)
+    
+    metrics = left.merge(right).to_metrics()
+    assert metrics == whole.to_metrics()
+    assert metrics['total_candidates'] == 25
+    assert metrics['passed'] == 9
+    assert sum(metrics['score_distribution'].values()) == 25
+    assert left.factual_accuracy == 52.0
+    assert MetricsAccumulator().to_metrics()['score_distribution'] == {}
+
+
+def _data_chunks(html):
+    return [json.loads(block) for block in re.findall(
+        r'<script type="application/json" class="results-data">(.*?)</script>', html
+    )]
+
+
+def test_streamed_report_embeds_columnar_chunks(tmp_path):
+    """Results are embedded as chunk_size columnar blocks; no rows are rendered in Python"""
+    reporter = HTMLReporter()
+    results = _results(23)
+    output = tmp_path / 'report.html'
+    
+    reporter.generate_report(results, str(output), save_to_history=False, chunk_size=5)
+    
+    html = output.read_text(encoding='utf-8')
+    chunks = _data_chunks(html)
+    assert [chunk['start'] for chunk in chunks] == [1, 6, 11, 16, 21]
+    assert sum((chunk['score'] for chunk in chunks), []) == [result['retention_score'] for result in results]
+    assert chunks[0]['pass'] == [1, 0, 0, 1, 0]
+    assert chunks[0]['date'][0] == '01/01/2026 10:00'
+    assert 'data-candidate-id="1"' not in html
+    assert 'console.log' not in html
+    assert 'id="resultsIndex"' in html
+    assert 'id="resultsSearch"' in html
+    assert html.rstrip().endswith('</html>')
+
+
+def test_payload_escapes_script_end():
+    """Details containing '</script>' cannot close the data block early"""
+    reporter = HTMLReporter()
+    chunk = reporter._render_data_chunk(1, [(1.0, 1, 1, 1, 'N/A', '<b>x</b></script>')])
+    
+    assert chunk.count('</script>') == 1
+    assert json.loads(re.search(r'>(.*)</script>', chunk).group(1))['details'] == ['<b>x</b></script>']
+
+
+def test_empty_report(tmp_path):
+    """An empty result set renders the no-results block"""
+    reporter = HTMLReporter()
+    output = tmp_path / 'empty.html'
+    
+    reporter.generate_report([], str(output), save_to_history=False)
+    
+    assert 'No results to display.' in output.read_text(encoding='utf-8')
+
+
+def test_sort_permutations_and_search_index():
+    """Permutations are stable ascending orders; postings are delta-encoded row positions"""
+    index = ResultsIndex()
+    rows = [
+        (0.9, 1, 2, 2, '02/01/2026 10:00', 'Loan approved', ''),
+        (0.2, 0, 0, 2, 'N/A', 'Loan rejected', 'Missing amount'),
+        (0.9, 0, 1, 2, '01/01/2026 10:00', 'Approved, señor', 'missing rate'),
+    ]
+    for score, passed, facts, total, date, text, reason in rows:
+        index.add((score, passed, facts, total, date, None), {'candidate_text': text, 'failure_reason': reason})
+    
+    payload = index.to_payload()
+    decoded = {column: list(array('i', base64.b64decode(value))) for column, value in payload['sort'].items()}
+    assert decoded == {'1': [1, 0, 2], '2': [1, 2, 0], '3': [1, 2, 0], '4': [1, 2, 0]}
+    search = dict(zip(payload['search']['tokens'], payload['search']['postings']))
+    assert search['loan'] == [0, 1]
+    assert search['approved'] == [0, 2]
+    assert search['missing'] == [1, 1]
+    assert 'señor' in search
+    assert payload['search']['tokens'] == sorted(payload['search']['tokens'])
+
+
+def test_split_details_mode(tmp_path):
+    """Split mode writes one details file per chunk and keeps only its path in the report"""
+    reporter = HTMLReporter()
+    results = _results(12)
+    output = tmp_path / 'report.html'
+    (tmp_path / 'report_details').mkdir()
+    (tmp_path / 'report_details' / 'details-0009.js').write_text('stale', encoding='utf-8')
+    
+    reporter.generate_report(results, str(output), save_to_history=False, chunk_size=5, details_mode='split')
+    
+    chunks = _data_chunks(output.read_text(encoding='utf-8'))
+    assert [chunk['details_src'] for chunk in chunks] == [
+        'report_details/details-0001.js', 'report_details/details-0002.js', 'report_details/details-0003.js'
+    ]
+    assert all('details' not in chunk for chunk in chunks)
+    assert sorted(path.name for path in (tmp_path / 'report_details').iterdir()) == [
+        'details-0001.js', 'details-0002.js', 'details-0003.js'
+    ]
+    script = (tmp_path / 'report_details' / 'details-0003.js').read_text(encoding='utf-8')
+    block, details = re.match(r'window\.__trueLiesDetails\((\d+), (.*)\);\n$', script, re.S).groups()
+    assert block == '2'
+    assert len(json.loads(details)) == 2
+    assert 'candidate-details' in json.loads(details)[0]
+    
+    with pytest.raises(ValueError):
+        reporter.generate_report(results, str(output), save_to_history=False, details_mode='lazy')
+
+
+def test_scenario_fields_are_interned(tmp_path):
+    """Candidate results refer to one scenario entry; the reference is written once"""
+    reporter = HTMLReporter()
+    scenario = {'name': 'Loan query', 'semantic_reference': 'REFERENCE ' * 200,
+                'facts': {'amount': {'expected': '$360,000'}}}
+    results = [
+        {'index': i, 'candidate': f'Candidate {i}', 'is_valid': True,
+         'result': {'similarity_score': 0.9, 'amount_accuracy': True, 'extracted_amount': '$360,000'}}
+        for i in range(30)
+    ]
+    
+    normalized = reporter._normalize_results(results, scenario)
+    assert {result['scenario_id'] for result in normalized} == {0}
+    assert 'reference_text' not in normalized[0] and 'timestamp' not in normalized[0]
+    assert reporter.scenarios.get(0)['query'] == 'Loan query'
+    
+    output = tmp_path / 'report.html'
+    reporter.generate_report(results, str(output), scenario=scenario, save_to_history=False)
+    
+    html = output.read_text(encoding='utf-8')
+    assert html.count(scenario['semantic_reference'].strip()) == 1
+    assert html.count('data-scenario-id=\\"0\\"') == 30
+    scenarios = json.loads(re.search(r'id="resultsScenarios">(.*?)</script>', html).group(1))
+    assert 'Loan query' in scenarios[0]
+    assert len(set(_data_chunks(html)[0]['date'])) == 1
+
+
+def test_sharded_report(tmp_path):
+    """Pages of shard_size results plus an index with the merged metrics"""
+    reporter = HTMLReporter()
+    results = _results(25)
+    output = tmp_path / 'report.html'
+    
+    path = reporter.generate_report(results, str(output), save_to_history=False, chunk_size=4,
+                                    shard_size=10, workers=2)
+    
+    assert path == str(output.absolute())
+    pages = sorted((tmp_path / 'report_pages').glob('page-*.html'))
+    assert [page.name for page in pages] == ['page-0001.html', 'page-0002.html', 'page-0003.html']
+    index = output.read_text(encoding='utf-8')
+    assert 'href="report_pages/page-0003.html"' in index
+    assert '<td>21-25</td>' in index
+    assert 'results-data' not in index
+    
+    second = pages[1].read_text(encoding='utf-8')
+    chunks = _data_chunks(second)
+    assert [chunk['start'] for chunk in chunks] == [11, 15, 19]
+    assert 'href="../report.html"' in second and 'href="page-0003.html"' in second
+    assert 'successRateChart' not in second
+    
+    whole = MetricsAccumulator()
+    for result in results:
+        whole.add(result)
+    assert f"{whole.to_metrics()['pass_rate']:.1f}%" in index
+    
+    # Pages rendered in this process hold the same data
+    reporter.generate_report(results, str(tmp_path / 'sequential.html'), save_to_history=False, chunk_size=4,
+                             shard_size=10)
+    assert _data_chunks((tmp_path / 'sequential_pages' / 'page-0002.html').read_text(encoding='utf-8')) == chunks
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """LTTB keeps threshold points, the endpoints and isolated spikes"""
+    values = [0.5] * 1000
+    values[417] = 0.0
+    
+    sampled = _lttb(values, 50)
+    
+    assert len(sampled) == 50
+    assert sampled[0] == (0, 0.5) and sampled[-1] == (999, 0.5)
+    assert (417, 0.0) in sampled
+    assert [position for position, _ in sampled] == sorted({position for position, _ in sampled})
+    assert _lttb([0.1, 0.2], 50) == [(0, 0.1), (1, 0.2)]
+
+
+def test_chart_data_is_bounded_and_mergeable():
+    """Chart series have a fixed size; merged accumulators give the same chart data"""
+    results = _results(400)
+    for result in results:
+        result['retention_score'] += 0.05
+    results[123]['retention_score'] = 0.01
+    results[123]['test_name'] = 'worst case'
+    whole = MetricsAccumulator()
+    for result in results:
+        whole.add(result)
+    left, right = MetricsAccumulator(), MetricsAccumulator(first_id=251)
+    for result in results[:250]:
+        left.add(result)
+    for result in results[250:]:
+        right.add(result)
+    
+    charts = whole.chart_data(max_points=20)
+    assert left.merge(right).chart_data(max_points=20) == charts
+    assert sum(charts['score_histogram']) == 400
+    assert charts['score_histogram'][9] == 40
+    assert charts['fact_retention_histogram'] == [100, 0, 0, 100, 0, 0, 100, 0, 0, 100]
+    assert len(charts['score_series']['ids']) == 20
+    assert charts['score_series']['ids'][0] == 1 and charts['score_series']['ids'][-1] == 400
+    worst = charts['worst_performers']
+    assert len(worst['scores']) == 10
+    assert (worst['labels'][0], worst['ids'][0], worst['scores'][0]) == ('worst case', 124, 0.01)
+    assert worst['labels'][1:3] == ['Candidate 1', 'Candidate 11']
+    assert worst['scores'] == sorted(worst['scores'])
+
+
+def test_report_embeds_aggregated_charts(tmp_path):
+    """The report embeds the aggregated chart series, not one point per result"""
+    reporter = HTMLReporter()
+    output = tmp_path / 'report.html'
+    
+    reporter.generate_report(_results(300), str(output), save_to_history=False, max_chart_points=25)
+    
+    html = output.read_text(encoding='utf-8')
+    charts = json.loads(re.search(r'const runCharts = (.*);', html).group(1))
+    assert len(charts['score_series']['scores']) == 25
+    assert 'id="worstPerformersChart"' in html
+    
+    with pytest.raises(ValueError):
+        reporter.generate_report(_results(3), str(output), save_to_history=False, max_chart_points=2)
+
+
+def test_bundle_assets_are_shared_and_offline(tmp_path):
+    """Bundle mode writes content-hashed assets once per folder; pages link them relatively"""
+    chart_js = tmp_path / 'chart.umd.js'
+    chart_js.write_text('window.Chart = function () {};', encoding='utf-8')
+    reporter = HTMLReporter()
+    
+    reporter.generate_report(_results(5), str(tmp_path / 'a.html'), save_to_history=False,
+                             asset_mode='bundle', chart_js=str(chart_js))
+    reporter.generate_report(_results(25), str(tmp_path / 'b.html'), save_to_history=False,
+                             asset_mode='bundle', chart_js=str(chart_js), shard_size=10)
+    
+    assets = sorted(path.name for path in (tmp_path / 'true_lies_assets').iterdir())
+    assert [name.split('-')[0] for name in assets] == ['chart', 'report', 'report']
+    html = (tmp_path / 'a.html').read_text(encoding='utf-8')
+    for name in assets:
+        assert f'true_lies_assets/{name}' in html
+    assert '<style>' not in html and 'https://' not in html
+    page = (tmp_path / 'b_pages' / 'page-0002.html').read_text(encoding='utf-8')
+    assert 'src="../true_lies_assets/report-' in page
+    assert 'chart-' not in page
+    
+    with pytest.raises(ValueError):
+        reporter.generate_report(_results(5), str(tmp_path / 'c.html'), save_to_history=False, asset_mode='cdn')
+
+
+def test_inline_chart_js(tmp_path):
+    """A local Chart.js is embedded in inline mode instead of the CDN script"""
+    chart_js = tmp_path / 'chart.umd.js'
+    chart_js.write_text('var s = "</script>"; window.Chart = function () {};', encoding='utf-8')
+    output = tmp_path / 'report.html'
+    
+    HTMLReporter().generate_report(_results(5), str(output), save_to_history=False, chart_js=str(chart_js))
+    
+    html = output.read_text(encoding='utf-8')
+    assert 'cdn.jsdelivr.net' not in html
+    assert 'var s = "<\\/script>"; window.Chart' in html
+
+
+def test_vendored_chart_js_and_async_cdn(tmp_path, monkeypatch):
+    """The vendored Chart.js is used by default; without it the CDN never blocks the page"""
+    from true_lies import html_reporter
+    monkeypatch.setattr(html_reporter, 'VENDORED_CHART_JS', tmp_path / 'missing.js')
+    output = tmp_path / 'cdn.html'
+    HTMLReporter().generate_report(_results(5), str(output), save_to_history=False)
+    
+    html = output.read_text(encoding='utf-8')
+    head, body = html.split('</head>')
+    assert 'cdn.jsdelivr.net' not in head
+    assert re.search(r'<script src="https://cdn\.jsdelivr\.net/[^"]*" async onload="initCharts\(\)"', body)
+    assert body.index('function initCharts()') < body.index('cdn.jsdelivr.net')
+    
+    vendored = tmp_path / 'chart.umd.js'
+    vendored.write_text('window.Chart = function () {};', encoding='utf-8')
+    monkeypatch.setattr(html_reporter, 'VENDORED_CHART_JS', vendored)
+    HTMLReporter().generate_report(_results(5), str(output), save_to_history=False)
+    
+    html = output.read_text(encoding='utf-8')
+    assert 'cdn.jsdelivr.net' not in html and 'initCharts' not in html
+    assert '<script>window.Chart = function () {};</script>' in html
+
+
+def test_accumulator_state_and_bounded_series():
+    """The score series is compacted as it grows; state round-trips through JSON"""
+    accumulator = MetricsAccumulator(series_points=50)
+    for result in _results(1000):
+        accumulator.add(result)
+    
+    assert len(accumulator.series_ids) < 100
+    series = accumulator.chart_data(max_points=500)['score_series']
+    assert series['ids'][0] == 1 and series['ids'][-1] == 1000
+    
+    restored = MetricsAccumulator.from_state(json.loads(json.dumps(accumulator.to_state())))
+    for result in _results(10):
+        accumulator.add(result)
+        restored.add(result)
+    assert restored.to_metrics() == accumulator.to_metrics()
+    assert restored.chart_data() == accumulator.chart_data()
+
+
+def test_incremental_report_appends(tmp_path):
+    """Appends add data chunks after the earlier ones and rewrite only the summary tail"""
+    results = _results(23)
+    for i, result in enumerate(results):
+        result['candidate_text'] = f'answer {i}'
+    output = tmp_path / 'report.html'
+    reporter = HTMLReporter()
+    
+    reporter.generate_report(results[:10], str(output), save_to_history=False, chunk_size=4, incremental=True)
+    first = output.read_bytes()
+    state = json.loads((tmp_path / 'report_state.json').read_text(encoding='utf-8'))
+    reporter.generate_report(results[10:], str(output), title='Ignored', save_to_history=False, chunk_size=100,
+                             incremental=True)
+    
+    html = output.read_text(encoding='utf-8')
+    assert output.read_bytes()[:state['tail_offset']] == first[:state['tail_offset']]
+    chunks = _data_chunks(html)
+    assert [chunk['start'] for chunk in chunks] == [1, 5, 9, 11, 15, 19, 23]
+    assert sum((chunk['score'] for chunk in chunks), []) == [result['retention_score'] for result in results]
+    assert re.findall(r'class="results-search-segment" data-offset="(\d+)"', html) == ['0', '10']
+    assert 'id="resultsIndex"' not in html
+    assert html.count('id="resultsScenarios"') == 1 and html.count('</html>') == 1
+    assert '<title>Chatbot Validation Report</title>' in html
+    
+    whole = MetricsAccumulator()
+    for result in results:
+        whole.add(result)
+    assert f"{whole.to_metrics()['pass_rate']:.1f}%" in html
+    assert json.loads(re.search(r'const runCharts = (.*);', html).group(1)) == json.loads(
+        json.dumps(whole.chart_data())
+    )
+    
+    with pytest.raises(ValueError):
+        reporter.generate_report(results, str(output), save_to_history=False, incremental=True, shard_size=5)
+
+
+def test_incremental_report_restarts_and_history(tmp_path, monkeypatch):
+    """History is saved on creation (or on request); a regenerated file is not appended to"""
+    saved = []
+    monkeypatch.setattr(HTMLReporter, '_save_execution_to_history', lambda self, *args: saved.append(args))
+    output = tmp_path / 'report.html'
+    reporter = HTMLReporter()
+    
+    reporter.generate_report(_results(5), str(output), incremental=True)
+    reporter.generate_report(_results(5), str(output), incremental=True)
+    assert len(saved) == 1
+    reporter.generate_report(_results(5), str(output), incremental=True, save_to_history=True)
+    assert len(saved) == 2
+    
+    # A larger regular report at the same path invalidates the incremental state
+    reporter.generate_report(_results(40), str(output), save_to_history=False)
+    reporter.generate_report(_results(3), str(output), save_to_history=False, incremental=True)
+    chunks = _data_chunks(output.read_text(encoding='utf-8'))
+    assert [chunk['start'] for chunk in chunks] == [1]
+    assert len(chunks[0]['score']) == 3
+
+
+def test_parallel_rows_match_sequential(tmp_path):
+    """Rows rendered by worker processes give the same report as the sequential path"""
+    results = _results(23)
+    for i, result in enumerate(results):
+        result['candidate_text'] = f'answer {i % 5}'
+    reporter = HTMLReporter()
+    
+    reporter.generate_report(results, str(tmp_path / 'sequential.html'), save_to_history=False, chunk_size=4)
+    reporter.generate_report(results, str(tmp_path / 'parallel.html'), save_to_history=False, chunk_size=4,
+                             workers=2)
+    
+    def without_generation_time(path):
+        return re.sub(r'Generated on [^<]*', '', path.read_text(encoding='utf-8'))
+    
+    assert without_generation_time(tmp_path / 'parallel.html') == without_generation_time(
+        tmp_path / 'sequential.html'
+    )
+
+
+def test_parallel_rows_bound_ranges_in_flight(tmp_path, monkeypatch):
+    """Only about workers * 2 ranges are submitted ahead; shared state goes to the initializer"""
+    from true_lies import html_reporter
+    in_flight, peak = [0], [0]
+    
+    class Future:
+        def __init__(self, fn, args):
+            self.fn, self.args = fn, args
+        
+        def result(self):
+            in_flight[0] -= 1
+            return self.fn(*self.args)
+    
+    class InlinePool:
+        def __init__(self, max_workers, initializer, initargs):
+            initializer(*initargs)
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc):
+            return False
+        
+        def submit(self, fn, *args):
+            assert all(not isinstance(arg, dict) for arg in args)
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            return Future(fn, args)
+    
+    monkeypatch.setattr(html_reporter, 'ProcessPoolExecutor', InlinePool)
+    output = tmp_path / 'report.html'
+    HTMLReporter().generate_report(_results(200), str(output), save_to_history=False, chunk_size=4, workers=2)
+    
+    assert peak[0] == 4
+    assert sum(len(chunk['score']) for chunk in _data_chunks(output.read_text(encoding='utf-8'))) == 200
+
+
+def test_results_index_extend():
+    """Extending an index with the next rows' index equals indexing all the rows"""
+    rows = [(0.1 * (i % 7), i % 2, i % 3, 2, 'N/A', None) for i in range(12)]
+    texts = [{'candidate_text': f'word{i % 4} shared'} for i in range(12)]
+    whole = ResultsIndex()
+    for row, text in zip(rows, texts):
+        whole.add(row, text)
+    left, right = ResultsIndex(), ResultsIndex()
+    for row, text in zip(rows[:5], texts[:5]):
+        left.add(row, text)
+    for row, text in zip(rows[5:], texts[5:]):
+        right.add(row, text)
+    
+    assert left.extend(right).to_payload() == whole.to_payload()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for fact-level incremental re-validation of edited scenarios
+"""
+
+from unittest import mock
+
+from true_lies import create_scenario, validate_llm_candidates
+from true_lies import validation_core
+from true_lies.validation_core import (
+    component_fingerprints,
+    revalidate_candidates_batch,
+    validate_candidates_batch,
+)
+
+
+def _scenario(color_patterns=None, reference='Product with price $299.99, color red'):
+    return create_scenario(
+        facts={
+            'price': {'extractor': 'money', 'expected': '299.99'},
+            'color': {
+                'extractor': 'categorical',
+                'expected': 'red',
+                'patterns': color_patterns or {'red': ['red'], 'blue': ['blue']}
+            }
+        },
+        semantic_reference=reference
+    )
+
+
+CANDIDATES = [
+    "This item costs $299.99 and comes in crimson",
+    "This item costs $299.99 and comes in red",
+    "This item costs $199.99 and comes in blue",
+]
+
+
+def test_fingerprints_change_only_for_edited_fact():
+    """Editing one fact's patterns only changes that fact's fingerprint"""
+    before = component_fingerprints(_scenario())
+    after = component_fingerprints(_scenario({'red': ['red', 'crimson'], 'blue': ['blue']}))
+    
+    assert before['facts']['price'] == after['facts']['price']
+    assert before['facts']['color'] != after['facts']['color']
+    assert before['semantic'] == after['semantic']
+    assert before['polarity'] == after['polarity']
+
+
+def test_revalidate_recomputes_only_changed_fact():
+    """Only the edited fact is extracted again; the result matches a full run"""
+    old = _scenario()
+    new = _scenario({'red': ['red', 'crimson'], 'blue': ['blue']})
+    previous = validate_candidates_batch(CANDIDATES, old, 0.5)
+    
+    with mock.patch.object(validation_core, 'extract_fact', wraps=validation_core.extract_fact) as extract, \
+            mock.patch.object(validation_core, '_score_semantic') as score:
+        results, summary = revalidate_candidates_batch(
+            CANDIDATES, previous, component_fingerprints(old), new, 0.5
+        )
+        score.assert_not_called()
+    
+    assert {call.args[1]['extractor'] for call in extract.call_args_list} == {'categorical'}
+    assert summary['recomputed_facts'] == ['color']
+    assert summary['reused_facts'] == ['price']
+    assert summary['semantic_recomputed'] is False
+    assert results == validate_candidates_batch(CANDIDATES, new, 0.5)
+    assert results[0]['color_accuracy'] is True
+
+
+def test_semantic_edit_recomputes_semantic_only():
+    """Changing the reference text re-scores similarity but reuses facts"""
+    old = _scenario()
+    new = _scenario(reference='Item priced at $299.99 in red')
+    previous = validate_candidates_batch(CANDIDATES, old, 0.5)
+    
+    with mock.patch.object(validation_core, 'extract_fact') as extract:
+        results, summary = revalidate_candidates_batch(
+            CANDIDATES, previous, component_fingerprints(old), new, 0.5
+        )
+        extract.assert_not_called()
+    
+    assert summary['semantic_recomputed'] is True
+    assert summary['recomputed_facts'] == []
+    assert results == validate_candidates_batch(CANDIDATES, new, 0.5)
+
+
+def test_validate_llm_candidates_previous_run(capsys):
+    """validate_llm_candidates reuses a previous run and validates new candidates"""
+    first = validate_llm_candidates(_scenario(), CANDIDATES, threshold=0.5)
+    assert 'component_fingerprints' in first
+    capsys.readouterr()
+    
+    new = _scenario({'red': ['red', 'crimson'], 'blue': ['blue']})
+    candidates = CANDIDATES + ["Price $299.99, red"]
+    second = validate_llm_candidates(new, candidates, threshold=0.5, previous_run=first)
+    
+    assert "3 candidates reused, recomputed: color" in capsys.readouterr().out
+    full = validate_llm_candidates(new, candidates, threshold=0.5)
+    assert [r['result'] for r in second['results']] == [r['result'] for r in full['results']]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming transcript replay engine
+"""
+
+import json
+import random
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from true_lies import replay as replay_module
+from true_lies.replay import iter_jsonl, replay_transcripts
+
+
+def _write_log(path, conversations=12):
+    """Interleaved, shuffled log; even conversations keep the loan amount in the last turn"""
+    records = []
+    for c in range(conversations):
+        cid = f'conv-{c}'
+        records.append({'conversation_id': cid, 'turn': 1, 'user_input': f"I'm client {c}, ID USER-{c}",
+                        'bot_response': "Hello", 'expected_facts': {'user_id': f'USER-{c}'}})
+        records.append({'conversation_id': cid, 'turn': 2, 'user_input': "I need $360,000",
+                        'bot_response': "Noted", 'expected_facts': {'loan_amount': '360000'}})
+        final = f"USER-{c}, your $360,000 loan is approved" if c % 2 == 0 else f"USER-{c}, approved"
+        records.append({'conversation_id': cid, 'turn': 3, 'user_input': "Status?",
+                        'bot_response': final, 'expected_facts': {}})
+    random.Random(7).shuffle(records)
+    records.append({'conversation_id': 'single', 'turn': 1, 'user_input': 'hi', 'bot_response': 'hello'})
+    with open(path, 'w', encoding='utf-8') as log:
+        for record in records:
+            log.write(json.dumps(record) + '\n')
+
+
+def _by_id(path):
+    return {result['conversation_id']: result for result in iter_jsonl(path)}
+
+
+def test_in_memory_replay(tmp_path):
+    """Turns are regrouped and ordered; the final response is checked"""
+    log, out = tmp_path / 'log.jsonl', tmp_path / 'out.jsonl'
+    _write_log(log)
+    
+    summary = replay_transcripts(str(log), str(out))
+    
+    results = _by_id(out)
+    assert summary['conversations'] == 13
+    assert summary['partitions'] == 0
+    assert summary['mean_retention'] == 0.75
+    assert results['conv-0']['retention']['all_retained'] is True
+    assert results['conv-1']['retention']['loan_amount_retained'] is False
+    assert results['single']['retention'] is None
+
+
+def test_spill_and_parallel_match_in_memory(tmp_path):
+    """Partitioned (sequential and parallel) replays produce the same results"""
+    log = tmp_path / 'log.jsonl'
+    _write_log(log)
+    replay_transcripts(str(log), str(tmp_path / 'memory.jsonl'))
+    
+    spilled = replay_transcripts(str(log), str(tmp_path / 'spilled.jsonl'), max_records_in_memory=5, partitions=4)
+    parallel = replay_transcripts(str(log), str(tmp_path / 'parallel.jsonl'), workers=2, partitions=4)
+    
+    expected = _by_id(tmp_path / 'memory.jsonl')
+    assert spilled['partitions'] > 4
+    assert parallel['partitions'] == 4
+    assert _by_id(tmp_path / 'spilled.jsonl') == expected
+    assert _by_id(tmp_path / 'parallel.jsonl') == expected
+
+
+def test_spilled_partitions_fit_in_memory(tmp_path):
+    """Oversized partitions are split so none holds more than max_records_in_memory"""
+    log = tmp_path / 'log.jsonl'
+    _write_log(log, conversations=60)
+    replay_transcripts(str(log), str(tmp_path / 'memory.jsonl'))
+    
+    sizes = []
+    original = replay_module._replay_partition
+    
+    def replay_partition(partition_path, output_path, config):
+        sizes.append(sum(1 for _ in iter_jsonl(partition_path)))
+        return original(partition_path, output_path, config)
+    
+    with mock.patch.object(replay_module, '_replay_partition', side_effect=replay_partition):
+        summary = replay_transcripts(str(log), str(tmp_path / 'spilled.jsonl'),
+                                     max_records_in_memory=12, partitions=2)
+    
+    assert sum(sizes) == 181
+    assert max(sizes) <= 12
+    assert summary['partitions'] == len(sizes)
+    assert _by_id(tmp_path / 'spilled.jsonl') == _by_id(tmp_path / 'memory.jsonl')
+
+
+def test_replay_from_records_with_curve(tmp_path):
+    """Iterables of records work and track_retention adds forgotten_at"""
+    records = [
+        {'conversation_id': 'a', 'user_input': "I'm Ana Diaz", 'bot_response': "Hi Ana", 'expected_facts': {'client_name': 'Ana Diaz'}},
+        {'conversation_id': 'a', 'user_input': "ok", 'bot_response': "Ana, sure"},
+        {'conversation_id': 'a', 'user_input': "ok", 'bot_response': "Done"},
+    ]
+    out = tmp_path / 'out.jsonl'
+    replay_transcripts(records, str(out), facts_to_check=['client_name'], track_retention=True)
+    
+    result = _by_id(out)['a']
+    assert result['retention']['client_name_retained'] is False
+    assert result['forgotten_at'] == {'client_name': 3}
+
+
+def test_spilled_records_with_non_json_values(tmp_path):
+    """Records with datetime and Decimal values replay the same in memory and spilled"""
+    records = []
+    for c in range(6):
+        records.append({'conversation_id': f'conv-{c}', 'turn': 1, 'sent_at': datetime(2024, 5, 1, 10, c),
+                        'user_input': f"I need ${c},000", 'bot_response': "Noted",
+                        'expected_facts': {'loan_amount': f'{c}000'}, 'amount': Decimal(f'{c}000.00')})
+        records.append({'conversation_id': f'conv-{c}', 'turn': 2, 'sent_at': datetime(2024, 5, 1, 11, c),
+                        'user_input': "Status?", 'bot_response': f"Your ${c},000 loan is approved"})
+    memory = replay_transcripts(records, str(tmp_path / 'memory.jsonl'))
+    spilled = replay_transcripts(records, str(tmp_path / 'spilled.jsonl'), max_records_in_memory=3, partitions=2)
+    
+    assert memory['partitions'] == 0
+    assert spilled['partitions'] > 0
+    assert _by_id(tmp_path / 'spilled.jsonl') == _by_id(tmp_path / 'memory.jsonl')
+
+
+def test_turn_order_with_mixed_and_missing_values(tmp_path):
+    """Numeric strings sort with numbers and turns without a turn field go last"""
+    records = [
+        {'conversation_id': 'a', 'turn': "10", 'user_input': "Status?", 'bot_response': "Your $5,000 loan is approved"},
+        {'conversation_id': 'a', 'user_input': "Thanks", 'bot_response': "Bye"},
+        {'conversation_id': 'a', 'turn': "2", 'user_input': "I need $5,000", 'bot_response': "Noted",
+         'expected_facts': {'loan_amount': '5000'}},
+        {'conversation_id': 'a', 'turn': 1, 'user_input': "Hi", 'bot_response': "Hello"},
+    ]
+    out = tmp_path / 'out.jsonl'
+    replay_transcripts(records, str(out))
+    
+    result = _by_id(out)['a']
+    assert result['turns'] == 4
+    assert result['retention']['loan_amount_retained'] is False
+    
+    records.pop(1)
+    replay_transcripts(records, str(out))
+    assert _by_id(out)['a']['retention']['loan_amount_retained'] is True
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent result cache used by incremental CI re-validation
+"""
+
+from unittest import mock
+
+from true_lies import create_scenario, validate_llm_candidates
+from true_lies import result_cache as result_cache_module
+from true_lies.backends import get_default_backend_name, set_default_backend
+from true_lies.result_cache import ResultCache, scenario_fingerprint
+
+
+def _scenario(expected='100'):
+    return create_scenario(
+        facts={'price': {'extractor': 'money', 'expected': expected}},
+        semantic_reference='The plan costs $100 per month'
+    )
+
+
+def test_warm_rerun_reuses_results(tmp_path, capsys):
+    """A second run over the same pairs validates nothing"""
+    path = tmp_path / 'results.sqlite'
+    candidates = ["The plan costs $100 per month", "It is $90", "The plan costs $100 per month"]
+    
+    cold = validate_llm_candidates(_scenario(), candidates, result_cache=str(path))
+    assert "1 reused, 2 validated" in capsys.readouterr().out
+    
+    with mock.patch('true_lies.runner.validate_candidates_batch') as batch:
+        warm = validate_llm_candidates(_scenario(), candidates, result_cache=str(path))
+        batch.assert_not_called()
+    assert "3 reused, 0 validated" in capsys.readouterr().out
+    assert [r['result'] for r in warm['results']] == [r['result'] for r in cold['results']]
+
+
+def test_scenario_change_changes_fingerprint():
+    """Editing facts or the threshold produces a new scenario key"""
+    base = scenario_fingerprint(_scenario(), 0.7)
+    assert base == scenario_fingerprint(_scenario(), 0.7)
+    assert base != scenario_fingerprint(_scenario(expected='90'), 0.7)
+    assert base != scenario_fingerprint(_scenario(), 0.8)
+
+
+def test_backend_params_change_fingerprint():
+    """Reconfiguring the default backend with other parameters misses the cache"""
+    previous = get_default_backend_name()
+    try:
+        set_default_backend('hashing', n_features=64)
+        small = scenario_fingerprint(_scenario(), 0.7)
+        set_default_backend('hashing', n_features=1024)
+        assert small != scenario_fingerprint(_scenario(), 0.7)
+        assert small != scenario_fingerprint(_scenario(), 0.7, 'hashing')
+    finally:
+        set_default_backend(previous)
+
+
+def test_code_version_change_invalidates(tmp_path):
+    """Entries written by a different scoring code version are discarded"""
+    path = tmp_path / 'results.sqlite'
+    with ResultCache(str(path)) as cache:
+        cache.put_many('scenario', [("candidate", {'is_valid': True})])
+        assert cache.get('scenario', "candidate") == {'is_valid': True}
+    
+    with mock.patch.object(result_cache_module, 'scoring_code_fingerprint', return_value='other-version'):
+        with ResultCache(str(path)) as cache:
+            assert len(cache) == 0
+            assert cache.get('scenario', "candidate") is None
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU conversation session store
+"""
+
+import threading
+from pathlib import Path
+
+from true_lies import ConversationSessionStore, ConversationValidator
+
+
+def _add_client(conv, session_id):
+    conv.add_turn(f"I'm client {session_id}, my ID is USER-{session_id}", "Noted",
+                  {'user_id': f'USER-{session_id}'})
+
+
+def test_lru_eviction_and_restore(tmp_path):
+    """The least recently used session goes to disk and comes back intact"""
+    store = ConversationSessionStore(max_sessions=2, storage_dir=str(tmp_path))
+    for session_id in (1, 2, 3):
+        with store.session(session_id) as conv:
+            _add_client(conv, session_id)
+    
+    stats = store.stats()
+    assert stats['in_memory'] == 2
+    assert stats['on_disk'] == 1
+    assert len(store) == 3 and 1 in store
+    assert len(list(tmp_path.iterdir())) == 1
+    
+    conv = store.get(1)
+    assert conv.conversation_facts == {'user_id': 'USER-1'}
+    assert conv.validate_retention("Your ID USER-1 is active", ['user_id'])['user_id_retained'] is True
+    assert store.stats()['restores'] == 1
+    # Restoring session 1 evicted session 2, now the least recently used
+    assert store.stats()['on_disk'] == 1
+    assert 2 in store and store.evict(2) is False
+
+
+def test_max_bytes_limit():
+    """Sessions are evicted once the estimated size exceeds max_bytes"""
+    store = ConversationSessionStore(max_bytes=4000)
+    for session_id in range(10):
+        with store.session(session_id) as conv:
+            _add_client(conv, session_id)
+    
+    stats = store.stats()
+    assert stats['estimated_bytes'] <= 4000
+    assert stats['evictions'] > 0
+    assert stats['in_memory'] + stats['on_disk'] == 10
+
+
+def test_pinned_session_is_not_evicted():
+    """A session in use inside session() stays in memory"""
+    store = ConversationSessionStore(max_sessions=1)
+    with store.session('a') as conv:
+        store.get('b')
+        store.get('c')
+        assert store.evict('a') is False
+        _add_client(conv, 'a')
+    assert store.get('a').conversation_facts == {'user_id': 'USER-a'}
+
+
+def test_concurrent_sessions():
+    """Threads sharing sessions never lose turns, even with evictions"""
+    store = ConversationSessionStore(max_sessions=3)
+    
+    def worker(offset):
+        for i in range(20):
+            with store.session((offset + i) % 6) as conv:
+                _add_client(conv, i)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    total_turns = sum(len(store.get(session_id).turn_history) for session_id in range(6))
+    assert total_turns == 80
+    assert len(store) == 6
+
+
+def test_session_locks_are_released():
+    """Per-session locks live only while a thread uses them; remove() keeps a held lock"""
+    store = ConversationSessionStore()
+    for session_id in range(5):
+        with store.session(session_id) as conv:
+            _add_client(conv, session_id)
+    assert store._session_locks == {}
+    
+    entered, release, order = threading.Event(), threading.Event(), []
+    
+    def holder():
+        with store.session('x'):
+            entered.set()
+            release.wait(5)
+            order.append('holder')
+    
+    def second():
+        with store.session('x'):
+            order.append('second')
+    
+    first_thread = threading.Thread(target=holder)
+    first_thread.start()
+    entered.wait(5)
+    store.remove('x')
+    second_thread = threading.Thread(target=second)
+    second_thread.start()
+    second_thread.join(0.2)
+    assert order == []
+    release.set()
+    first_thread.join()
+    second_thread.join()
+    assert order == ['holder', 'second']
+    assert store._session_locks == {}
+
+
+def test_eviction_writes_outside_the_store_lock(tmp_path, monkeypatch):
+    """Writing an evicted session to disk does not block other store operations"""
+    store = ConversationSessionStore(max_sessions=1, storage_dir=str(tmp_path))
+    lock_free = []
+    write_bytes = Path.write_bytes
+    
+    def probing_write_bytes(path, data):
+        def probe():
+            acquired = store._lock.acquire(timeout=1)
+            if acquired:
+                store._lock.release()
+            lock_free.append(acquired)
+        
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return write_bytes(path, data)
+    
+    monkeypatch.setattr(Path, 'write_bytes', probing_write_bytes)
+    with store.session('a') as conv:
+        _add_client(conv, 'a')
+    with store.session('b') as conv:
+        _add_client(conv, 'b')
+    
+    assert lock_free == [True]
+    assert store.stats()['on_disk'] == 1
+    assert store.get('a').conversation_facts == {'user_id': 'USER-a'}
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_session_reused_while_being_evicted(tmp_path):
+    """A session requested during its eviction is never modified while it is serialized"""
+    serializing = threading.Event()
+    mutated = threading.Event()
+    mutated_during_serialization = []
+    
+    class SlowValidator(ConversationValidator):
+        def to_bytes(self):
+            if not serializing.is_set():
+                serializing.set()
+                mutated.wait(0.5)
+                mutated_during_serialization.append(mutated.is_set())
+            return super().to_bytes()
+    
+    store = ConversationSessionStore(max_sessions=1, storage_dir=str(tmp_path), validator_factory=SlowValidator)
+    with store.session('a') as conv:
+        _add_client(conv, 'a')
+    
+    def evict_a():
+        with store.session('b') as conv:
+            _add_client(conv, 'b')
+    
+    evictor = threading.Thread(target=evict_a)
+    evictor.start()
+    assert serializing.wait(5)
+    with store.session('a') as conv:
+        conv.add_turn("My email is a@example.com", "Thanks", {'email': 'a@example.com'})
+        mutated.set()
+    evictor.join()
+    
+    assert mutated_during_serialization == [False]
+    restored = store.get('a')
+    assert len(restored.turn_history) == 2
+    assert restored.conversation_facts == {'user_id': 'USER-a', 'email': 'a@example.com'}
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact turn history with a bounded in-memory window
+"""
+
+import json
+import sys
+
+import pytest
+
+from true_lies import ConversationValidator
+from true_lies.turn_history import Turn, TurnHistory
+
+
+def _fill(conv, turns):
+    for i in range(1, turns + 1):
+        conv.add_turn(f"My ID is USER-{i}", f"Noted turn {i}", {'user_id': f'USER-{i}'})
+
+
+def test_turn_is_dict_compatible():
+    """Turn keeps the dict-style access of the previous history format"""
+    turn = Turn(1, "hi", "hello", {'client_name': 'Ana'}, {'client_name': 'Ana'})
+    
+    assert turn['user_input'] == "hi"
+    assert turn.get('bot_response') == "hello"
+    assert turn == {'user_input': 'hi', 'bot_response': 'hello',
+                    'expected_facts': {'client_name': 'Ana'}, 'extracted_facts': {'client_name': 'Ana'}}
+    assert not hasattr(turn, '__dict__')
+    name = next(iter(turn.extracted_facts))
+    assert name is sys.intern('client_name')
+
+
+def test_window_keeps_last_turns_and_all_facts():
+    """Only the last K turns stay in memory; facts and summary cover everything"""
+    conv = ConversationValidator(max_turns_in_memory=3)
+    _fill(conv, 10)
+    
+    assert len(conv.turn_history) == 10
+    assert conv.turn_history.in_memory == 3
+    assert [turn.index for turn in conv.turn_history] == [8, 9, 10]
+    assert conv.turn_history[-1]['user_input'] == "My ID is USER-10"
+    with pytest.raises(IndexError):
+        conv.turn_history[0]
+    
+    summary = conv.get_conversation_summary()
+    assert summary['total_turns'] == 10
+    assert summary['facts']['user_id'] == 'USER-10'
+    assert [turn['user_input'] for turn in summary['turn_history']] == [
+        "My ID is USER-8", "My ID is USER-9", "My ID is USER-10"
+    ]
+    json.dumps(summary)
+    conv.print_conversation_summary()
+
+
+def test_spill_to_disk(tmp_path):
+    """Turns leaving the window are appended to a JSONL log and can be read back"""
+    path = tmp_path / 'turns.jsonl'
+    conv = ConversationValidator(max_turns_in_memory=2, spill_path=str(path))
+    _fill(conv, 5)
+    
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 3
+    assert conv.turn_history[0]['extracted_facts'] == {'user_id': 'USER-1'}
+    assert [turn.index for turn in conv.turn_history.iter_all()] == [1, 2, 3, 4, 5]
+    assert [turn.index for turn in conv.turn_history] == [1, 2, 3, 4, 5]
+    assert [turn.index for turn in conv.turn_history.iter_in_memory()] == [4, 5]
+    assert len(conv.get_conversation_summary()['turn_history']) == len(conv.turn_history)
+    assert [turn['bot_response'] for turn in conv.turn_history[1:4]] == [
+        "Noted turn 2", "Noted turn 3", "Noted turn 4"
+    ]
+    
+    conv.clear_conversation()
+    assert len(conv.turn_history) == 0
+    assert path.read_text(encoding='utf-8') == ''
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        TurnHistory(max_turns_in_memory=0)
@@ -53,7 +53,9 @@ from .extractors import EXTRACTORS
 from .utils import extract_fact
 from .polarity import POLARITY_PATTERNS, detect_polarity
 from .semantic import apply_semantic_mappings, calculate_semantic_similarity
+from .backends import get_backend, register_backend, set_default_backend
 from .conversation import ConversationValidator
+from .sessions import ConversationSessionStore
 from .html_reporter import HTMLReporter
 
 # API pública
@@ -75,8 +77,14 @@ __all__ = [
     'apply_semantic_mappings',
     'calculate_semantic_similarity',
     
+    # Backends de similitud
+    'get_backend',
+    'register_backend',
+    'set_default_backend',
+    
     # Validación Multiturno
     'ConversationValidator',
+    'ConversationSessionStore',
     
     # Reportes HTML
     'HTMLReporter'
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Backends de Similitud Semántica
+===============================
+
+Interfaz enchufable para el componente semántico de la validación.
+
+Un backend expone dos operaciones por lotes:
+    - encode_batch(texts): codifica una lista de textos
+    - score_batch(reference, candidates, fact_weights=None): devuelve una lista
+      de diccionarios de métricas (al menos 'final_score') por candidato
+
+Backends incluidos:
+    - 'lexical': el algoritmo histórico (F1 de tokens + SequenceMatcher).
+      Es el backend por defecto, para que los umbrales existentes conserven
+      su significado.
+    - 'hashing': vectorizador por hashing en Python puro, sin dependencias
+      ni red. Es la implementación de referencia para backends vectoriales
+      (por ejemplo, modelos de embeddings locales en CPU).
+
+Los backends vectoriales pueden persistir sus vectores en una caché en disco
+direccionada por contenido (arrays float32 mapeados en memoria + índice), de
+modo que una misma referencia o candidato nunca se codifica dos veces.
+
+Uso básico:
+    from true_lies.backends import get_backend, set_default_backend
+    
+    set_default_backend('hashing', cache_dir='.true_lies_vectors')
+    backend = get_backend()
+    scores = backend.score_batch("referencia", ["candidato 1", "candidato 2"])
+"""
+
+import hashlib
+import math
+import mmap
+import re
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+
+@runtime_checkable
+class SimilarityBackend(Protocol):
+    """Protocolo que debe cumplir cualquier backend de similitud."""
+    
+    name: str
+    
+    def encode_batch(self, texts: Sequence[str]) -> List[Any]:
+        """Codifica una lista de textos."""
+        ...
+    
+    def score_batch(self, reference: str, candidates: Sequence[str],
+                    fact_weights: Optional[Dict[str, float]] = None) -> List[Dict[str, float]]:
+        """Devuelve las métricas de similitud de cada candidato contra la referencia."""
+        ...
+
+
+def _text_key(text: str) -> str:
+    """Clave de contenido estable (entre procesos) para un texto."""
+    return hashlib.sha256(str(text).encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# CACHÉ DE VECTORES EN DISCO
+# ============================================================================
+
+class VectorCache:
+    """
+    Caché persistente de vectores direccionada por contenido.
+    
+    Los vectores se guardan como filas float32 contiguas en 'vectors.f32'
+    (leído con mmap) y el índice 'index.tsv' asocia el hash del texto con
+    el número de fila. Ambos archivos son append-only, por lo que varias
+    ejecuciones pueden compartir el mismo directorio.
+    """
+    
+    def __init__(self, cache_dir: str, dim: int, namespace: str):
+        """
+        Args:
+            cache_dir: Directorio raíz de la caché
+            dim: Dimensión de los vectores
+            namespace: Identificador del backend (evita colisiones entre backends)
+        """
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.directory = Path(cache_dir) / namespace
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / 'vectors.f32'
+        self.index_path = self.directory / 'index.tsv'
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._mapped_size = 0
+        self._index = self._load_index()
+    
+    def _load_index(self) -> Dict[str, int]:
+        """Carga el índice descartando filas que no llegaron a escribirse."""
+        index = {}
+        available_rows = 0
+        if self.vectors_path.exists():
+            available_rows = self.vectors_path.stat().st_size // self.row_bytes
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) != 2:
+                        continue
+                    try:
+                        row = int(parts[1])
+                    except ValueError:
+                        continue
+                    if row < available_rows:
+                        index[parts[0]] = row
+        return index
+    
+    def _remap(self) -> None:
+        """Vuelve a mapear el archivo de vectores si creció."""
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        if size == self._mapped_size:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if size > 0:
+            with open(self.vectors_path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+    
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Devuelve los vectores disponibles para las claves dadas."""
+        found = {}
+        with self._lock:
+            rows = [(key, self._index[key]) for key in keys if key in self._index]
+            if not rows:
+                return found
+            self._remap()
+            view = memoryview(self._mmap)
+            try:
+                for key, row in rows:
+                    offset = row * self.row_bytes
+                    found[key] = view[offset:offset + self.row_bytes].cast('f').tolist()
+            finally:
+                view.release()
+        return found
+    
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        """Agrega vectores nuevos (las claves ya presentes se ignoran)."""
+        with self._lock:
+            new_items = [(key, vector) for key, vector in items.items() if key not in self._index]
+            if not new_items:
+                return
+            start_row = 0
+            if self.vectors_path.exists():
+                start_row = self.vectors_path.stat().st_size // self.row_bytes
+            buffer = array('f')
+            for _, vector in new_items:
+                if len(vector) != self.dim:
+                    raise ValueError(f"Vector dimension {len(vector)} does not match cache dimension {self.dim}")
+                buffer.extend(vector)
+            # Primero los vectores, luego el índice: un corte a mitad de
+            # escritura deja filas huérfanas, nunca entradas inválidas.
+            with open(self.vectors_path, 'ab') as f:
+                f.write(buffer.tobytes())
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                for offset, (key, _) in enumerate(new_items):
+                    f.write(f"{key}\t{start_row + offset}\n")
+                    self._index[key] = start_row + offset
+    
+    def close(self) -> None:
+        """Libera el mapeo en memoria."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                self._mapped_size = 0
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class LexicalBackend:
+    """
+    Backend léxico histórico.
+    
+    Envuelve el núcleo de semantic.py (F1 de tokens de contenido +
+    SequenceMatcher + bonus por fact_weights).
+    """
+    
+    name = 'lexical'
+    
+    def encode_batch(self, texts: Sequence[str]) -> List[str]:
+        """La 'codificación' léxica es el texto normalizado."""
+        return [re.sub(r"[^\w\s]", " ", t.lower()) if isinstance(t, str) else "" for t in texts]
+    
+    def score_batch(self, reference: str, candidates: Sequence[str],
+                    fact_weights: Optional[Dict[str, float]] = None) -> List[Dict[str, float]]:
+        from .semantic import calculate_semantic_similarity_metrics
+        return [calculate_semantic_similarity_metrics(reference, candidate, fact_weights) for candidate in candidates]
+
+
+class VectorBackend(ABC):
+    """
+    Base para backends basados en vectores densos.
+    
+    Las subclases implementan _encode(texts) y definen name/dim. La base
+    se encarga de la caché en memoria (LRU acotada), de la caché en disco
+    opcional y de puntuar por similitud coseno. Los vectores se guardan
+    como float32 en ambas cachés.
+    """
+    
+    name = 'vector'
+    dim = 0
+    version = '1'
+    
+    def __init__(self, cache_dir: Optional[str] = None, memory_cache_size: int = 10000):
+        """
+        Args:
+            cache_dir: Directorio para la caché persistente de vectores (opcional)
+            memory_cache_size: Máximo de vectores retenidos en memoria
+        """
+        self.memory_cache_size = memory_cache_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk_cache = VectorCache(cache_dir, self.dim, self.fingerprint()) if cache_dir else None
+    
+    def fingerprint(self) -> str:
+        """Identificador del espacio vectorial (cambia si cambian los vectores)."""
+        return f"{self.name}-{self.dim}-v{self.version}"
+    
+    @abstractmethod
+    def _encode(self, texts: Sequence[str]) -> List[List[float]]:
+        """Codifica textos nuevos (sin pasar por las cachés)."""
+    
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+    
+    def encode_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Codifica textos reutilizando vectores ya calculados."""
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        keys = [_text_key(t) for t in texts]
+        vectors = {}
+        
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    vectors[key] = self._memory[key]
+        
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self.disk_cache is not None:
+            from_disk = self.disk_cache.get_many(missing)
+            vectors.update(from_disk)
+            with self._lock:
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+            missing = [key for key in missing if key not in from_disk]
+        
+        if missing:
+            missing_set = set(missing)
+            to_encode = {}
+            for key, text in zip(keys, texts):
+                if key in missing_set and key not in to_encode:
+                    to_encode[key] = text
+            # Redondeo a float32, como en la caché en disco: el puntaje no
+            # depende de si el vector se acaba de calcular o se leyó de disco
+            encoded = [array('f', vector).tolist() for vector in self._encode(list(to_encode.values()))]
+            fresh = dict(zip(to_encode.keys(), encoded))
+            vectors.update(fresh)
+            with self._lock:
+                for key, vector in fresh.items():
+                    self._remember(key, vector)
+            if self.disk_cache is not None:
+                self.disk_cache.put_many(fresh)
+        
+        return [vectors[key] for key in keys]
+    
+    def score_batch(self, reference: str, candidates: Sequence[str],
+                    fact_weights: Optional[Dict[str, float]] = None) -> List[Dict[str, float]]:
+        """Similitud coseno de cada candidato contra la referencia."""
+        # fact_weights no aplica a espacios vectoriales genéricos
+        _ = fact_weights
+        vectors = self.encode_batch([reference] + list(candidates))
+        reference_vector = vectors[0]
+        metrics = []
+        for vector in vectors[1:]:
+            cosine = sum(a * b for a, b in zip(reference_vector, vector))
+            score = float(min(max(cosine, 0.0), 1.0))
+            metrics.append({
+                "cosine": float(cosine),
+                "final_score": score,
+            })
+        return metrics
+
+
+class HashingVectorizerBackend(VectorBackend):
+    """
+    Vectorizador por hashing en Python puro.
+    
+    Proyecta unigramas y bigramas de palabras a un vector de dimensión fija
+    con hashing firmado (blake2b, estable entre procesos), pondera con
+    tf sublineal y normaliza L2. No requiere red ni dependencias.
+    """
+    
+    name = 'hashing'
+    
+    def __init__(self, n_features: int = 1024, ngram_range=(1, 2),
+                 cache_dir: Optional[str] = None, memory_cache_size: int = 10000):
+        """
+        Args:
+            n_features: Dimensión del vector
+            ngram_range: Rango (min, max) de n-gramas de palabras
+            cache_dir: Directorio para la caché persistente de vectores (opcional)
+            memory_cache_size: Máximo de vectores retenidos en memoria
+        """
+        self.dim = n_features
+        self.ngram_range = tuple(ngram_range)
+        super().__init__(cache_dir=cache_dir, memory_cache_size=memory_cache_size)
+    
+    def fingerprint(self) -> str:
+        low, high = self.ngram_range
+        return f"{self.name}-{self.dim}-{low}{high}-v{self.version}"
+    
+    def _features(self, text: str) -> Dict[str, int]:
+        tokens = re.findall(r"\w+", text.lower())
+        counts = {}
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                feature = " ".join(tokens[i:i + n])
+                counts[feature] = counts.get(feature, 0) + 1
+        return counts
+    
+    def _encode(self, texts: Sequence[str]) -> List[List[float]]:
+        encoded = []
+        for text in texts:
+            vector = [0.0] * self.dim
+            for feature, count in self._features(text).items():
+                digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+                index = digest % self.dim
+                sign = 1.0 if (digest >> 63) == 0 else -1.0
+                vector[index] += sign * (1.0 + math.log(count))
+            norm = math.sqrt(sum(v * v for v in vector))
+            if norm > 0:
+                vector = [v / norm for v in vector]
+            encoded.append(vector)
+        return encoded
+
+
+# ============================================================================
+# REGISTRO
+# ============================================================================
+
+_BACKEND_FACTORIES: Dict[str, Callable[..., Any]] = {
+    'lexical': LexicalBackend,
+    'hashing': HashingVectorizerBackend,
+}
+
+_BACKEND_INSTANCES: Dict[str, Any] = {}
+_DEFAULT_BACKEND = 'lexical'
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[..., Any]) -> None:
+    """
+    Registra un backend nuevo.
+    
+    Args:
+        name: Nombre con el que se referenciará el backend
+        factory: Clase o función que construye el backend
+    """
+    with _REGISTRY_LOCK:
+        _BACKEND_FACTORIES[name] = factory
+        _BACKEND_INSTANCES.pop(name, None)
+
+
+def available_backends() -> List[str]:
+    """Lista los nombres de backends registrados."""
+    return sorted(_BACKEND_FACTORIES.keys())
+
+
+def get_backend(name: Optional[str] = None, **kwargs) -> Any:
+    """
+    Devuelve una instancia de backend.
+    
+    Sin kwargs, la instancia se reutiliza entre llamadas (y con ella su
+    caché de vectores). Con kwargs se crea y registra una instancia nueva.
+    
+    Args:
+        name: Nombre del backend (default: el backend por defecto)
+        **kwargs: Parámetros para el constructor del backend
+    """
+    name = name or _DEFAULT_BACKEND
+    with _REGISTRY_LOCK:
+        if name not in _BACKEND_FACTORIES:
+            raise ValueError(f"Similarity backend '{name}' not found. Available: {', '.join(sorted(_BACKEND_FACTORIES))}")
+        if kwargs or name not in _BACKEND_INSTANCES:
+            _BACKEND_INSTANCES[name] = _BACKEND_FACTORIES[name](**kwargs)
+        return _BACKEND_INSTANCES[name]
+
+
+def set_default_backend(backend: Any, **kwargs) -> None:
+    """
+    Configura el backend usado cuando el escenario no especifica uno.
+    
+    Args:
+        backend: Nombre registrado o instancia que cumpla SimilarityBackend
+        **kwargs: Parámetros para el constructor (solo si backend es un nombre)
+    """
+    global _DEFAULT_BACKEND
+    if isinstance(backend, str):
+        get_backend(backend, **kwargs)
+        _DEFAULT_BACKEND = backend
+    else:
+        if not isinstance(backend, SimilarityBackend):
+            raise TypeError("backend must be a registered name or implement encode_batch/score_batch")
+        with _REGISTRY_LOCK:
+            _BACKEND_FACTORIES[backend.name] = type(backend)
+            _BACKEND_INSTANCES[backend.name] = backend
+        _DEFAULT_BACKEND = backend.name
+
+
+def get_default_backend_name() -> str:
+    """Nombre del backend por defecto actual."""
+    return _DEFAULT_BACKEND
+
+
+def resolve_backend(backend: Any = None) -> Any:
+    """
+    Resuelve None, un nombre o una instancia a una instancia de backend.
+    """
+    if backend is None or isinstance(backend, str):
+        return get_backend(backend)
+    return backend
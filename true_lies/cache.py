@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Caché LRU para Funciones Puras de Análisis
+==========================================
+
+Memoización acotada, local al proceso y segura entre hilos para las
+funciones puras del pipeline (detect_polarity, apply_semantic_mappings,
+extract_fact, calculate_semantic_similarity_metrics).
+
+Las claves combinan el hash del texto con una huella de la configuración
+(mapeos, configuración del hecho, léxico de polaridad, pesos), por lo que
+cambiar la configuración nunca devuelve un valor obsoleto.
+
+La caché está desactivada por defecto. Se activa globalmente o con el
+context manager:
+    
+    from true_lies.cache import caching, cache_stats
+    
+    with caching(maxsize=10000):
+        validate_llm_candidates(scenario, candidates)
+    print(cache_stats())
+
+También puede activarse con la variable de entorno TRUE_LIES_CACHE=1.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Caché LRU acotada con contadores de aciertos, fallos y desalojos."""
+    
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize: Cantidad máxima de entradas
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Any) -> Any:
+        """Devuelve el valor cacheado o _MISSING."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key: Any, value: Any) -> None:
+        """Guarda un valor desalojando las entradas menos usadas."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def resize(self, maxsize: int) -> None:
+        """Cambia el tamaño máximo (desalojando si hace falta)."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ============================================================================
+# ESTADO GLOBAL
+# ============================================================================
+
+_CACHES: Dict[str, LRUCache] = {}
+_STATE_LOCK = threading.Lock()
+_enabled = os.environ.get('TRUE_LIES_CACHE', '').lower() in ('1', 'true', 'yes', 'on')
+_maxsize = DEFAULT_MAXSIZE
+
+
+def is_caching_enabled() -> bool:
+    """Indica si la caché global está activa."""
+    return _enabled
+
+
+def enable_caching(maxsize: Optional[int] = None) -> None:
+    """
+    Activa la caché para todas las funciones memoizadas.
+    
+    Args:
+        maxsize: Tamaño máximo por función (opcional)
+    """
+    global _enabled, _maxsize
+    with _STATE_LOCK:
+        if maxsize is not None:
+            _maxsize = maxsize
+            for cache in _CACHES.values():
+                cache.resize(maxsize)
+        _enabled = True
+
+
+def disable_caching() -> None:
+    """Desactiva la caché (los valores guardados se conservan)."""
+    global _enabled
+    _enabled = False
+
+
+def clear_caches() -> None:
+    """Vacía todas las cachés y reinicia sus contadores."""
+    for cache in list(_CACHES.values()):
+        cache.clear()
+    _CONFIG_FINGERPRINTS.clear()
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Estadísticas por función memoizada."""
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+@contextmanager
+def caching(enabled: bool = True, maxsize: Optional[int] = None):
+    """
+    Context manager para activar (o desactivar) la caché temporalmente.
+    
+    Args:
+        enabled: Estado de la caché dentro del bloque
+        maxsize: Tamaño máximo por función (opcional)
+    """
+    global _enabled, _maxsize
+    previous_enabled, previous_maxsize = _enabled, _maxsize
+    if enabled:
+        enable_caching(maxsize)
+    else:
+        disable_caching()
+    try:
+        yield
+    finally:
+        with _STATE_LOCK:
+            if maxsize is not None and previous_maxsize != _maxsize:
+                _maxsize = previous_maxsize
+                for cache in _CACHES.values():
+                    cache.resize(previous_maxsize)
+            _enabled = previous_enabled
+
+
+# ============================================================================
+# CLAVES
+# ============================================================================
+
+def text_hash(text: Any) -> str:
+    """Hash estable de un texto (o de su repr si no es texto)."""
+    data = text if isinstance(text, str) else repr(text)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Huella estable de una configuración serializable.
+    
+    Los objetos no serializables (por ejemplo funciones en fact_config)
+    se representan con repr().
+    """
+    data = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Huellas de configuraciones repetidas entre llamadas: id -> (objeto, copia, huella)
+_CONFIG_FINGERPRINTS = LRUCache(1024)
+
+
+def config_fingerprint(config: Any) -> str:
+    """
+    Huella de una configuración que se repite entre llamadas (fact_config, mapeos, pesos).
+    
+    Igual a fingerprint(config), pero se guarda por objeto: si llega el mismo
+    dict con el mismo contenido (se compara contra una copia, así una
+    modificación en el lugar no devuelve una huella vieja) no se vuelve a
+    serializar.
+    """
+    if not isinstance(config, dict):
+        return fingerprint(config)
+    cached = _CONFIG_FINGERPRINTS.get(id(config))
+    if cached is not _MISSING and cached[0] is config and cached[1] == config:
+        return cached[2]
+    value = fingerprint(config)
+    _CONFIG_FINGERPRINTS.put(id(config), (config, copy.deepcopy(config), value))
+    return value
+
+
+def _copy_value(value: Any) -> Any:
+    """Copia superficial para que quien llama no mute el valor cacheado."""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def memoize(name: str, key_func: Callable[..., Any]) -> Callable:
+    """
+    Decorador que memoiza una función pura cuando la caché está activa.
+    
+    Args:
+        name: Nombre de la caché (aparece en cache_stats)
+        key_func: Recibe los mismos argumentos que la función y devuelve
+            la clave (hash del texto + huella de configuración)
+    """
+    def decorator(func: Callable) -> Callable:
+        with _STATE_LOCK:
+            cache = _CACHES.setdefault(name, LRUCache(_maxsize))
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            key = key_func(*args, **kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return _copy_value(value)
+        
+        wrapper.cache = cache
+        wrapper.uncached = func
+        return wrapper
+    
+    return decorator
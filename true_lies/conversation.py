@@ -22,10 +22,411 @@ Uso básico:
     )
 """
 
+import json
 import re
-from typing import Dict, List, Any, Optional, Union
-from .utils import extract_fact
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Union, Callable
+from .utils import extract_fact, extract_email, extract_phone
 from .extractors import EXTRACTORS
+from .gazetteer import Gazetteer
+from .backends import resolve_backend
+from .scenario import create_scenario
+from .validation_core import compile_scenario, validate_candidates_batch
+from .turn_history import Turn, TurnHistory
+
+
+# ============================================================================
+# DETECTORES COMPILADOS
+# ============================================================================
+
+# Tipos de fact y palabras clave para inferirlos del nombre (en orden de prioridad)
+FACT_TYPE_KEYWORDS = (
+    ('name', ('name', 'nombre')),
+    ('amount', ('amount', 'monto', 'precio', 'salary', 'income')),
+    ('id', ('id', 'ssn', 'cuenta')),
+    ('email', ('email', 'correo')),
+    ('phone', ('phone', 'telefono', 'teléfono')),
+    ('employer', ('employer', 'empleador')),
+    ('score', ('score', 'puntaje')),
+)
+
+FACT_TYPES = tuple(fact_type for fact_type, _ in FACT_TYPE_KEYWORDS) + ('generic',)
+
+_AMOUNT_PATTERNS = [
+    re.compile(r'\$[\d,]+\.?\d*', re.IGNORECASE),  # $360,000
+    re.compile(r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', re.IGNORECASE),  # 360,000
+    re.compile(r'USD\s*(\d+)', re.IGNORECASE),  # USD 360000
+    re.compile(r'(\d+)\s*dolares?', re.IGNORECASE),  # 360000 dolares
+]
+
+_SCORE_PATTERNS = [
+    re.compile(r'score[:\s]*(\d+)', re.IGNORECASE),
+    re.compile(r'puntaje[:\s]*(\d+)', re.IGNORECASE),
+    re.compile(r'(\d+)\s*points?', re.IGNORECASE),
+]
+
+_NON_DIGITS = re.compile(r'[^\d]')
+_WORDS = re.compile(r'\w+')
+
+# Tipos cuyos valores se comparan solo por sus dígitos ('$360,000' == '360000')
+_DIGIT_FACT_TYPES = ('amount', 'phone')
+
+# Tipos detectados por palabras sueltas (un valor puede compartir palabras con otro)
+_WORD_FACT_TYPES = ('name', 'employer')
+
+# Palabras comunes de empleadores que pueden no estar en la respuesta
+_EMPLOYER_COMMON_WORDS = {'inc', 'corp', 'llc', 'ltd', 'company', 'co'}
+
+
+def resolve_fact_type(fact_name: str) -> str:
+    """
+    Infiere el tipo de un fact a partir de su nombre.
+    
+    Args:
+        fact_name: Nombre del fact (ej: 'client_name', 'loan_amount')
+    
+    Returns:
+        str: Uno de FACT_TYPES ('generic' si ninguna palabra clave coincide)
+    """
+    fact_lower = fact_name.lower()
+    for fact_type, keywords in FACT_TYPE_KEYWORDS:
+        if any(keyword in fact_lower for keyword in keywords):
+            return fact_type
+    return 'generic'
+
+
+def _contains(response: str, gazetteer: Optional[Gazetteer]) -> Callable[[str], bool]:
+    """Prueba 'texto in respuesta' (un solo recorrido compartido si hay gazetteer)."""
+    if gazetteer is not None:
+        return gazetteer.matcher(response)
+    return response.lower().__contains__
+
+
+def _build_name_detector(expected_name: Any, gazetteer: Optional[Gazetteer] = None) -> Callable[[str], Optional[Any]]:
+    """Detecta nombres (partes individuales)."""
+    name_parts = str(expected_name).lower().split()
+    required = len(name_parts) * 0.5  # Al menos 50% de las partes
+    if gazetteer is not None:
+        gazetteer.add(name_parts)
+    
+    def detect(response: str) -> Optional[Any]:
+        contains = _contains(response, gazetteer)
+        found = sum(1 for part in name_parts if contains(part))
+        return expected_name if found >= required else None
+    
+    return detect
+
+
+def _build_amount_detector(expected_amount: Any) -> Callable[[str], Optional[Any]]:
+    """Detecta montos (múltiples formatos)."""
+    expected_num = _NON_DIGITS.sub('', str(expected_amount))
+    
+    def detect(response: str) -> Optional[Any]:
+        for pattern in _AMOUNT_PATTERNS:
+            for match in pattern.findall(response):
+                if _NON_DIGITS.sub('', str(match)) == expected_num:
+                    return match
+        return None
+    
+    return detect
+
+
+def _build_id_detector(expected_id: Any, gazetteer: Optional[Gazetteer] = None) -> Callable[[str], Optional[Any]]:
+    """Detecta IDs (coincidencia exacta)."""
+    expected_lower = str(expected_id).lower()
+    if gazetteer is not None:
+        gazetteer.add([expected_lower])
+    
+    def detect(response: str) -> Optional[Any]:
+        return expected_id if _contains(response, gazetteer)(expected_lower) else None
+    
+    return detect
+
+
+def _build_email_detector(expected_email: Any) -> Callable[[str], Optional[Any]]:
+    """Detecta emails usando el extractor de email de utils.py."""
+    expected_lower = str(expected_email).lower()
+    
+    def detect(response: str) -> Optional[Any]:
+        detected_email = extract_email(response)
+        if detected_email and detected_email.lower() == expected_lower:
+            return detected_email
+        return None
+    
+    return detect
+
+
+def _build_phone_detector(expected_phone: Any) -> Callable[[str], Optional[Any]]:
+    """Detecta números de teléfono comparando solo los dígitos."""
+    expected_digits = _NON_DIGITS.sub('', str(expected_phone))
+    
+    def detect(response: str) -> Optional[Any]:
+        detected_phone = extract_phone(response)
+        if detected_phone and _NON_DIGITS.sub('', detected_phone) == expected_digits:
+            return detected_phone
+        return None
+    
+    return detect
+
+
+def _build_employer_detector(expected_employer: Any, gazetteer: Optional[Gazetteer] = None) -> Callable[[str], Optional[Any]]:
+    """Detecta empleadores (exacto o por palabras significativas)."""
+    employer_lower = str(expected_employer).lower()
+    employer_words = employer_lower.split()
+    meaningful_words = [word for word in employer_words if word not in _EMPLOYER_COMMON_WORDS]
+    if meaningful_words:
+        words, ratio = meaningful_words, 0.5  # Al menos 50% de las palabras significativas
+    else:
+        # Si todas las palabras son comunes, exigir más coincidencias
+        words, ratio = employer_words, 0.7
+    required = len(words) * ratio
+    if gazetteer is not None:
+        gazetteer.add([employer_lower, *words])
+    
+    def detect(response: str) -> Optional[Any]:
+        contains = _contains(response, gazetteer)
+        if contains(employer_lower):
+            return expected_employer
+        if words and sum(1 for word in words if contains(word)) >= required:
+            return expected_employer
+        return None
+    
+    return detect
+
+
+def _build_score_detector(expected_score: Any) -> Callable[[str], Optional[Any]]:
+    """Detecta scores y términos."""
+    expected_str = str(expected_score)
+    
+    def detect(response: str) -> Optional[Any]:
+        if expected_str in response:
+            return expected_score
+        for pattern in _SCORE_PATTERNS:
+            for match in pattern.findall(response):
+                if match == expected_str:
+                    return match
+        return None
+    
+    return detect
+
+
+def _build_generic_detector(expected_value: Any) -> Callable[[str], Optional[Any]]:
+    """Detección genérica usando extractores existentes."""
+    expected_str = str(expected_value)
+    expected_lower = expected_str.lower()
+    # categorical y regex necesitan configuración (patterns/pattern)
+    extractors = [func for name, func in EXTRACTORS.items() if name not in ('categorical', 'regex')]
+    
+    def detect(response: str) -> Optional[Any]:
+        for extractor_func in extractors:
+            try:
+                result = extractor_func(response)
+            except Exception:
+                continue
+            if result and str(result) == expected_str:
+                return result
+        
+        # Fallback: búsqueda de texto simple
+        if expected_lower in response.lower():
+            return expected_value
+        return None
+    
+    return detect
+
+
+# Extractores del pipeline core por tipo de detector (validate_full_conversation)
+_CORE_EXTRACTORS = {
+    'amount': 'money',
+    'email': 'email',
+    'phone': 'phone',
+}
+
+# Extractores core que se reconocen por el nombre del fact
+_CORE_EXTRACTOR_KEYWORDS = (
+    ('date', ('date', 'fecha')),
+    ('percentage', ('percentage', 'porcentaje')),
+    ('hours', ('hours', 'horas')),
+)
+
+_DETECTOR_BUILDERS = {
+    'name': _build_name_detector,
+    'amount': _build_amount_detector,
+    'id': _build_id_detector,
+    'email': _build_email_detector,
+    'phone': _build_phone_detector,
+    'employer': _build_employer_detector,
+    'score': _build_score_detector,
+    'generic': _build_generic_detector,
+}
+
+# Tipos cuyos detectores pueden compartir el recorrido de un Gazetteer
+GAZETTEER_FACT_TYPES = ('name', 'id', 'employer')
+
+
+def build_detector(fact_type: str, expected_value: Any,
+                   gazetteer: Optional[Gazetteer] = None) -> Callable[[str], Optional[Any]]:
+    """
+    Construye un detector especializado para un fact.
+    
+    Los patrones se precompilan y el valor esperado se normaliza una sola
+    vez; el detector devuelto solo recorre la respuesta.
+    
+    Args:
+        fact_type: Tipo de fact (uno de FACT_TYPES)
+        expected_value: Valor esperado del fact
+        gazetteer: Gazetteer donde registrar las entidades del fact (solo
+            GAZETTEER_FACT_TYPES); los detectores que lo comparten recorren
+            cada respuesta una sola vez
+    
+    Returns:
+        callable: detector(response) -> valor detectado o None
+    """
+    if fact_type not in _DETECTOR_BUILDERS:
+        raise ValueError(f"Fact type '{fact_type}' not found. Available: {', '.join(FACT_TYPES)}")
+    if gazetteer is not None and fact_type in GAZETTEER_FACT_TYPES:
+        return _DETECTOR_BUILDERS[fact_type](expected_value, gazetteer)
+    return _DETECTOR_BUILDERS[fact_type](expected_value)
+
+
+def _canonical_fact_value(fact_type: str, value: Any) -> str:
+    """Forma normalizada de un valor para comparar versiones de un fact."""
+    text = ' '.join(str(value).split()).casefold()
+    if fact_type in _DIGIT_FACT_TYPES:
+        return _NON_DIGITS.sub('', text) or text
+    return text
+
+
+def _build_stale_detector(fact_type: str, old_value: Any, old_detector: Callable[[str], Optional[Any]],
+                          current_value: Any) -> Callable[[str], Optional[Any]]:
+    """
+    Detector de un valor reemplazado por current_value.
+    
+    Los detectores son tolerantes y un valor anterior puede compartir partes con
+    el vigente (ej: 'Sarah Johnson' -> 'Sarah Smith', '5' -> '15'), así que
+    una respuesta solo repite el valor anterior si menciona lo que lo distingue
+    del vigente.
+    """
+    if fact_type in _WORD_FACT_TYPES:
+        current_words = set(_WORDS.findall(str(current_value).casefold()))
+        distinct = [word for word in _WORDS.findall(str(old_value).casefold()) if word not in current_words]
+        if not distinct:
+            return lambda response: None
+        pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, distinct)) + r')\b', re.IGNORECASE)
+        return lambda response: old_detector(response) if pattern.search(response) else None
+    
+    # Se ignoran las menciones del valor vigente antes de buscar el anterior
+    current_text = str(current_value).strip()
+    if not current_text:
+        return old_detector
+    pattern = re.compile(r'(?<![\w.,])' + re.escape(current_text) + r'(?!\w|[.,]\d)', re.IGNORECASE)
+    return lambda response: old_detector(pattern.sub(' ', response))
+
+
+def _check_retention(response: str, checks: List[tuple]) -> Dict[str, Any]:
+    """Aplica los detectores preparados a una respuesta."""
+    retention_results = {}
+    facts_retained = 0
+    total_facts = len(checks)
+    
+    stale_facts = []
+    
+    # Verificar cada fact individualmente
+    for fact_name, expected_value, detector, superseded in checks:
+        if detector is None:
+            retention_results[f'{fact_name}_retained'] = False
+            retention_results[f'{fact_name}_reason'] = 'Fact not found in conversation context'
+            continue
+        
+        is_retained = detector(response)
+        
+        retention_results[f'{fact_name}_retained'] = is_retained is not None
+        retention_results[f'{fact_name}_detected'] = is_retained
+        retention_results[f'{fact_name}_expected'] = expected_value
+        
+        if is_retained is not None:
+            facts_retained += 1
+        
+        # Valores reemplazados en turnos posteriores que la respuesta repite
+        for old_value, old_detector in superseded:
+            if old_detector(response) is not None:
+                retention_results[f'{fact_name}_stale_value'] = old_value
+                stale_facts.append(fact_name)
+                break
+    
+    # Calcular métricas generales
+    retention_score = facts_retained / total_facts if total_facts > 0 else 0.0
+    all_retained = facts_retained == total_facts
+    
+    return {
+        'retention_score': retention_score,
+        'facts_retained': facts_retained,
+        'total_facts': total_facts,
+        'all_retained': all_retained,
+        'stale_facts': stale_facts,
+        **retention_results
+    }
+
+
+def aggregate_retention(results: List[Dict[str, Any]], facts_to_check: List[str]) -> Dict[str, Any]:
+    """
+    Estadísticas de retención de un lote de respuestas.
+    
+    Args:
+        results: Resultados de validate_retention, uno por respuesta
+        facts_to_check: Facts verificados
+    
+    Returns:
+        dict: Media, mínimo, máximo y desviación del retention_score, tasa de
+            respuestas con retención total y tasa de retención por fact
+    """
+    count = len(results)
+    scores = [result['retention_score'] for result in results]
+    mean = sum(scores) / count if count else 0.0
+    variance = sum((score - mean) ** 2 for score in scores) / count if count else 0.0
+    return {
+        'responses': count,
+        'mean_retention': mean,
+        'min_retention': min(scores) if scores else 0.0,
+        'max_retention': max(scores) if scores else 0.0,
+        'std_retention': variance ** 0.5,
+        'all_retained_rate': sum(1 for result in results if result['all_retained']) / count if count else 0.0,
+        'per_fact_retention': {
+            fact_name: sum(1 for result in results if result.get(f'{fact_name}_retained')) / count if count else 0.0
+            for fact_name in facts_to_check
+        },
+    }
+
+
+# Estado de cada proceso del pool de validate_retention_batch
+_WORKER_CHECKS = None
+
+
+def _init_retention_worker(fact_types: Dict[str, str], context: Dict[str, Any],
+                           timeline: Dict[str, tuple], facts_to_check: List[str],
+                           as_of_turn: Optional[int]) -> None:
+    """Reconstruye los detectores en el proceso (las closures no se serializan)."""
+    global _WORKER_CHECKS
+    validator = ConversationValidator(fact_types=fact_types)
+    validator.conversation_facts = context
+    validator._timeline = timeline
+    _WORKER_CHECKS = validator._retention_checks(facts_to_check, as_of_turn)
+
+
+def _retention_worker(responses: List[str]) -> List[Dict[str, Any]]:
+    """Valida un bloque de respuestas con los detectores del proceso."""
+    return [_check_retention(response, _WORKER_CHECKS) for response in responses]
+
+
+# Escenarios compilados que guarda cada validador para validate_full_conversation
+MAX_CORE_SCENARIOS = 16
+
+# Formato versionado de to_bytes / to_json
+SERIALIZATION_FORMAT = 'true_lies.conversation'
+SERIALIZATION_VERSION = 1
+_BYTES_MAGIC = b'TLCV'
 
 
 class ConversationValidator:
@@ -36,10 +437,131 @@ class ConversationValidator:
     si el LLM mantiene el contexto en respuestas posteriores.
     """
     
-    def __init__(self):
-        """Inicializar el validador de conversación."""
+    def __init__(self, fact_types: Optional[Dict[str, str]] = None, track_retention: bool = False,
+                 max_turns_in_memory: Optional[int] = None, spill_path: Optional[str] = None):
+        """
+        Inicializar el validador de conversación.
+        
+        Args:
+            fact_types: Tipos explícitos por fact (ej: {'ref': 'id'}). Los facts
+                no listados infieren su tipo del nombre (ver FACT_TYPES).
+            track_retention: Si True, add_turn verifica en cada respuesta del bot
+                los facts introducidos en turnos anteriores (ver get_retention_curve).
+            max_turns_in_memory: Turnos del historial a mantener en memoria
+                (None: todos). conversation_facts siempre conserva todos los facts.
+            spill_path: Log JSONL para los turnos que salen de la ventana (opcional)
+        """
+        for fact_name, fact_type in (fact_types or {}).items():
+            if fact_type not in FACT_TYPES:
+                raise ValueError(f"Fact type '{fact_type}' for '{fact_name}' not found. Available: {', '.join(FACT_TYPES)}")
+        self.fact_types = dict(fact_types or {})
         self.conversation_facts = {}
-        self.turn_history = []
+        self.turn_history = TurnHistory(max_turns_in_memory, spill_path)
+        self._detectors = {}
+        self._retention_detectors = {}
+        # Tipo de detector resuelto por fact (metadatos que viajan al serializar)
+        self._resolved_types = {}
+        # Nombres, empleadores e IDs vistos en la conversación (un recorrido por respuesta)
+        self.gazetteer = Gazetteer()
+        # Escenarios compilados de validate_full_conversation (los más recientes)
+        self._core_scenarios = OrderedDict()
+        # Línea de tiempo por fact: (turnos, valores) ordenados por turno
+        self._timeline = {}
+        self.track_retention = track_retention
+        self.retention_matrix = []
+        self._fact_retention = {}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Estado serializable: los detectores (closures) se reconstruyen al restaurar."""
+        state = self.__dict__.copy()
+        state['_detectors'] = {}
+        state['_retention_detectors'] = {}
+        state['gazetteer'] = Gazetteer()
+        state['_core_scenarios'] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._restore_detectors()
+    
+    def _restore_detectors(self) -> None:
+        """Reconstruye los detectores de cada versión de los facts acumulados."""
+        for fact_name, (_, values) in self._timeline.items():
+            for value in values:
+                self._get_detector(fact_name, value)
+        for fact_name, value in self.conversation_facts.items():
+            self._retention_detectors[fact_name] = (value, self._get_detector(fact_name, value))
+    
+    # ------------------------------------------------------------------
+    # Serialización
+    # ------------------------------------------------------------------
+    
+    def to_json(self) -> str:
+        """
+        Serializa el estado de la conversación a JSON.
+        
+        Incluye configuración, facts, línea de tiempo, historial en memoria,
+        seguimiento de retención y el tipo de detector resuelto por fact, de
+        modo que from_json no repite la inferencia de tipos. Los valores no
+        representables en JSON se guardan como texto.
+        """
+        state = {
+            'format': SERIALIZATION_FORMAT,
+            'version': SERIALIZATION_VERSION,
+            'fact_types': self.fact_types,
+            'track_retention': self.track_retention,
+            'facts': self.conversation_facts,
+            'detectors': {fact_name: self._resolve_type(fact_name) for fact_name in self._timeline},
+            'timeline': {fact_name: [turns, values] for fact_name, (turns, values) in self._timeline.items()},
+            'turn_history': self.turn_history.export_state(),
+            'retention_matrix': self.retention_matrix,
+            'fact_retention': self._fact_retention,
+        }
+        return json.dumps(state, ensure_ascii=False, separators=(',', ':'), default=str)
+    
+    @classmethod
+    def from_json(cls, data: str) -> 'ConversationValidator':
+        """
+        Restaura un validador serializado con to_json.
+        
+        Raises:
+            ValueError: Si el formato o la versión no son compatibles
+        """
+        state = json.loads(data)
+        if state.get('format') != SERIALIZATION_FORMAT:
+            raise ValueError("Data is not a serialized ConversationValidator")
+        if state.get('version') != SERIALIZATION_VERSION:
+            raise ValueError(f"Unsupported serialization version {state.get('version')} "
+                             f"(expected {SERIALIZATION_VERSION})")
+        
+        validator = cls(fact_types=state['fact_types'], track_retention=state['track_retention'])
+        validator.conversation_facts = state['facts']
+        validator._resolved_types = state['detectors']
+        validator._timeline = {fact_name: (turns, values) for fact_name, (turns, values) in state['timeline'].items()}
+        validator.turn_history = TurnHistory.from_state(state['turn_history'])
+        validator.retention_matrix = state['retention_matrix']
+        validator._fact_retention = state['fact_retention']
+        validator._restore_detectors()
+        return validator
+    
+    def to_bytes(self) -> bytes:
+        """Serializa el estado en formato binario compacto (to_json comprimido con zlib)."""
+        return _BYTES_MAGIC + bytes([SERIALIZATION_VERSION]) + zlib.compress(self.to_json().encode('utf-8'))
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ConversationValidator':
+        """
+        Restaura un validador serializado con to_bytes.
+        
+        Raises:
+            ValueError: Si el formato o la versión no son compatibles
+        """
+        header = len(_BYTES_MAGIC)
+        if len(data) <= header or data[:header] != _BYTES_MAGIC:
+            raise ValueError("Data is not a serialized ConversationValidator")
+        if data[header] != SERIALIZATION_VERSION:
+            raise ValueError(f"Unsupported serialization version {data[header]} (expected {SERIALIZATION_VERSION})")
+        return cls.from_json(zlib.decompress(data[header + 1:]).decode('utf-8'))
     
     def add_turn(self, user_input: str, bot_response: str, expected_facts: Dict[str, Any]) -> None:
         """
@@ -50,111 +572,257 @@ class ConversationValidator:
             bot_response: Respuesta del bot en este turno
             expected_facts: Facts esperados a extraer de este turno
         """
-        # Extraer facts del turno actual
+        # Extraer facts del turno actual. Los detectores se preparan antes de
+        # usarlos para registrar todas las entidades del turno en el gazetteer
+        turn_text = f"{user_input} {bot_response}"
+        detectors = [
+            (fact_name, self._get_detector(fact_name, expected_value))
+            for fact_name, expected_value in expected_facts.items()
+        ]
         turn_facts = {}
-        for fact_name, expected_value in expected_facts.items():
-            # Usar extractores existentes para detectar facts
-            extracted = self._detect_fact_in_response(
-                f"{user_input} {bot_response}", 
-                fact_name, 
-                expected_value
-            )
+        for fact_name, detector in detectors:
+            extracted = detector(turn_text)
             if extracted is not None:
                 turn_facts[fact_name] = extracted
         
+        if self.track_retention:
+            self._track_turn_retention(bot_response, turn_facts)
+        
         # Acumular facts en el contexto conversacional
+        turn_number = len(self.turn_history) + 1
         self.conversation_facts.update(turn_facts)
+        for fact_name, value in turn_facts.items():
+            self._retention_detectors[fact_name] = (value, self._get_detector(fact_name, value))
+            self._record_fact_version(fact_name, turn_number, value)
         
         # Guardar historial del turno
-        self.turn_history.append({
-            'user_input': user_input,
-            'bot_response': bot_response,
-            'expected_facts': expected_facts,
-            'extracted_facts': turn_facts
+        self.turn_history.append(Turn(
+            turn_number, user_input, bot_response, expected_facts, turn_facts
+        ))
+    
+    def _record_fact_version(self, fact_name: str, turn_number: int, value: Any) -> None:
+        """
+        Agrega una versión a la línea de tiempo del fact.
+        
+        Repetir un valor equivalente (misma forma normalizada, ej: '$360,000'
+        y '360000') no crea una versión nueva: solo actualiza la vigente, así la
+        línea de tiempo siempre termina en el valor de conversation_facts.
+        """
+        turns, values = self._timeline.setdefault(fact_name, ([], []))
+        fact_type = self._resolve_type(fact_name)
+        if values and _canonical_fact_value(fact_type, values[-1]) == _canonical_fact_value(fact_type, value):
+            values[-1] = value
+            return
+        turns.append(turn_number)
+        values.append(value)
+    
+    def fact_value_at(self, fact_name: str, turn: int) -> Optional[Any]:
+        """
+        Valor de un fact vigente en un turno (búsqueda binaria en su línea de tiempo).
+        
+        Args:
+            fact_name: Nombre del fact
+            turn: Número de turno (desde 1)
+        
+        Returns:
+            Valor vigente en ese turno o None si aún no se había mencionado
+        """
+        turns, values = self._timeline.get(fact_name, ((), ()))
+        position = bisect_right(turns, turn)
+        return values[position - 1] if position else None
+    
+    def get_fact_timeline(self, fact_name: str) -> List[tuple]:
+        """Versiones de un fact como lista ordenada de (turno, valor)."""
+        turns, values = self._timeline.get(fact_name, ((), ()))
+        return list(zip(turns, values))
+    
+    def _track_turn_retention(self, bot_response: str, turn_facts: Dict[str, Any]) -> None:
+        """
+        Registra qué facts de turnos anteriores conserva la respuesta del bot.
+        
+        Cada turno aplica una vez los detectores ya construidos de los facts
+        introducidos antes, por lo que la curva completa se obtiene en una sola
+        pasada sobre la conversación.
+        """
+        turn_number = len(self.retention_matrix) + 1
+        retained = {}
+        for fact_name, state in self._fact_retention.items():
+            detector = self._retention_detectors[fact_name][1]
+            if detector(bot_response) is not None:
+                retained[fact_name] = True
+                state['last_retained_at'] = turn_number
+            else:
+                retained[fact_name] = False
+                if state['first_missed_at'] is None:
+                    state['first_missed_at'] = turn_number
+        
+        for fact_name in turn_facts:
+            self._fact_retention.setdefault(fact_name, {
+                'introduced_at': turn_number,
+                'last_retained_at': turn_number,
+                'first_missed_at': None,
+            })
+        
+        self.retention_matrix.append({
+            'turn': turn_number,
+            'retained': retained,
+            'retention_score': sum(retained.values()) / len(retained) if retained else 1.0,
         })
     
-    def validate_retention(self, response: str, facts_to_check: List[str]) -> Dict[str, Any]:
+    def get_retention_curve(self) -> Dict[str, Any]:
+        """
+        Curva de retención por turno (requiere track_retention=True).
+        
+        Returns:
+            dict: 'matrix' (por turno, qué facts anteriores conserva la respuesta),
+                'curve' (retention_score por turno) y 'facts' con, por fact,
+                el turno en que se introdujo, el último turno que lo conserva,
+                el primer turno que lo omite y 'forgotten_at': el turno desde el
+                cual no vuelve a aparecer (None si la última respuesta lo conserva).
+        """
+        total_turns = len(self.retention_matrix)
+        facts = {}
+        for fact_name, state in self._fact_retention.items():
+            forgotten_at = state['last_retained_at'] + 1
+            facts[fact_name] = {
+                **state,
+                'forgotten_at': forgotten_at if forgotten_at <= total_turns else None,
+            }
+        return {
+            'matrix': self.retention_matrix,
+            'curve': [row['retention_score'] for row in self.retention_matrix],
+            'facts': facts,
+        }
+    
+    def validate_retention(self, response: str, facts_to_check: List[str],
+                           as_of_turn: Optional[int] = None) -> Dict[str, Any]:
         """
         Valida memoria en respuesta final.
         
+        Además de la retención, reporta en 'stale_facts' los facts para los que
+        la respuesta repite un valor ya reemplazado (ej: un monto corregido).
+        
         Args:
             response: Respuesta del bot a validar
             facts_to_check: Lista de facts a verificar en la respuesta
-            
+            as_of_turn: Validar contra los valores vigentes en ese turno
+                (None: los valores más recientes)
+        
         Returns:
             dict: Métricas de retención detalladas
         """
-        retention_results = {}
-        facts_retained = 0
-        total_facts = len(facts_to_check)
+        return _check_retention(response, self._retention_checks(facts_to_check, as_of_turn))
+    
+    def validate_retention_batch(self, responses: List[str], facts_to_check: List[str],
+                                 workers: Optional[int] = None, as_of_turn: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Valida memoria en varias respuestas finales alternativas.
         
-        # Verificar cada fact individualmente
-        for fact_name in facts_to_check:
-            if fact_name not in self.conversation_facts:
-                retention_results[f'{fact_name}_retained'] = False
-                retention_results[f'{fact_name}_reason'] = 'Fact not found in conversation context'
-                continue
-            
-            expected_value = self.conversation_facts[fact_name]
-            is_retained = self._detect_fact_in_response(response, fact_name, expected_value)
-            
-            retention_results[f'{fact_name}_retained'] = is_retained is not None
-            retention_results[f'{fact_name}_detected'] = is_retained
-            retention_results[f'{fact_name}_expected'] = expected_value
-            
-            if is_retained is not None:
-                facts_retained += 1
+        Los detectores se preparan una sola vez para todo el lote. Con
+        workers > 1 las respuestas se reparten en un pool de procesos; cada
+        proceso reconstruye los detectores al iniciar.
         
-        # Calcular métricas generales
-        retention_score = facts_retained / total_facts if total_facts > 0 else 0.0
-        all_retained = facts_retained == total_facts
+        Args:
+            responses: Respuestas alternativas del bot a validar
+            facts_to_check: Lista de facts a verificar en cada respuesta
+            workers: Procesos a usar (None o 1: en este proceso)
+            as_of_turn: Validar contra los valores vigentes en ese turno (opcional)
+        
+        Returns:
+            dict: {'results': un resultado de validate_retention por respuesta,
+                   'aggregate': estadísticas de retención del lote}
+        """
+        if workers and workers > 1 and len(responses) > 1:
+            chunk_size = max(1, -(-len(responses) // (workers * 4)))
+            chunks = [responses[i:i + chunk_size] for i in range(0, len(responses), chunk_size)]
+            context = {name: self.conversation_facts[name] for name in facts_to_check if name in self.conversation_facts}
+            timeline = {name: self._timeline[name] for name in facts_to_check if name in self._timeline}
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_retention_worker,
+                                     initargs=(self.fact_types, context, timeline, list(facts_to_check), as_of_turn)) as pool:
+                results = [result for chunk_results in pool.map(_retention_worker, chunks) for result in chunk_results]
+        else:
+            checks = self._retention_checks(facts_to_check, as_of_turn)
+            results = [_check_retention(response, checks) for response in responses]
         
         return {
-            'retention_score': retention_score,
-            'facts_retained': facts_retained,
-            'total_facts': total_facts,
-            'all_retained': all_retained,
-            **retention_results
+            'results': results,
+            'aggregate': aggregate_retention(results, facts_to_check)
         }
     
+    def _retention_checks(self, facts_to_check: List[str], as_of_turn: Optional[int] = None) -> List[tuple]:
+        """
+        Prepara (fact, valor esperado, detector, valores reemplazados) por fact.
+        
+        Los valores reemplazados son las versiones anteriores a la vigente,
+        cada una con su detector, para detectar valores obsoletos.
+        """
+        checks = []
+        for fact_name in facts_to_check:
+            turns, values = self._timeline.get(fact_name, ((), ()))
+            if as_of_turn is None:
+                current = len(values) - 1
+                present = fact_name in self.conversation_facts
+                expected_value = self.conversation_facts.get(fact_name)
+            else:
+                current = bisect_right(turns, as_of_turn) - 1
+                present = current >= 0
+                expected_value = values[current] if present else None
+            
+            if not present:
+                checks.append((fact_name, None, None, ()))
+                continue
+            
+            if as_of_turn is None:
+                detector = self._retention_detector(fact_name, expected_value)
+            else:
+                detector = self._get_detector(fact_name, expected_value)
+            # Se omiten versiones equivalentes a la vigente (ej: un valor que volvió)
+            fact_type = self._resolve_type(fact_name)
+            canonical = _canonical_fact_value(fact_type, expected_value)
+            superseded = [
+                (value, _build_stale_detector(fact_type, value, self._get_detector(fact_name, value), expected_value))
+                for value in values[:max(current, 0)]
+                if _canonical_fact_value(fact_type, value) != canonical
+            ]
+            checks.append((fact_name, expected_value, detector, superseded))
+        return checks
+    
     def validate_full_conversation(self, final_response: str, facts_to_check: List[str], 
-                                 similarity_threshold: float = 0.8) -> Dict[str, Any]:
+                                 similarity_threshold: float = 0.8,
+                                 backend: Optional[Any] = None,
+                                 reference: Optional[str] = None) -> Dict[str, Any]:
         """
         Combina retención + validación core para análisis completo.
         
+        La validación core usa el mismo pipeline que la validación de
+        candidatos: un escenario compilado a partir de los facts acumulados
+        (extractores por tipo de fact y referencia semántica). El escenario
+        se compila una vez por versión de los facts y se reutiliza entre
+        respuestas finales.
+        
+        Sin reference, la referencia semántica se arma con los facts
+        ("Client name: Sarah Johnson. ...") y ninguna respuesta real se le
+        parece lo suficiente: su similarity_score se informa pero no decide
+        is_valid.
+        
         Args:
             final_response: Respuesta final del bot
             facts_to_check: Facts a verificar
-            similarity_threshold: Umbral de similitud semántica (para uso futuro)
-            
+            similarity_threshold: Umbral de similitud semántica (solo con reference)
+            backend: Backend de similitud (nombre o instancia, opcional)
+            reference: Respuesta de referencia para la validación semántica (opcional)
+        
         Returns:
             dict: Resultados combinados de retención y validación core
         """
         # Validar retención
         retention_results = self.validate_retention(final_response, facts_to_check)
         
-        # Crear escenario para validación core (usando facts acumulados)
-        core_facts = {}
-        for fact_name in facts_to_check:
-            if fact_name in self.conversation_facts:
-                # Usar extractores apropiados según el tipo de fact
-                extractor_type = self._get_extractor_type(fact_name)
-                core_facts[fact_name] = {
-                    'extractor': extractor_type,
-                    'expected': str(self.conversation_facts[fact_name])
-                }
-        
-        # Crear referencia semántica basada en facts acumulados
-        # semantic_reference = self._build_semantic_reference()  # TODO: Implementar validación semántica
-        
-        # Aplicar validación core (simulada - en implementación real usaría validation_core)
-        # similarity_threshold se usará para validación semántica futura
-        core_validation = {
-            'factual_accuracy': retention_results['all_retained'],
-            'similarity_score': 1.0,  # Placeholder - implementar con semantic.py
-            'polarity_match': True,   # Placeholder - implementar con polarity.py
-            'is_valid': retention_results['all_retained']
-        }
+        # Validación core con el escenario compilado de los facts acumulados
+        compiled = self._core_scenario(facts_to_check, backend, reference)
+        if reference is None:
+            similarity_threshold = 0.0
+        core_validation = validate_candidates_batch([final_response], compiled, similarity_threshold)[0]
         
         return {
             **retention_results,
@@ -163,229 +831,177 @@ class ConversationValidator:
             'turn_count': len(self.turn_history)
         }
     
-    def _detect_fact_in_response(self, response: str, fact_name: str, expected_value: Any) -> Optional[Any]:
+    def _core_scenario(self, facts_to_check: List[str], backend: Optional[Any] = None,
+                       reference: Optional[str] = None) -> Dict[str, Any]:
         """
-        Lógica inteligente de detección de facts por tipo.
+        Escenario compilado para validate_full_conversation.
         
-        Args:
-            response: Texto donde buscar el fact
-            fact_name: Nombre del fact a detectar
-            expected_value: Valor esperado del fact
-            
-        Returns:
-            Valor detectado o None si no se encuentra
+        Se guarda uno por lista de facts, backend (su huella) y referencia,
+        hasta MAX_CORE_SCENARIOS; se recompila solo cuando cambia el valor
+        de alguno de esos facts.
         """
-        # Detección específica por tipo de fact
-        if 'name' in fact_name.lower() or 'nombre' in fact_name.lower():
-            return self._detect_name_in_response(response, expected_value)
-        elif 'amount' in fact_name.lower() or 'monto' in fact_name.lower() or 'precio' in fact_name.lower() or 'salary' in fact_name.lower() or 'income' in fact_name.lower():
-            return self._detect_amount_in_response(response, expected_value)
-        elif 'id' in fact_name.lower() or 'ssn' in fact_name.lower() or 'cuenta' in fact_name.lower():
-            return self._detect_id_in_response(response, expected_value)
-        elif 'email' in fact_name.lower() or 'correo' in fact_name.lower():
-            return self._detect_email_in_response(response, expected_value)
-        elif 'phone' in fact_name.lower() or 'telefono' in fact_name.lower() or 'teléfono' in fact_name.lower():
-            return self._detect_phone_in_response(response, expected_value)
-        elif 'employer' in fact_name.lower() or 'empleador' in fact_name.lower():
-            return self._detect_employer_in_response(response, expected_value)
-        elif 'score' in fact_name.lower() or 'puntaje' in fact_name.lower():
-            return self._detect_score_in_response(response, expected_value)
-        else:
-            # Detección genérica usando extractores existentes
-            return self._detect_generic_fact(response, fact_name, expected_value)
-    
-    def _detect_name_in_response(self, response: str, expected_name: str) -> Optional[str]:
-        """Detecta nombres (partes individuales)."""
-        name_parts = expected_name.lower().split()
-        response_lower = response.lower()
+        backend = resolve_backend(backend)
+        backend_id = backend.fingerprint() if hasattr(backend, 'fingerprint') else getattr(backend, 'name', type(backend).__name__)
+        cache_key = (tuple(facts_to_check), backend_id, reference)
+        version = tuple(
+            (fact_name, repr(self.conversation_facts[fact_name]))
+            for fact_name in facts_to_check if fact_name in self.conversation_facts
+        )
+        cached = self._core_scenarios.get(cache_key)
+        if cached is not None and cached[0] == version:
+            self._core_scenarios.move_to_end(cache_key)
+            return cached[1]
         
-        # Buscar partes del nombre individualmente
-        found_parts = [part for part in name_parts if part in response_lower]
+        # Crear escenario para validación core (usando facts acumulados)
+        core_facts = {}
+        for fact_name in facts_to_check:
+            if fact_name in self.conversation_facts:
+                core_facts[fact_name] = self._core_fact_config(fact_name, self.conversation_facts[fact_name])
         
-        if len(found_parts) >= len(name_parts) * 0.5:  # Al menos 50% de las partes
-            return expected_name
-        return None
+        if reference is None:
+            reference = self._build_semantic_reference(facts_to_check)
+        scenario = create_scenario(core_facts, reference)
+        compiled = compile_scenario(scenario, backend)
+        self._core_scenarios[cache_key] = (version, compiled)
+        self._core_scenarios.move_to_end(cache_key)
+        while len(self._core_scenarios) > MAX_CORE_SCENARIOS:
+            self._core_scenarios.popitem(last=False)
+        return compiled
     
-    def _detect_amount_in_response(self, response: str, expected_amount: str) -> Optional[str]:
-        """Detecta montos (múltiples formatos)."""
-        # Normalizar expected_amount
-        expected_num = re.sub(r'[^\d]', '', str(expected_amount))
-        
-        # Buscar patrones de montos
-        amount_patterns = [
-            r'\$[\d,]+\.?\d*',  # $360,000
-            r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # 360,000
-            r'USD\s*(\d+)',  # USD 360000
-            r'(\d+)\s*dolares?',  # 360000 dolares
-        ]
+    def _core_fact_config(self, fact_name: str, value: Any) -> Dict[str, Any]:
+        """
+        Configuración de extractor para un fact acumulado.
         
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            for match in matches:
-                match_num = re.sub(r'[^\d]', '', str(match))
-                if match_num == expected_num:
-                    return match
+        El valor esperado se normaliza con el propio extractor para que
+        coincida con el formato que devuelve al extraerlo de la respuesta.
+        """
+        extractor_type = self._get_extractor_type(fact_name)
+        expected = str(value)
+        if extractor_type == 'categorical':
+            return {'extractor': 'categorical', 'expected': expected,
+                    'patterns': {expected: self._core_synonyms(fact_name, expected)}}
         
-        return None
+        config = {'extractor': extractor_type, 'expected': expected}
+        normalized = extract_fact(expected, config)
+        if normalized is None and extractor_type == 'money':
+            # Monto sin moneda (ej: '360000'): se espera con símbolo y separadores
+            digits = _NON_DIGITS.sub('', expected)
+            normalized = f"${int(digits):,}" if digits else None
+        if normalized is not None:
+            config['expected'] = normalized
+        return config
     
-    def _detect_id_in_response(self, response: str, expected_id: str) -> Optional[str]:
-        """Detecta IDs (coincidencia exacta)."""
-        # Para IDs, buscar coincidencia exacta
-        if str(expected_id).lower() in response.lower():
-            return expected_id
-        return None
+    def _core_synonyms(self, fact_name: str, expected: str) -> List[str]:
+        """Formas aceptadas de un fact textual (nombres y empleadores también por partes)."""
+        fact_type = self._resolve_type(fact_name)
+        words = expected.split()
+        if fact_type == 'name':
+            words = [word for word in words if len(word) > 2]
+        elif fact_type == 'employer':
+            words = [word for word in words if word.lower() not in _EMPLOYER_COMMON_WORDS]
+        else:
+            words = []
+        return list(dict.fromkeys([expected] + words))
     
-    def _detect_email_in_response(self, response: str, expected_email: str) -> Optional[str]:
-        """Detecta emails."""
-        # Usar el extractor de email de utils.py
-        from .utils import extract_email
-        detected_email = extract_email(response)
+    def _detect_fact_in_response(self, response: str, fact_name: str, expected_value: Any) -> Optional[Any]:
+        """
+        Lógica inteligente de detección de facts por tipo.
         
-        if detected_email and detected_email.lower() == expected_email.lower():
-            return detected_email
+        Args:
+            response: Texto donde buscar el fact
+            fact_name: Nombre del fact a detectar
+            expected_value: Valor esperado del fact
         
-        return None
+        Returns:
+            Valor detectado o None si no se encuentra
+        """
+        return self._get_detector(fact_name, expected_value)(response)
     
-    def _detect_phone_in_response(self, response: str, expected_phone: str) -> Optional[str]:
-        """Detecta números de teléfono."""
-        # Usar el extractor de teléfono de utils.py
-        from .utils import extract_phone
-        detected_phone = extract_phone(response)
-        
-        if detected_phone:
-            # Normalizar ambos números para comparar
-            def normalize_phone(phone):
-                return re.sub(r'[^\d]', '', phone)
-            
-            if normalize_phone(detected_phone) == normalize_phone(expected_phone):
-                return detected_phone
-        
-        return None
+    def _retention_detector(self, fact_name: str, expected_value: Any) -> Callable[[str], Optional[Any]]:
+        """Detector ya construido para el valor acumulado de un fact."""
+        entry = self._retention_detectors.get(fact_name)
+        if entry is None or entry[0] is not expected_value:
+            # conversation_facts fue modificado fuera de add_turn
+            entry = self._retention_detectors[fact_name] = (expected_value, self._get_detector(fact_name, expected_value))
+        return entry[1]
     
-    def _detect_employer_in_response(self, response: str, expected_employer: str) -> Optional[str]:
-        """Detecta empleadores."""
-        employer_lower = expected_employer.lower()
-        response_lower = response.lower()
-        
-        # Buscar coincidencia exacta
-        if employer_lower in response_lower:
-            return expected_employer
-        
-        # Buscar palabras clave del empleador (sin palabras comunes como Inc, Corp, etc.)
-        employer_words = employer_lower.split()
-        # Filtrar palabras comunes que pueden no estar en la respuesta
-        common_words = {'inc', 'corp', 'llc', 'ltd', 'company', 'co'}
-        meaningful_words = [word for word in employer_words if word not in common_words]
-        
-        if meaningful_words:
-            found_words = [word for word in meaningful_words if word in response_lower]
-            if len(found_words) >= len(meaningful_words) * 0.5:  # Al menos 50% de las palabras significativas
-                return expected_employer
-        else:
-            # Si todas las palabras son comunes, usar la lógica original
-            found_words = [word for word in employer_words if word in response_lower]
-            if len(found_words) >= len(employer_words) * 0.7:
-                return expected_employer
-        
-        return None
-    
-    def _detect_score_in_response(self, response: str, expected_score: str) -> Optional[str]:
-        """Detecta scores y términos."""
-        # Buscar el score exacto
-        if str(expected_score) in response:
-            return expected_score
-        
-        # Buscar patrones de score
-        score_patterns = [
-            r'score[:\s]*(\d+)',
-            r'puntaje[:\s]*(\d+)',
-            r'(\d+)\s*points?',
-        ]
-        
-        for pattern in score_patterns:
-            matches = re.findall(pattern, response, re.IGNORECASE)
-            for match in matches:
-                if match == str(expected_score):
-                    return match
+    def _get_detector(self, fact_name: str, expected_value: Any) -> Callable[[str], Optional[Any]]:
+        """
+        Devuelve el detector compilado de un fact para un valor esperado.
         
-        return None
+        Los detectores se construyen una sola vez por (fact, valor) y se
+        reutilizan en add_turn y validate_retention.
+        """
+        key = (fact_name, repr(expected_value))
+        detector = self._detectors.get(key)
+        if detector is None:
+            detector = self._detectors[key] = build_detector(self._resolve_type(fact_name), expected_value, self.gazetteer)
+        return detector
     
-    def _detect_generic_fact(self, response: str, fact_name: str, expected_value: Any) -> Optional[Any]:
-        """Detección genérica usando extractores existentes."""
-        # fact_name se puede usar en el futuro para lógica específica por tipo de fact
-        _ = fact_name  # Evitar warning de parámetro no usado
-        # Intentar con diferentes extractores
-        for extractor_name, extractor_func in EXTRACTORS.items():
-            try:
-                if extractor_name == 'categorical':
-                    # Para categorical necesitamos patterns
-                    continue
-                elif extractor_name == 'regex':
-                    # Para regex necesitamos pattern
-                    continue
-                else:
-                    result = extractor_func(response)
-                    if result and str(result) == str(expected_value):
-                        return result
-            except Exception:
-                continue
-        
-        # Fallback: búsqueda de texto simple
-        if str(expected_value).lower() in response.lower():
-            return expected_value
-        
-        return None
+    def _resolve_type(self, fact_name: str) -> str:
+        """Tipo de detector de un fact (explícito o inferido del nombre, una sola vez)."""
+        fact_type = self._resolved_types.get(fact_name)
+        if fact_type is None:
+            fact_type = self._resolved_types[fact_name] = self.fact_types.get(fact_name) or resolve_fact_type(fact_name)
+        return fact_type
     
     def _get_extractor_type(self, fact_name: str) -> str:
-        """Determina el tipo de extractor basado en el nombre del fact."""
-        fact_lower = fact_name.lower()
+        """
+        Determina el extractor del pipeline core (ver utils.GENERIC_EXTRACTORS) para un fact.
         
-        if 'amount' in fact_lower or 'monto' in fact_lower or 'precio' in fact_lower:
-            return 'currency'
-        elif 'date' in fact_lower or 'fecha' in fact_lower:
-            return 'date'
-        elif 'percentage' in fact_lower or 'porcentaje' in fact_lower:
-            return 'percentage'
-        elif 'hours' in fact_lower or 'horas' in fact_lower:
-            return 'hours'
-        else:
-            return 'number'
+        Fechas, porcentajes y horas se reconocen por el nombre; el resto
+        sigue al tipo de detector del fact. Los facts textuales (nombres,
+        empleadores, IDs, ...) usan 'categorical' con el valor como patrón.
+        """
+        fact_lower = fact_name.lower()
+        for extractor_type, keywords in _CORE_EXTRACTOR_KEYWORDS:
+            if any(keyword in fact_lower for keyword in keywords):
+                return extractor_type
+        return _CORE_EXTRACTORS.get(self._resolve_type(fact_name), 'categorical')
     
-    def _build_semantic_reference(self) -> str:
-        """Construye referencia semántica basada en facts acumulados."""
-        if not self.conversation_facts:
-            return ""
-        
-        # Crear una descripción semántica de los facts acumulados
-        reference_parts = []
-        
-        if 'client_name' in self.conversation_facts:
-            reference_parts.append(f"Cliente: {self.conversation_facts['client_name']}")
-        
-        if 'loan_amount' in self.conversation_facts:
-            reference_parts.append(f"Monto del préstamo: ${self.conversation_facts['loan_amount']}")
-        
-        if 'employer' in self.conversation_facts:
-            reference_parts.append(f"Empleador: {self.conversation_facts['employer']}")
+    def _build_semantic_reference(self, facts_to_check: Optional[List[str]] = None) -> str:
+        """
+        Construye referencia semántica basada en facts acumulados.
         
-        if 'annual_income' in self.conversation_facts:
-            reference_parts.append(f"Ingresos anuales: ${self.conversation_facts['annual_income']}")
+        Args:
+            facts_to_check: Facts a incluir (None: todos los acumulados)
+        """
+        if facts_to_check is None:
+            facts_to_check = list(self.conversation_facts)
         
+        # Una descripción "nombre del fact: valor" por fact acumulado
+        reference_parts = [
+            f"{fact_name.replace('_', ' ').capitalize()}: {self.conversation_facts[fact_name]}"
+            for fact_name in facts_to_check if fact_name in self.conversation_facts
+        ]
         return ". ".join(reference_parts)
     
     def get_conversation_summary(self) -> Dict[str, Any]:
-        """Obtiene resumen de la conversación actual."""
+        """
+        Obtiene resumen de la conversación actual.
+        
+        'turn_history' es una lista de turnos como diccionarios (serializable
+        a JSON) con los turnos disponibles; sin spill_path no incluye los que
+        salieron de la ventana en memoria, que sí cuenta 'total_turns'.
+        """
         return {
             'total_turns': len(self.turn_history),
             'total_facts': len(self.conversation_facts),
             'facts': self.conversation_facts,
-            'turn_history': self.turn_history
+            'turn_history': [turn.to_dict() for turn in self.turn_history]
         }
     
     def clear_conversation(self) -> None:
         """Limpia el contexto conversacional."""
         self.conversation_facts = {}
-        self.turn_history = []
+        self.turn_history.clear()
+        self._detectors = {}
+        self._retention_detectors = {}
+        self.gazetteer = Gazetteer()
+        self._core_scenarios = OrderedDict()
+        self._timeline = {}
+        self.retention_matrix = []
+        self._fact_retention = {}
     
     def print_retention_report(self, retention_results: Dict[str, Any], facts_to_check: List[str], 
                              response: str = None, title: str = "Retention Report") -> None:
@@ -425,6 +1041,8 @@ class ConversationValidator:
             print(f"      Detected: '{detected}'")
             if not retained and reason:
                 print(f"      Reason: {reason}")
+            if f'{fact}_stale_value' in retention_results:
+                print(f"      ⚠️  Stale value repeated: '{retention_results[f'{fact}_stale_value']}'")
             print()
         
         # General evaluation
@@ -474,8 +1092,12 @@ class ConversationValidator:
         
         if summary['turn_history']:
             print(f"🔄 Turn History:")
-            for i, turn in enumerate(summary['turn_history'], 1):
-                print(f"   Turn {i}:")
+            history = summary['turn_history']
+            first_turn = summary['total_turns'] - len(history) + 1
+            if first_turn > 1:
+                print(f"   ({first_turn - 1} earlier turns not kept in memory)")
+            for index, turn in enumerate(history, first_turn):
+                print(f"   Turn {index}:")
                 print(f"      User: {turn['user_input'][:50]}{'...' if len(turn['user_input']) > 50 else ''}")
                 print(f"      Bot: {turn['bot_response'][:50]}{'...' if len(turn['bot_response']) > 50 else ''}")
                 print(f"      Extracted facts: {len(turn['extracted_facts'])}")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Deduplicación de Candidatos
+===========================
+
+Los candidatos muestreados de un LLM suelen ser muy redundantes. Este
+módulo agrupa:
+
+1. Duplicados exactos: textos iguales tras normalize_text_advanced. Se
+   validan una sola vez y el resultado se replica.
+2. Casi-duplicados: textos con alta similitud de Jaccard entre shingles,
+   detectados con MinHash + LSH. Cada cluster tiene un líder y todos sus
+   miembros son similares al líder (no hay encadenamiento transitivo).
+
+Uso básico:
+    from true_lies.dedup import deduplicate_candidates
+    
+    plan = deduplicate_candidates(candidates)
+    print(plan['stats'])
+"""
+
+import hashlib
+import random
+import re
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+from .utils import normalize_text_advanced
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 8
+DEFAULT_THRESHOLD = 0.8
+
+# Primo de Mersenne para las permutaciones universales (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_PERMUTATIONS: Dict[int, List[tuple]] = {}
+
+# Líderes verificados como máximo por candidato (los de más bandas en común)
+_MAX_LEADER_CHECKS = 8
+
+
+def _permutations(num_perm: int) -> List[tuple]:
+    """Coeficientes (a, b) deterministas para num_perm permutaciones."""
+    if num_perm not in _PERMUTATIONS:
+        rng = random.Random(1337)
+        _PERMUTATIONS[num_perm] = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+    return _PERMUTATIONS[num_perm]
+
+
+def _shingles(text: str) -> set:
+    """
+    Shingles de palabras (bigramas) de un texto normalizado.
+    
+    La puntuación se descarta, por lo que textos que difieren solo en
+    puntuación o espacios producen los mismos shingles.
+    """
+    tokens = _TOKEN_RE.findall(normalize_text_advanced(text))
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f'{a} {b}' for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash_signature(text: str, num_perm: int = DEFAULT_NUM_PERM) -> List[int]:
+    """
+    Firma MinHash de un texto.
+    
+    Args:
+        text: Texto a firmar
+        num_perm: Cantidad de permutaciones (largo de la firma)
+    
+    Returns:
+        list: num_perm enteros; la fracción de posiciones iguales entre dos
+            firmas estima la similitud de Jaccard de sus shingles
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in _shingles(text)
+    ]
+    if not hashes:
+        return [_MAX_HASH] * num_perm
+    permuted = [[((a * h + b) % _PRIME) & _MAX_HASH for a, b in _permutations(num_perm)] for h in hashes]
+    return [min(column) for column in zip(*permuted)]
+
+
+def estimate_jaccard(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Similitud de Jaccard estimada a partir de dos firmas MinHash."""
+    if not sig_a:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def deduplicate_candidates(candidates: Sequence[str], near_duplicates: bool = True,
+                           threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                           bands: int = DEFAULT_BANDS) -> Dict[str, Any]:
+    """
+    Agrupa candidatos duplicados y casi-duplicados.
+    
+    Args:
+        candidates: Textos candidatos
+        near_duplicates: Si True, también agrupa casi-duplicados con MinHash + LSH
+        threshold: Jaccard estimado mínimo para unir dos textos en un cluster
+        num_perm: Largo de las firmas MinHash (debe ser divisible por bands)
+        bands: Bandas LSH; más bandas encuentran pares con menor similitud
+    
+    Returns:
+        dict: Plan de deduplicación con:
+            - 'unique': índices de los representantes de duplicados exactos
+            - 'exact_of': para cada candidato, índice de su representante exacto
+            - 'exact_counts': {representante exacto: candidatos que representa}
+            - 'cluster_of': para cada candidato, índice del líder de su cluster
+            - 'clusters': {líder del cluster: índices de los candidatos}
+            - 'stats': resumen (candidatos, únicos, duplicados exactos, clusters)
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+    
+    # 1. Duplicados exactos
+    first_seen = {}
+    exact_of = []
+    for i, candidate in enumerate(candidates):
+        key = normalize_text_advanced(candidate)
+        exact_of.append(first_seen.setdefault(key, i))
+    exact_counts = Counter(exact_of)
+    unique = sorted(exact_counts)
+    
+    # 2. Casi-duplicados: cada representante exacto se une al líder más
+    # parecido entre los que comparten alguna banda LSH con él
+    leader_of = {i: i for i in unique}
+    if near_duplicates and len(unique) > 1:
+        rows = num_perm // bands
+        signatures = {}
+        buckets = {}
+        for i in unique:
+            signature = signatures[i] = minhash_signature(candidates[i], num_perm)
+            band_keys = [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(bands)]
+            
+            # Los líderes que comparten más bandas son los más parecidos;
+            # solo se verifican los primeros para acotar el costo
+            collisions = Counter()
+            for key in band_keys:
+                collisions.update(buckets.get(key, ()))
+            best_leader, best_score = None, threshold
+            for leader, _ in collisions.most_common(_MAX_LEADER_CHECKS):
+                score = estimate_jaccard(signatures[leader], signature)
+                if score >= best_score:
+                    best_leader, best_score = leader, score
+            
+            if best_leader is None:
+                # Nuevo líder: solo los líderes se indexan en las bandas
+                for key in band_keys:
+                    buckets.setdefault(key, []).append(i)
+            else:
+                leader_of[i] = best_leader
+    
+    cluster_of = [leader_of[exact_of[i]] for i in range(len(candidates))]
+    clusters = {}
+    for i, leader in enumerate(cluster_of):
+        clusters.setdefault(leader, []).append(i)
+    
+    cluster_sizes = sorted((len(members) for members in clusters.values()), reverse=True)
+    return {
+        'unique': unique,
+        'exact_of': exact_of,
+        'exact_counts': dict(exact_counts),
+        'cluster_of': cluster_of,
+        'clusters': clusters,
+        'stats': {
+            'candidates': len(candidates),
+            'unique': len(unique),
+            'exact_duplicates': len(candidates) - len(unique),
+            'clusters': len(clusters),
+            'multi_member_clusters': sum(1 for size in cluster_sizes if size > 1),
+            'largest_cluster': cluster_sizes[0] if cluster_sizes else 0,
+            'cluster_sizes': cluster_sizes,
+        },
+    }
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Gazetteer de Entidades de la Conversación
+=========================================
+
+Índice de todas las entidades de texto vistas en una conversación (partes de
+nombres, empleadores e IDs) para detectarlas con un solo recorrido de cada
+respuesta.
+
+Los patrones se guardan en un trie que se compila a una única expresión
+regular: en cada posición de la respuesta el motor de re recorre el trie y
+devuelve el patrón más largo que empieza ahí; los patrones más cortos que
+empiezan en la misma posición son sus prefijos y se agregan desde el trie.
+Los detectores de ConversationValidator aplican después sus reglas (ej: al
+menos 50% de las partes de un nombre) sobre ese resultado.
+
+Con pocos patrones un recorrido por patrón es más barato que el autómata; en
+ese caso el gazetteer solo comparte la respuesta en minúsculas entre todos
+los detectores.
+
+Uso básico:
+    from true_lies.gazetteer import Gazetteer
+    
+    gazetteer = Gazetteer()
+    gazetteer.add(['sarah', 'johnson', 'techcorp'])
+    gazetteer.scan("Sarah, your TechCorp loan is approved")  # {'', 'sarah', 'techcorp'}
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+# Marca de fin de patrón en los nodos del trie
+_END = ''
+
+# Cantidad de patrones desde la cual se usa el autómata
+DEFAULT_MIN_PATTERNS = 256
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    """Expresión regular equivalente a un nodo del trie (más largo primero)."""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    return f'(?:{body})?' if _END in node else body
+
+
+class Gazetteer:
+    """
+    Conjunto incremental de entidades (en minúsculas) con detección en un recorrido.
+    
+    scan() memoriza el último texto recorrido, de modo que varios detectores
+    que consultan la misma respuesta comparten un único recorrido.
+    """
+    
+    def __init__(self, min_patterns: int = DEFAULT_MIN_PATTERNS):
+        """
+        Args:
+            min_patterns: Patrones a partir de los cuales se compila el autómata
+                (por debajo, cada patrón se busca con 'in' sobre el texto compartido)
+        """
+        self.min_patterns = min_patterns
+        self._trie = {}
+        self._patterns = set()
+        # Por patrón, los patrones registrados que son prefijos suyos
+        self._prefixes = {}
+        self._regex = None
+        self._last_text = None
+        self._last_lower = ''
+        self._last_found = None
+    
+    def __len__(self) -> int:
+        return len(self._patterns)
+    
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+    
+    def add(self, patterns: Iterable[str]) -> None:
+        """Agrega patrones (en minúsculas); el autómata se recompila en el siguiente scan."""
+        for pattern in patterns:
+            if not pattern or pattern in self._patterns:
+                continue
+            self._patterns.add(pattern)
+            node = self._trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[_END] = pattern
+            self._regex = None
+            self._last_text = None
+    
+    def _compile(self) -> 're.Pattern':
+        self._prefixes = {}
+        
+        def collect(node: Dict[str, dict], prefixes: tuple) -> None:
+            if _END in node:
+                prefixes = prefixes + (node[_END],)
+                self._prefixes[node[_END]] = prefixes
+            for char, child in node.items():
+                if char != _END:
+                    collect(child, prefixes)
+        
+        collect(self._trie, ())
+        # Lookahead: un match (el más largo) por posición, aunque se solapen
+        self._regex = re.compile(f'(?=({_trie_regex(self._trie)}))')
+        return self._regex
+    
+    @property
+    def uses_automaton(self) -> bool:
+        """True si scan() recorre el texto con el autómata compilado."""
+        return len(self._patterns) >= self.min_patterns
+    
+    def _prepare(self, text: str) -> Optional[FrozenSet[str]]:
+        """Memoriza el texto en minúsculas y, con el autómata, sus patrones."""
+        if text != self._last_text:
+            self._last_text = text
+            self._last_lower = text.lower()
+            self._last_found = None
+        if self._last_found is None and self.uses_automaton:
+            regex = self._regex or self._compile()
+            found = {''}
+            for longest in set(regex.findall(self._last_lower)):
+                found.update(self._prefixes[longest])
+            self._last_found = frozenset(found)
+        return self._last_found
+    
+    def scan(self, text: str) -> FrozenSet[str]:
+        """
+        Patrones conocidos que aparecen en el texto (sin distinguir mayúsculas).
+        
+        El patrón vacío siempre se considera presente (igual que '' in texto).
+        """
+        found = self._prepare(text)
+        if found is None:
+            lower = self._last_lower
+            found = frozenset([''] + [pattern for pattern in self._patterns if pattern in lower])
+        return found
+    
+    def matcher(self, text: str) -> Callable[[str], bool]:
+        """Prueba de pertenencia equivalente a 'patrón in texto.lower()'."""
+        found = self._prepare(text)
+        if found is None:
+            return self._last_lower.__contains__
+        return found.__contains__
+    
+    def entities_in(self, text: str) -> List[str]:
+        """Patrones conocidos presentes en el texto, ordenados."""
+        return sorted(pattern for pattern in self.scan(text) if pattern)
@@ -17,12 +17,461 @@ Basic usage:
     )
 """
 
+import base64
+import hashlib
+import heapq
+import io
+import itertools
 import json
 import os
+import re
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
+# Results rendered per write when streaming the results table
+DEFAULT_CHUNK_SIZE = 1000
+
+# How candidate details are stored: inside the report or in chunk files next to it
+DETAILS_MODES = ('inline', 'split')
+
+# How CSS/JS are delivered: inside the report or in a shared content-hashed bundle directory
+ASSET_MODES = ('inline', 'bundle')
+
+# Bundle directory, shared by the reports of an output folder
+ASSETS_DIR_NAME = 'true_lies_assets'
+
+# Chart.js shipped as package data (make vendor-chartjs); used unless chart_js is given
+VENDORED_CHART_JS = Path(__file__).parent / 'vendor' / 'chart.umd.js'
+
+# Chart.js when there is no local copy (loaded async, never blocks the page)
+CHART_JS_CDN = "https://cdn.jsdelivr.net/npm/chart.js"
+
+# Columns of the embedded results table data (the id is implicit)
+RESULTS_COLUMNS = ('score', 'pass', 'facts', 'total', 'date', 'details')
+
+# Score buckets of the report metrics (label, lower bound inclusive)
+SCORE_BUCKETS = (
+    ('A (0.9-1.0)', 0.9),
+    ('B (0.8-0.9)', 0.8),
+    ('C (0.7-0.8)', 0.7),
+    ('D (0.5-0.7)', 0.5),
+    ('F (0.0-0.5)', float('-inf')),
+)
+
+# Bins of the score and fact retention histograms (equal width over 0-1)
+HISTOGRAM_BINS = 10
+
+# Chart series are downsampled to at most this many points
+DEFAULT_MAX_CHART_POINTS = 500
+
+# Lowest-scoring results shown in the worst performers chart
+DEFAULT_WORST_PERFORMERS = 10
+
+# Points of the score series kept by a metrics accumulator (compacted with
+# LTTB to this size each time it doubles)
+DEFAULT_SERIES_POINTS = 4 * DEFAULT_MAX_CHART_POINTS
+
+
+def _histogram_bin(value: float) -> int:
+    """Bin of a 0-1 value (1.0 falls in the last bin)."""
+    return min(max(int(value * HISTOGRAM_BINS), 0), HISTOGRAM_BINS - 1)
+
+
+def _lttb(values, threshold: int, positions=None) -> List[tuple]:
+    """
+    Largest-Triangle-Three-Buckets downsampling of a series.
+    
+    Args:
+        values: Series values
+        threshold: Points to keep (>= 3)
+        positions: x of each value, increasing (default: its index)
+    
+    Returns:
+        List[tuple]: (x, value) of the kept points, first and last included
+    """
+    count = len(values)
+    if positions is None:
+        positions = range(count)
+    if threshold >= count or threshold < 3:
+        return list(zip(positions, values))
+    
+    sampled = [(positions[0], values[0])]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # Average of the next bucket (the last point for the last bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        avg_x = sum(positions[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+        
+        selected_x, selected_y = positions[selected], values[selected]
+        best_area = -1.0
+        best = start
+        for i in range(start, end):
+            area = abs((selected_x - avg_x) * (values[i] - selected_y)
+                       - (selected_x - positions[i]) * (avg_y - selected_y))
+            if area > best_area:
+                best_area = area
+                best = i
+        sampled.append((positions[best], values[best]))
+        selected = best
+    sampled.append((positions[count - 1], values[count - 1]))
+    return sampled
+
+
+class MetricsAccumulator:
+    """
+    Report metrics computed one result at a time.
+    
+    Keeps counters, fixed-size histograms, the K lowest-scoring results and
+    a score series downsampled as it grows, so memory does not depend on the
+    number of results; accumulators of consecutive result sets can be
+    merged, and saved with to_state() to continue later (incremental reports).
+    """
+    
+    def __init__(self, first_id: int = 1, worst_performers: int = DEFAULT_WORST_PERFORMERS,
+                 series_points: int = DEFAULT_SERIES_POINTS):
+        """
+        Args:
+            first_id: Id of the first result added (ids of the worst performers)
+            worst_performers: Lowest-scoring results to keep
+            series_points: Points of the score series kept (the series is
+                exact up to twice this many results)
+        """
+        self.first_id = first_id
+        self.worst_performers = worst_performers
+        self.series_points = series_points
+        self.total = 0
+        self.passed = 0
+        self.score_sum = 0.0
+        self.score_buckets = {label: 0 for label, _ in SCORE_BUCKETS}
+        self.facts_total = 0
+        self.facts_correct = 0
+        self.score_histogram = [0] * HISTOGRAM_BINS
+        self.fact_retention_histogram = [0] * HISTOGRAM_BINS
+        # Score series: (id, score) points, compacted with LTTB when full
+        self.series_ids = array('q')
+        self.series_scores = array('d')
+        # Heap of (-score, -id, label): the root is the best of the kept results
+        self.worst = []
+    
+    def add(self, result: Dict[str, Any]) -> None:
+        """Adds one normalized result."""
+        result_id = self.first_id + self.total
+        self.total += 1
+        if result.get('all_retained', False):
+            self.passed += 1
+        score = result.get('retention_score', 0.0)
+        self.score_sum += score
+        for label, lower_bound in SCORE_BUCKETS:
+            if score >= lower_bound:
+                self.score_buckets[label] += 1
+                break
+        for fact_data in result.get('facts_info', {}).values():
+            self.facts_total += 1
+            if fact_data.get('accuracy', False):
+                self.facts_correct += 1
+        
+        self.score_histogram[_histogram_bin(score)] += 1
+        total_facts = result.get('total_facts', 0)
+        if total_facts:
+            self.fact_retention_histogram[_histogram_bin(result.get('facts_retained', 0) / total_facts)] += 1
+        self.series_ids.append(result_id)
+        self.series_scores.append(score)
+        if len(self.series_ids) >= 2 * self.series_points:
+            self._compact_series()
+        
+        entry = (-score, -result_id, result.get('test_name') or f"Candidate {result_id}")
+        if len(self.worst) < self.worst_performers:
+            heapq.heappush(self.worst, entry)
+        elif entry > self.worst[0]:
+            heapq.heapreplace(self.worst, entry)
+    
+    def merge(self, other: 'MetricsAccumulator') -> 'MetricsAccumulator':
+        """Adds another accumulator, whose results follow this one's (returns self)."""
+        self.total += other.total
+        self.passed += other.passed
+        self.score_sum += other.score_sum
+        for label in self.score_buckets:
+            self.score_buckets[label] += other.score_buckets[label]
+        self.facts_total += other.facts_total
+        self.facts_correct += other.facts_correct
+        for i in range(HISTOGRAM_BINS):
+            self.score_histogram[i] += other.score_histogram[i]
+            self.fact_retention_histogram[i] += other.fact_retention_histogram[i]
+        self.series_ids.extend(other.series_ids)
+        self.series_scores.extend(other.series_scores)
+        if len(self.series_ids) >= 2 * self.series_points:
+            self._compact_series()
+        self.worst = heapq.nlargest(self.worst_performers, self.worst + other.worst)
+        heapq.heapify(self.worst)
+        return self
+    
+    def _compact_series(self) -> None:
+        """Downsamples the score series to series_points points."""
+        sampled = _lttb(self.series_scores, self.series_points, self.series_ids)
+        self.series_ids = array('q', [result_id for result_id, _ in sampled])
+        self.series_scores = array('d', [score for _, score in sampled])
+    
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state (see from_state)."""
+        return {
+            'first_id': self.first_id,
+            'worst_performers': self.worst_performers,
+            'series_points': self.series_points,
+            'total': self.total,
+            'passed': self.passed,
+            'score_sum': self.score_sum,
+            'score_buckets': self.score_buckets,
+            'facts_total': self.facts_total,
+            'facts_correct': self.facts_correct,
+            'score_histogram': self.score_histogram,
+            'fact_retention_histogram': self.fact_retention_histogram,
+            'series_ids': list(self.series_ids),
+            'series_scores': list(self.series_scores),
+            'worst': self.worst,
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'MetricsAccumulator':
+        """Accumulator restored from to_state(); further results continue its ids."""
+        accumulator = cls(state['first_id'], state['worst_performers'], state['series_points'])
+        for name in ('total', 'passed', 'score_sum', 'score_buckets', 'facts_total', 'facts_correct',
+                     'score_histogram', 'fact_retention_histogram'):
+            setattr(accumulator, name, state[name])
+        accumulator.series_ids = array('q', state['series_ids'])
+        accumulator.series_scores = array('d', state['series_scores'])
+        accumulator.worst = [tuple(entry) for entry in state['worst']]
+        heapq.heapify(accumulator.worst)
+        return accumulator
+    
+    def chart_data(self, max_points: int = DEFAULT_MAX_CHART_POINTS) -> Dict[str, Any]:
+        """
+        Chart series aggregated for embedding (size independent of the results).
+        
+        Args:
+            max_points: Maximum points of the score series (and bars of the
+                worst performers chart)
+        """
+        bin_labels = [f"{i / HISTOGRAM_BINS:.1f}-{(i + 1) / HISTOGRAM_BINS:.1f}" for i in range(HISTOGRAM_BINS)]
+        series = _lttb(self.series_scores, max(max_points, 3), self.series_ids)
+        worst = sorted(self.worst, reverse=True)[:max_points]
+        return {
+            'histogram_labels': bin_labels,
+            'score_histogram': list(self.score_histogram),
+            'fact_retention_histogram': list(self.fact_retention_histogram),
+            'score_series': {
+                'ids': [result_id for result_id, _ in series],
+                'scores': [round(score, 4) for _, score in series],
+            },
+            'worst_performers': {
+                'labels': [label[:30] for _, _, label in worst],
+                'ids': [-negative_id for _, negative_id, _ in worst],
+                'scores': [round(-negative_score, 4) for negative_score, _, _ in worst],
+            },
+        }
+    
+    @property
+    def factual_accuracy(self) -> float:
+        """Percentage of correct facts over all results."""
+        return (self.facts_correct / self.facts_total * 100) if self.facts_total > 0 else 0.0
+    
+    def to_metrics(self) -> Dict[str, Any]:
+        """Metrics in the format used by the report sections."""
+        if not self.total:
+            return {
+                'total_candidates': 0,
+                'passed': 0,
+                'failed': 0,
+                'pass_rate': 0.0,
+                'avg_score': 0.0,
+                'score_distribution': {}
+            }
+        return {
+            'total_candidates': self.total,
+            'passed': self.passed,
+            'failed': self.total - self.passed,
+            'pass_rate': (self.passed / self.total) * 100,
+            'avg_score': self.score_sum / self.total,
+            'score_distribution': dict(self.score_buckets)
+        }
+
+
+# Sortable columns with a precomputed permutation (index in the table header)
+SORTABLE_COLUMNS = {1: 'score', 2: 'status', 3: 'facts', 4: 'date'}
+
+# Tokens of the search index (same definition as the report's JavaScript)
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _encode_indices(indices: List[int]) -> str:
+    """Base64 of little-endian int32 (decoded in the browser as an Int32Array)."""
+    packed = array('i', indices)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+@lru_cache(maxsize=4096)
+def _format_date(timestamp: str) -> str:
+    """Date of the results table ('dd/mm/YYYY HH:MM' or 'N/A')."""
+    try:
+        return datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M')
+    except ValueError:
+        return 'N/A'
+
+
+@lru_cache(maxsize=4096)
+def _date_sort_key(date: str) -> str:
+    """'dd/mm/YYYY HH:MM' -> 'YYYYmmdd HH:MM' ('N/A' sorts first)."""
+    return date[6:10] + date[3:5] + date[:2] + date[10:] if len(date) == 16 else ''
+
+
+class ResultsIndex:
+    """
+    Sort permutations and search index of the results table.
+    
+    Built while the table data is written and embedded after it, so the
+    browser swaps to a stored permutation on sort and answers searches with
+    index lookups. Keeps one sort key per result and column plus the token
+    postings (unlike MetricsAccumulator, its size grows with the results).
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.sort_keys = {name: [] for name in SORTABLE_COLUMNS.values()}
+        self.postings = {}
+    
+    def add(self, row: tuple, result: Dict[str, Any]) -> None:
+        """Adds the next table row (see HTMLReporter._row_payload)."""
+        score, passed, facts, total, date = row[:5]
+        keys = self.sort_keys
+        keys['score'].append(score)
+        keys['status'].append(passed)
+        keys['facts'].append(facts / total if total else 0)
+        keys['date'].append(_date_sort_key(date))
+        
+        text = f"{result.get('candidate_text') or ''} {result.get('failure_reason') or ''}"
+        position = self.count
+        postings = self.postings
+        for token in set(_TOKEN_RE.findall(text.lower())):
+            if token in postings:
+                postings[token].append(position)
+            else:
+                postings[token] = [position]
+        self.count = position + 1
+    
+    def extend(self, other: 'ResultsIndex') -> 'ResultsIndex':
+        """Appends an index of the rows that follow this one's (returns self)."""
+        for name, keys in self.sort_keys.items():
+            keys.extend(other.sort_keys[name])
+        postings = self.postings
+        offset = self.count
+        for token, positions in other.postings.items():
+            shifted = [offset + position for position in positions]
+            if token in postings:
+                postings[token].extend(shifted)
+            else:
+                postings[token] = shifted
+        self.count += other.count
+        return self
+    
+    def to_payload(self) -> Dict[str, Any]:
+        """
+        Compact JSON payload.
+        
+        Permutations are base64 int32 arrays (stable ascending order). Tokens
+        are sorted in UTF-16 order (the order of JavaScript string
+        comparison) and each posting list is delta encoded.
+        """
+        positions = range(self.count)
+        sort = {
+            str(column): _encode_indices(sorted(positions, key=self.sort_keys[name].__getitem__))
+            for column, name in SORTABLE_COLUMNS.items()
+        }
+        return {'sort': sort, 'search': self.search_payload()}
+    
+    def search_payload(self) -> Dict[str, Any]:
+        """Search index only: sorted tokens and their delta-encoded postings."""
+        tokens = sorted(self.postings, key=lambda token: token.encode('utf-16-be'))
+        postings = []
+        for token in tokens:
+            previous = 0
+            deltas = []
+            for position in self.postings[token]:
+                deltas.append(position - previous)
+                previous = position
+            postings.append(deltas)
+        return {'tokens': tokens, 'postings': postings}
+
+
+class ScenarioTable:
+    """
+    Scenario-level fields of a result set, stored once per scenario.
+    
+    Normalized candidate results refer to their entry by 'scenario_id'
+    instead of carrying the query, the reference text and a timestamp each;
+    the report embeds the table once as well. All results normalized for the
+    same scenario share one timestamp.
+    """
+    
+    def __init__(self, timestamp: Optional[str] = None):
+        """
+        Args:
+            timestamp: Timestamp of the entries (default: when each is created)
+        """
+        self.timestamp = timestamp
+        self.entries = []
+        self._ids = {}
+    
+    def intern(self, scenario: Optional[Dict[str, Any]]) -> int:
+        """Id of the scenario's entry (created on first use)."""
+        query_text = ''
+        reference_text = ''
+        if scenario:
+            # Prefer scenario name (the actual query/question) over semantic_reference
+            query_text = scenario.get('name', '') or scenario.get('semantic_reference', '')
+            # semantic_reference is the baseline text we compare against
+            reference_text = scenario.get('semantic_reference', '')
+        
+        key = (query_text, reference_text)
+        scenario_id = self._ids.get(key)
+        if scenario_id is None:
+            scenario_id = self._ids[key] = len(self.entries)
+            self.entries.append({
+                'query': query_text,
+                'reference_text': reference_text,
+                'timestamp': self.timestamp or datetime.now().isoformat(),
+            })
+        return scenario_id
+    
+    def get(self, scenario_id: int) -> Dict[str, Any]:
+        return self.entries[scenario_id]
+    
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state (see from_state)."""
+        return {'timestamp': self.timestamp, 'entries': self.entries}
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ScenarioTable':
+        """Table restored from to_state(); scenarios keep their ids."""
+        table = cls(state['timestamp'])
+        for entry in state['entries']:
+            table._ids[(entry['query'], entry['reference_text'])] = len(table.entries)
+            table.entries.append(entry)
+        return table
+
 
 class HTMLReporter:
     """
@@ -32,10 +481,15 @@ class HTMLReporter:
     and detailed failure analysis.
     """
     
+    # Static CSS/JS templates per reporter class (built once per process)
+    _static_cache = {}
+    
     def __init__(self):
         """Initialize the report generator."""
         self.template_dir = Path(__file__).parent / "templates"
         self.ensure_template_dir()
+        # Scenario-level fields of the normalized results (see ScenarioTable)
+        self.scenarios = ScenarioTable()
     
     def ensure_template_dir(self):
         """Create templates directory if it doesn't exist."""
@@ -59,20 +513,35 @@ class HTMLReporter:
         if not results:
             return results
         
-        # Detect result type based on first element structure
-        first_result = results[0]
-        
-        # If has 'index', 'candidate', 'result', 'is_valid' -> from validate_llm_candidates
-        if all(key in first_result for key in ['index', 'candidate', 'result', 'is_valid']):
-            return self._normalize_candidate_results(results, scenario)
-        
         # If already has 'retention_score', 'all_retained' -> from ConversationValidator
-        elif all(key in first_result for key in ['retention_score', 'all_retained']):
+        if self._is_conversation_format(results[0]):
             return results
         
-        # If format not recognized, try to normalize as candidates
-        else:
-            return self._normalize_candidate_results(results, scenario)
+        return self._normalize_candidate_results(results, scenario)
+    
+    def _is_conversation_format(self, first_result: Dict[str, Any]) -> bool:
+        """
+        Detects the result type based on the first element structure.
+        
+        Results with 'index', 'candidate', 'result', 'is_valid' come from
+        validate_llm_candidates; results with 'retention_score' and
+        'all_retained' from ConversationValidator. Unknown formats are
+        normalized as candidates.
+        """
+        if all(key in first_result for key in ['index', 'candidate', 'result', 'is_valid']):
+            return False
+        return all(key in first_result for key in ['retention_score', 'all_retained'])
+    
+    def _iter_normalized(self, results: List[Dict[str, Any]], scenario: Dict[str, Any] = None):
+        """Normalizes results one at a time (see _normalize_results)."""
+        if not results:
+            return
+        if self._is_conversation_format(results[0]):
+            yield from results
+            return
+        scenario_id = self.scenarios.intern(scenario)
+        for item in results:
+            yield self._normalize_candidate_result(item, scenario, scenario_id)
     
     def _normalize_candidate_results(self, results: List[Dict[str, Any]], scenario: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -85,78 +554,81 @@ class HTMLReporter:
         Returns:
             List[Dict]: Normalized results
         """
-        normalized = []
+        scenario_id = self.scenarios.intern(scenario)
+        return [self._normalize_candidate_result(item, scenario, scenario_id) for item in results]
+    
+    def _normalize_candidate_result(self, item: Dict[str, Any], scenario: Dict[str, Any] = None,
+                                    scenario_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Normalizes one validate_llm_candidates result (see _normalize_candidate_results).
         
-        for item in results:
-            result_data = item['result']
-            
-            # Count retained facts
-            facts_retained = 0
-            total_facts = 0
-            facts_info = {}
-            
-            # Search all accuracy fields to count facts
-            for key, value in result_data.items():
-                if key.endswith('_accuracy'):
-                    fact_name = key.replace('_accuracy', '')
-                    
-                    # Skip 'factual' as it's not a real fact, just an internal field
-                    if fact_name == 'factual':
-                        continue
-                    
-                    total_facts += 1
-                    if value:
-                        facts_retained += 1
-                    
-                    # Create fact information
-                    expected_value = 'N/A'
-                    if scenario and 'facts' in scenario and fact_name in scenario['facts']:
-                        expected_value = scenario['facts'][fact_name].get('expected', 'N/A')
-                    
-                    facts_info[fact_name] = {
-                        'expected': expected_value,
-                        'extracted': result_data.get(f'extracted_{fact_name}', 'None'),
-                        'accuracy': value
-                    }
-            
-            # Get query from scenario name (preferred) or semantic_reference (fallback)
-            query_text = ''
-            reference_text = ''
-            if scenario:
-                # Prefer scenario name (the actual query/question) over semantic_reference
-                query_text = scenario.get('name', '') or scenario.get('semantic_reference', '')
-                # semantic_reference is the baseline text we compare against
-                reference_text = scenario.get('semantic_reference', '')
-            
-            # Create normalized result
-            normalized_result = {
-                'test_name': f"Candidate {item['index']}",
-                'retention_score': result_data.get('similarity_score', 0.0),
-                'all_retained': item['is_valid'],
-                'facts_retained': facts_retained,
-                'total_facts': total_facts,
-                'candidate_text': item['candidate'],
-                'timestamp': datetime.now().isoformat(),
-                'test_category': 'LLM Validation',
-                'facts_info': facts_info,
-                'similarity_score': result_data.get('similarity_score', 0.0),
-                'polarity_match': result_data.get('polarity_match', False),
-                'reference_polarity': result_data.get('reference_polarity', 'neutral'),
-                'candidate_polarity': result_data.get('candidate_polarity', 'neutral'),
-                'failure_reason': result_data.get('failure_reason', ''),
-                'query': query_text,
-                'reference_text': reference_text,
-                'semantic_precision': result_data.get('semantic_precision'),
-                'semantic_recall': result_data.get('semantic_recall'),
-                'semantic_f1': result_data.get('semantic_f1'),
-                'semantic_sequence_score': result_data.get('semantic_sequence_score'),
-            }
-            
-            normalized.append(normalized_result)
+        Query, reference text and timestamp are not copied into the result:
+        it refers to its ScenarioTable entry by 'scenario_id'.
+        """
+        if scenario_id is None:
+            scenario_id = self.scenarios.intern(scenario)
+        result_data = item['result']
         
-        return normalized
+        # Count retained facts
+        facts_retained = 0
+        total_facts = 0
+        facts_info = {}
+        
+        # Search all accuracy fields to count facts
+        for key, value in result_data.items():
+            if key.endswith('_accuracy'):
+                fact_name = key.replace('_accuracy', '')
+                
+                # Skip 'factual' as it's not a real fact, just an internal field
+                if fact_name == 'factual':
+                    continue
+                
+                total_facts += 1
+                if value:
+                    facts_retained += 1
+                
+                # Create fact information
+                expected_value = 'N/A'
+                if scenario and 'facts' in scenario and fact_name in scenario['facts']:
+                    expected_value = scenario['facts'][fact_name].get('expected', 'N/A')
+                
+                facts_info[fact_name] = {
+                    'expected': expected_value,
+                    'extracted': result_data.get(f'extracted_{fact_name}', 'None'),
+                    'accuracy': value
+                }
+        
+        # Create normalized result
+        normalized_result = {
+            'test_name': f"Candidate {item['index']}",
+            'retention_score': result_data.get('similarity_score', 0.0),
+            'all_retained': item['is_valid'],
+            'facts_retained': facts_retained,
+            'total_facts': total_facts,
+            'candidate_text': item['candidate'],
+            'scenario_id': scenario_id,
+            'test_category': 'LLM Validation',
+            'facts_info': facts_info,
+            'similarity_score': result_data.get('similarity_score', 0.0),
+            'polarity_match': result_data.get('polarity_match', False),
+            'reference_polarity': result_data.get('reference_polarity', 'neutral'),
+            'candidate_polarity': result_data.get('candidate_polarity', 'neutral'),
+            'failure_reason': result_data.get('failure_reason', ''),
+            'semantic_precision': result_data.get('semantic_precision'),
+            'semantic_recall': result_data.get('semantic_recall'),
+            'semantic_f1': result_data.get('semantic_f1'),
+            'semantic_sequence_score': result_data.get('semantic_sequence_score'),
+        }
+        
+        # Dedup info (validate_llm_candidates with dedup=True)
+        if 'represents' in item:
+            normalized_result['represents'] = item['represents']
+            normalized_result['duplicate_of'] = item['duplicate_of']
+            normalized_result['cluster_size'] = item['cluster_size']
+        
+        return normalized_result
     
-    def _save_execution_to_history(self, results: List[Dict[str, Any]], metrics: Dict[str, Any], scenario: Dict[str, Any] = None):
+    def _save_execution_to_history(self, factual_accuracy: float, metrics: Dict[str, Any], scenario: Dict[str, Any] = None):
         """Save current execution data to history for temporal analysis."""
         try:
             # Initialize history manager
@@ -170,32 +642,26 @@ class HTMLReporter:
                 "failed": metrics["failed"],
                 "pass_rate": metrics["pass_rate"],
                 "avg_similarity_score": metrics.get("avg_score", 0.0),
-                "avg_factual_accuracy": self._calculate_factual_accuracy(results),
+                "avg_factual_accuracy": factual_accuracy,
                 "timestamp": datetime.now().isoformat()
             }
             
             # Save to history
             history.save_execution(execution_data)
-            
+        
         except Exception as e:
             print(f"Warning: Could not save execution to history: {e}")
     
     def _calculate_factual_accuracy(self, results: List[Dict[str, Any]]) -> float:
         """Calculate average factual accuracy from results."""
-        if not results:
-            return 0.0
-        
-        total_facts = 0
-        correct_facts = 0
-        
+        return self._accumulate(results).factual_accuracy
+    
+    def _accumulate(self, results, first_id: int = 1) -> MetricsAccumulator:
+        """Accumulates metrics over normalized results (any iterable)."""
+        accumulator = MetricsAccumulator(first_id)
         for result in results:
-            facts_info = result.get("facts_info", {})
-            for fact_name, fact_data in facts_info.items():
-                total_facts += 1
-                if fact_data.get("accuracy", False):
-                    correct_facts += 1
-        
-        return (correct_facts / total_facts * 100) if total_facts > 0 else 0.0
+            accumulator.add(result)
+        return accumulator
     
     def _get_temporal_data(self) -> Dict[str, Any]:
         """Get real temporal data for charts."""
@@ -227,80 +693,448 @@ class HTMLReporter:
                        title: str = "Chatbot Validation Report",
                        show_details: bool = True,
                        scenario: Dict[str, Any] = None,
-                       save_to_history: bool = True) -> str:
+                       save_to_history: Optional[bool] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       details_mode: str = 'inline',
+                       shard_size: Optional[int] = None,
+                       workers: Optional[int] = None,
+                       max_chart_points: int = DEFAULT_MAX_CHART_POINTS,
+                       asset_mode: str = 'inline',
+                       chart_js: Optional[str] = None,
+                       incremental: bool = False) -> str:
         """
         Generates complete HTML report.
         
+        The report is streamed to the file: metrics are accumulated in a
+        first pass and the results table is then written chunk_size rows at
+        a time, so memory use does not grow with the number of results.
+        
+        With details_mode='split' the details of each chunk are written to
+        <output>_details/details-NNNN.js next to the report and loaded by
+        the browser only when a row is expanded.
+        
+        With shard_size, runs with more results are written as pages of
+        shard_size results in <output>_pages/ and output_file becomes an
+        index page with the global metrics, charts and links to the pages.
+        
+        With workers, the rows (details included) are rendered by a process
+        pool in contiguous ranges of whole chunks and written in order; the
+        report is byte-identical to the one rendered in this process.
+        
+        Chart series are aggregated in Python (histograms, an LTTB-downsampled
+        score series and the worst performers), so the embedded chart data
+        does not grow with the number of results.
+        
+        With asset_mode='bundle' the CSS and table JavaScript are written once
+        to a content-hashed bundle in true_lies_assets/ next to the report and
+        shared by every report of that folder. Chart.js is the copy vendored
+        with the package (true_lies/vendor/chart.umd.js) or the one chart_js
+        points to, copied into the bundle or inlined. Without a local copy it
+        is loaded from the CDN asynchronously after the page, so it never
+        blocks rendering; offline, the charts are hidden and the table still
+        works.
+        
+        With incremental=True, results are appended to the report written by
+        the previous incremental call for output_file (or start a new one):
+        only the new results are processed and the summary is rewritten, so
+        a refresh costs O(new results). Table options (title, show_details,
+        chunk_size, details_mode, assets) are those of the first call.
+        
         Args:
             results: List of validation results (conversation or candidates)
             output_file: HTML output file
             title: Report title
             show_details: Include details per candidate
             scenario: Optional scenario data for extracting expected values
-            save_to_history: Whether to save execution data to history
+            save_to_history: Whether to save execution data to history (default:
+                yes, except for appends to an existing incremental report)
+            chunk_size: Results rendered per write
+            details_mode: 'inline' (details embedded) or 'split' (chunk files)
+            shard_size: Results per page (None: single file)
+            workers: Processes rendering in parallel the pages of a sharded report,
+                or ranges of rows of a single file (None or 1: in this process)
+            max_chart_points: Maximum points of a per-result chart series
+            asset_mode: 'inline' (assets embedded) or 'bundle' (shared asset files)
+            chart_js: Path of a local Chart.js build (default: the vendored copy)
+            incremental: Append results to an incremental report (state kept
+                in <output>_state.json)
         
         Returns:
-            str: Path of generated file
+            str: Path of generated file (the index page when sharded)
         """
-        # Normalize results for compatibility with both test types
-        normalized_results = self._normalize_results(results, scenario)
+        if details_mode not in DETAILS_MODES:
+            raise ValueError(f"details_mode must be one of {DETAILS_MODES}, got {details_mode!r}")
+        if shard_size is not None and shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        if max_chart_points < 3:
+            raise ValueError("max_chart_points must be at least 3")
+        if asset_mode not in ASSET_MODES:
+            raise ValueError(f"asset_mode must be one of {ASSET_MODES}, got {asset_mode!r}")
+        if incremental and shard_size:
+            raise ValueError("incremental reports cannot be sharded")
         
-        # Calculate metrics
-        metrics = self._calculate_metrics(normalized_results)
+        output_path = Path(output_file)
+        if incremental:
+            self._generate_incremental_report(
+                results, output_path, title, show_details, scenario, save_to_history,
+                chunk_size, details_mode, max_chart_points, asset_mode, chart_js
+            )
+            return str(output_path.absolute())
+        
+        if save_to_history is None:
+            save_to_history = True
+        assets = self._prepare_assets(output_path, asset_mode, chart_js)
+        if shard_size and len(results) > shard_size:
+            self._generate_sharded_report(
+                results, output_path, title, show_details, scenario, save_to_history,
+                chunk_size, details_mode, shard_size, workers, max_chart_points, assets
+            )
+            return str(output_path.absolute())
+        
+        # One scenario table (and timestamp) per report
+        self.scenarios = ScenarioTable()
+        
+        # First pass: metrics (results are normalized lazily, one at a time)
+        accumulator = self._accumulate(self._iter_normalized(results, scenario))
+        metrics = accumulator.to_metrics()
+        metrics['charts'] = accumulator.chart_data(max_chart_points)
         
         # Save to history if requested
         if save_to_history:
-            self._save_execution_to_history(normalized_results, metrics, scenario)
+            self._save_execution_to_history(accumulator.factual_accuracy, metrics, scenario)
         
-        # Generate HTML
-        html_content = self._generate_html_content(
-            normalized_results, metrics, title, show_details
-        )
-        
-        # Save file
-        output_path = Path(output_file)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Second pass: stream the HTML
+        self._write_page(results, output_path, metrics, title, show_details, scenario, chunk_size, details_mode,
+                         assets=assets, workers=workers)
         
         return str(output_path.absolute())
     
-    def _calculate_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calculates general metrics from the results set."""
-        if not results:
-            return {
-                'total_candidates': 0,
-                'passed': 0,
-                'failed': 0,
-                'pass_rate': 0.0,
-                'avg_score': 0.0,
-                'score_distribution': {}
+    def _write_page(self, results: List[Dict[str, Any]], page_path: Path, metrics: Dict[str, Any],
+                    title: str, show_details: bool, scenario: Dict[str, Any] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, details_mode: str = 'inline',
+                    first_id: int = 1, navigation: str = '', include_charts: bool = True,
+                    assets: Optional[Dict[str, str]] = None, workers: Optional[int] = None) -> None:
+        """
+        Writes a report page with its results table (second pass over the results).
+        
+        With workers, the data chunks are rendered by a process pool (see
+        _iter_parallel_data_chunks).
+        """
+        details_dir = None
+        if details_mode == 'split' and show_details:
+            details_dir = self._prepare_details_dir(page_path)
+        data_chunks = None
+        if workers and workers > 1 and len(results) > chunk_size:
+            def data_chunks(index):
+                return self._iter_parallel_data_chunks(
+                    results, scenario, index, show_details, chunk_size, details_dir, first_id, workers
+                )
+        with open(page_path, 'w', encoding='utf-8') as f:
+            self._write_html(
+                f, self._iter_normalized(results, scenario), metrics, title, show_details, chunk_size,
+                details_dir, first_id, navigation, include_charts, assets, data_chunks
+            )
+    
+    def _generate_sharded_report(self, results: List[Dict[str, Any]], output_path: Path, title: str,
+                                 show_details: bool, scenario: Dict[str, Any], save_to_history: bool,
+                                 chunk_size: int, details_mode: str, shard_size: int,
+                                 workers: Optional[int],
+                                 max_chart_points: int = DEFAULT_MAX_CHART_POINTS,
+                                 assets: Optional[Dict[str, str]] = None) -> MetricsAccumulator:
+        """
+        Writes the pages of a sharded report and its index page.
+        
+        Each page is rendered (optionally in a worker process) with its own
+        accumulator; the global metrics of the index page are their merge.
+        
+        Returns:
+            MetricsAccumulator: Metrics of all the results
+        """
+        pages_dir = output_path.with_name(f"{output_path.stem}_pages")
+        pages_dir.mkdir(parents=True, exist_ok=True)
+        for stale in pages_dir.glob('page-*.html'):
+            stale.unlink()
+        
+        page_count = (len(results) + shard_size - 1) // shard_size
+        # All pages share the timestamp of the run
+        timestamp = datetime.now().isoformat()
+        # Bundle hrefs are relative to the output folder
+        page_assets = {kind: value if kind == 'chart_source' else f"../{value}"
+                       for kind, value in (assets or {}).items()}
+        jobs = []
+        for page in range(page_count):
+            first = page * shard_size
+            jobs.append({
+                'results': results[first:first + shard_size],
+                'page_path': str(pages_dir / f"page-{page + 1:04d}.html"),
+                'title': f"{title} - Page {page + 1} of {page_count}",
+                'show_details': show_details,
+                'scenario': scenario,
+                'chunk_size': chunk_size,
+                'details_mode': details_mode,
+                'first_id': first + 1,
+                'navigation': self._generate_page_navigation(page, page_count, output_path.name),
+                'timestamp': timestamp,
+                'assets': page_assets,
+            })
+        
+        if workers and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                accumulators = list(pool.map(_render_shard, jobs))
+        else:
+            accumulators = [_render_shard(job) for job in jobs]
+        
+        # Global metrics: merge of the per-page accumulators
+        total = MetricsAccumulator()
+        for accumulator in accumulators:
+            total.merge(accumulator)
+        metrics = total.to_metrics()
+        metrics['charts'] = total.chart_data(max_chart_points)
+        
+        if save_to_history:
+            self._save_execution_to_history(total.factual_accuracy, metrics, scenario)
+        
+        pages = [
+            (f"{pages_dir.name}/{Path(job['page_path']).name}", job['first_id'], accumulator)
+            for job, accumulator in zip(jobs, accumulators)
+        ]
+        with open(output_path, 'w', encoding='utf-8') as f:
+            self._write_index_html(f, metrics, title, pages, assets)
+        return total
+    
+    def _generate_incremental_report(self, results: List[Dict[str, Any]], output_path: Path, title: str,
+                                     show_details: bool, scenario: Dict[str, Any],
+                                     save_to_history: Optional[bool],
+                                     chunk_size: int, details_mode: str, max_chart_points: int,
+                                     asset_mode: str, chart_js: Optional[str]) -> MetricsAccumulator:
+        """
+        Appends results to an incremental report, creating it on first use.
+        
+        The file holds the head and the table start, then the data chunks of
+        every append (each append followed by the search index of its rows)
+        and finally a tail with the summary: header, charts and scripts. An
+        append truncates the file at the tail, writes the new chunks and
+        rewrites the tail; <output>_state.json keeps the tail offset, the
+        accumulated metrics and the scenario table, so earlier results are
+        never read again. Sort orders are computed by the browser.
+        
+        The state also keeps the file size and a hash of the tail; if the
+        file was changed by anything else (e.g. a regular report written to
+        the same path) the report is started again instead of appended to.
+        History is saved when the report is created, and on appends only if
+        save_to_history is True.
+        
+        Returns:
+            MetricsAccumulator: Metrics of all the results of the report
+        """
+        state_path = output_path.with_name(f"{output_path.stem}_state.json")
+        state = None
+        if state_path.exists() and output_path.exists():
+            state = json.loads(state_path.read_text(encoding='utf-8'))
+            if not self._incremental_state_matches(output_path, state):
+                # The report does not match the state: start again
+                state = None
+        
+        created = state is None
+        if created:
+            assets = self._prepare_assets(output_path, asset_mode, chart_js)
+            accumulator = MetricsAccumulator()
+            self.scenarios = ScenarioTable()
+            details_dir = None
+            if details_mode == 'split' and show_details:
+                details_dir = self._prepare_details_dir(output_path)
+            with open(output_path, 'wb') as f:
+                f.write(f"""<!DOCTYPE html>
+<html lang="en">
+{self._generate_head(title, assets)}
+<body>
+    <div class="container incremental-report">
+        <main>
+            {self._generate_table_start(0)}""".encode('utf-8'))
+                tail_offset = f.tell()
+            # Table options are fixed by the first call
+            state = {
+                'title': title,
+                'show_details': show_details,
+                'chunk_size': chunk_size,
+                'details_dir': details_dir.name if details_dir else None,
+                'assets': {kind: value for kind, value in assets.items() if kind != 'chart_source'},
+                'blocks': 0,
+                'tail_offset': tail_offset,
             }
+        else:
+            accumulator = MetricsAccumulator.from_state(state['metrics'])
+            self.scenarios = ScenarioTable.from_state(state['scenarios'])
+            details_dir = output_path.with_name(state['details_dir']) if state['details_dir'] else None
+        
+        def accumulated(normalized):
+            for result in normalized:
+                accumulator.add(result)
+                yield result
+        
+        first_id = accumulator.first_id + accumulator.total
+        with open(output_path, 'r+b') as f:
+            f.seek(state['tail_offset'])
+            f.truncate()
+            
+            # A single pass over the new results: metrics and data chunks
+            index = ResultsIndex()
+            for fragment in self._iter_data_chunks(
+                accumulated(self._iter_normalized(results, scenario)), index, state['show_details'],
+                state['chunk_size'], details_dir, first_id, state['blocks']
+            ):
+                f.write(fragment.encode('utf-8'))
+            if index.count:
+                # Index positions relative to the appended segment
+                offset = first_id - accumulator.first_id
+                f.write(self._render_json_script(
+                    index.search_payload(), f'class="results-search-segment" data-offset="{offset}"'
+                ).encode('utf-8'))
+                state['blocks'] += (index.count + state['chunk_size'] - 1) // state['chunk_size']
+            state['tail_offset'] = f.tell()
+            
+            metrics = accumulator.to_metrics()
+            metrics['charts'] = accumulator.chart_data(max_chart_points)
+            tail = self._generate_incremental_tail(metrics, state['title'], state['assets']).encode('utf-8')
+            f.write(tail)
+            state['file_size'] = f.tell()
+            state['tail_hash'] = hashlib.sha256(tail).hexdigest()
+        
+        if save_to_history or (save_to_history is None and created):
+            self._save_execution_to_history(accumulator.factual_accuracy, metrics, scenario)
+        
+        state['metrics'] = accumulator.to_state()
+        state['scenarios'] = self.scenarios.to_state()
+        temporary = state_path.with_name(f".{state_path.name}.tmp")
+        temporary.write_text(json.dumps(state), encoding='utf-8')
+        os.replace(temporary, state_path)
+        return accumulator
+    
+    def _incremental_state_matches(self, output_path: Path, state: Dict[str, Any]) -> bool:
+        """Whether the report file is still the one written with this state (size and tail hash)."""
+        if output_path.stat().st_size != state.get('file_size'):
+            return False
+        with open(output_path, 'rb') as f:
+            f.seek(state['tail_offset'])
+            return hashlib.sha256(f.read()).hexdigest() == state.get('tail_hash')
+    
+    def _generate_incremental_tail(self, metrics: Dict[str, Any], title: str, assets: Dict[str, str]) -> str:
+        """
+        Tail of an incremental report: everything that depends on the metrics.
         
-        total = len(results)
-        passed = sum(1 for r in results if r.get('all_retained', False))
-        failed = total - passed
+        The header and charts are written after the table and shown above it
+        with CSS (order in the .incremental-report container).
+        """
+        return f"""
+            {self._generate_scenarios_script()}
+</div>
+        </main>
+        {self._generate_header(metrics, title)}
+        {self._generate_charts_section(None, metrics)}
+        {self._generate_footer()}
+    </div>
+    {self._generate_page_scripts(assets, self._get_charts_javascript(None, metrics))}
+</body>
+</html>"""
+    
+    def _write_index_html(self, out, metrics: Dict[str, Any], title: str, pages: List[tuple],
+                          assets: Optional[Dict[str, str]] = None) -> None:
+        """
+        Writes the index page of a sharded report.
         
-        # Calculate average scores
-        scores = [r.get('retention_score', 0.0) for r in results]
-        avg_score = sum(scores) / len(scores) if scores else 0.0
+        Args:
+            out: Writable text stream
+            metrics: Metrics of all the results
+            title: Report title
+            pages: (relative href, first id, MetricsAccumulator) per page
+            assets: Asset hrefs (see _prepare_assets)
+        """
+        charts_javascript, chart_loader = self._generate_chart_loader(
+            assets or {}, self._get_charts_javascript(None, metrics)
+        )
+        out.write(f"""<!DOCTYPE html>
+<html lang="en">
+{self._generate_head(title, assets)}
+<body>
+    <div class="container">
+        {self._generate_header(metrics, title)}
+        {self._generate_charts_section(None, metrics)}
+        <main>
+            {self._generate_pages_index(pages)}
+        </main>
+        {self._generate_footer()}
+    </div>
+    <script>
+        // Inicializar variables globales para los gráficos
+        window.chartInstances = {{
+            weeklyTrend: null,
+            similarityTrend: null,
+            factRetention: null
+        }};
         
-        # Score distribution
-        score_ranges = {
-            'A (0.9-1.0)': sum(1 for s in scores if s >= 0.9),
-            'B (0.8-0.9)': sum(1 for s in scores if 0.8 <= s < 0.9),
-            'C (0.7-0.8)': sum(1 for s in scores if 0.7 <= s < 0.8),
-            'D (0.5-0.7)': sum(1 for s in scores if 0.5 <= s < 0.7),
-            'F (0.0-0.5)': sum(1 for s in scores if s < 0.5)
-        }
+        {charts_javascript}
+    </script>{chart_loader}
+</body>
+</html>""")
+    
+    def _prepare_details_dir(self, output_path: Path) -> Path:
+        """Creates (or empties) the directory of the split details chunks."""
+        details_dir = output_path.with_name(f"{output_path.stem}_details")
+        details_dir.mkdir(parents=True, exist_ok=True)
+        for stale in details_dir.glob('details-*.js'):
+            stale.unlink()
+        return details_dir
+    
+    def _static_template(self, name: str) -> str:
+        """Output of a static template method (CSS/JS), built once per process."""
+        key = (type(self), name)
+        if key not in HTMLReporter._static_cache:
+            HTMLReporter._static_cache[key] = getattr(self, name)()
+        return HTMLReporter._static_cache[key]
+    
+    def _write_asset(self, assets_dir: Path, stem: str, suffix: str, content: str) -> str:
+        """Writes a content-hashed asset file unless it exists; returns its name."""
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        name = f"{stem}-{digest}{suffix}"
+        path = assets_dir / name
+        if not path.exists():
+            # Atomic write: other reports may share the directory
+            temporary = path.with_name(f".{name}.{os.getpid()}.tmp")
+            temporary.write_text(content, encoding='utf-8')
+            os.replace(temporary, path)
+        return name
+    
+    def _prepare_assets(self, output_path: Path, asset_mode: str, chart_js: Optional[str]) -> Dict[str, str]:
+        """
+        Resolves the assets of a report.
         
-        return {
-            'total_candidates': total,
-            'passed': passed,
-            'failed': failed,
-            'pass_rate': (passed / total) * 100 if total > 0 else 0.0,
-            'avg_score': avg_score,
-            'score_distribution': score_ranges
-        }
+        Returns:
+            Dict[str, str]: Hrefs relative to the report folder ('css', 'js',
+                'chart') in bundle mode; 'chart_source' with the Chart.js
+                code when it is inlined. Missing keys use the defaults
+                (inline CSS/JS, Chart.js from the CDN).
+        """
+        if chart_js is None and VENDORED_CHART_JS.exists():
+            chart_js = VENDORED_CHART_JS
+        chart_source = Path(chart_js).read_text(encoding='utf-8') if chart_js else None
+        if asset_mode == 'inline':
+            return {'chart_source': chart_source} if chart_source else {}
+        
+        assets_dir = output_path.with_name(ASSETS_DIR_NAME)
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        table_javascript = (self._static_template('_get_sorting_javascript') + "\n"
+                            + self._static_template('_get_pagination_javascript'))
+        assets = {
+            'css': self._write_asset(assets_dir, 'report', '.css', self._static_template('_get_css_styles')),
+            'js': self._write_asset(assets_dir, 'report', '.js', table_javascript),
+        }
+        if chart_source:
+            assets['chart'] = self._write_asset(assets_dir, 'chart', '.js', chart_source)
+        return {kind: f"{ASSETS_DIR_NAME}/{name}" for kind, name in assets.items()}
+    
+    def _calculate_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Calculates general metrics from the results set."""
+        return self._accumulate(results).to_metrics()
     
     def _generate_html_content(self, 
                               results: List[Dict[str, Any]], 
@@ -308,36 +1142,72 @@ class HTMLReporter:
                               title: str,
                               show_details: bool) -> str:
         """Generates complete HTML content."""
+        buffer = io.StringIO()
+        self._write_html(buffer, results, metrics, title, show_details)
+        return buffer.getvalue()
+    
+    def _write_html(self, out, results, metrics: Dict[str, Any], title: str,
+                    show_details: bool, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    details_dir: Optional[Path] = None, first_id: int = 1,
+                    navigation: str = '', include_charts: bool = True,
+                    assets: Optional[Dict[str, str]] = None, data_chunks=None) -> None:
+        """
+        Writes the complete HTML document to a text stream.
         
-        # HTML head
-        head = self._generate_head(title)
-        
-        # Header with metrics
-        header = self._generate_header(metrics, title)
-        
-        # Charts section
-        charts_section = self._generate_charts_section(results, metrics)
-        
-        # Results table
-        results_table = self._generate_results_table(results, show_details)
-        
-        # Footer
-        footer = self._generate_footer()
+        Args:
+            out: Writable text stream
+            results: Normalized results (any iterable, consumed once)
+            metrics: Metrics of the whole result set
+            title: Report title
+            show_details: Include details per candidate
+            chunk_size: Results rendered per write
+            details_dir: Directory for split details chunks (None: inline)
+            first_id: Id of the first result (pages of a sharded report)
+            navigation: Navigation bar HTML (pages of a sharded report)
+            include_charts: Include the charts section and its scripts
+            assets: Asset hrefs (see _prepare_assets)
+            data_chunks: Renders the table data into an index (see _iter_results_table)
+        """
+        assets = assets or {}
+        charts_section = self._generate_charts_section(None, metrics) if include_charts else ''
+        charts_javascript = self._get_charts_javascript(None, metrics) if include_charts else ''
         
-        # Complete HTML
-        html = f"""<!DOCTYPE html>
+        # HTML head, header with metrics and charts section
+        out.write(f"""<!DOCTYPE html>
 <html lang="en">
-{head}
+{self._generate_head(title, assets, include_charts)}
 <body>
-    <div class="container">
-        {header}
+    <div class="container">{navigation}
+        {self._generate_header(metrics, title)}
         {charts_section}
         <main>
-            {results_table}
+            """)
+        
+        # Results table
+        for fragment in self._iter_results_table(results, show_details, metrics['total_candidates'], chunk_size,
+                                                 details_dir, first_id, data_chunks):
+            out.write(fragment)
+        
+        # Footer and scripts
+        out.write(f"""
         </main>
-        {footer}
+        {self._generate_footer()}
     </div>
-    <script>
+    {self._generate_page_scripts(assets, charts_javascript)}
+</body>
+</html>""")
+    
+    def _generate_page_scripts(self, assets: Dict[str, str], charts_javascript: str) -> str:
+        """Scripts of a report page (the table JavaScript may come from the bundle)."""
+        if 'js' in assets:
+            table_script = f'<script src="{assets["js"]}"></script>\n    '
+            table_javascript = ''
+        else:
+            table_script = ''
+            table_javascript = (f"{self._static_template('_get_sorting_javascript')}\n"
+                                f"        {self._static_template('_get_pagination_javascript')}")
+        charts_javascript, chart_loader = self._generate_chart_loader(assets, charts_javascript)
+        return f"""{table_script}<script>
         // Inicializar variables globales para los gráficos
         window.chartInstances = {{
             weeklyTrend: null,
@@ -345,21 +1215,32 @@ class HTMLReporter:
             factRetention: null
         }};
         
-        {self._get_sorting_javascript()}
-        {self._get_pagination_javascript()}
-        {self._get_charts_javascript(results, metrics)}
-    </script>
-</body>
-</html>"""
+        {table_javascript}
+        {charts_javascript}
+    </script>{chart_loader}"""
+    
+    def _generate_chart_loader(self, assets: Dict[str, str], charts_javascript: str) -> tuple:
+        """
+        Charts JavaScript of a page and the script tag that loads Chart.js from the CDN.
         
-        return html
+        With a local Chart.js (bundle or inlined) the charts are created right
+        away. Otherwise the CDN script is loaded async at the end of the page
+        and the charts are created in its onload handler (onerror hides them).
+        """
+        if not charts_javascript or 'chart' in assets or 'chart_source' in assets:
+            return charts_javascript, ''
+        charts_javascript = f"""function initCharts() {{
+        {charts_javascript}
+        }}"""
+        return charts_javascript, f"""
+    <script src="{CHART_JS_CDN}" async onload="initCharts()" onerror="initCharts()"></script>"""
     
-    def _generate_charts_section(self, results: List[Dict[str, Any]], metrics: Dict[str, Any]) -> str:
+    def _generate_charts_section(self, results: Optional[List[Dict[str, Any]]], metrics: Dict[str, Any]) -> str:
         """Genera la sección de gráficos interactivos."""
-        if not results:
+        if not metrics['total_candidates']:
             return ""
         
-        return """<section class="charts-section">
+        return f"""<section class="charts-section">
     <h2>Analytics Dashboard</h2>
     <div class="charts-grid">
         <div class="chart-container chart-centered">
@@ -382,24 +1263,63 @@ class HTMLReporter:
         <div class="chart-container">
             <h3>Fact Retention Trend</h3>
             <canvas id="factRetentionChart" width="400" height="200"></canvas>
-        </div>
+        </div>{self._generate_run_charts(metrics)}
     </div>
 </section>"""
     
-    def _generate_head(self, title: str) -> str:
+    def _generate_run_charts(self, metrics: Dict[str, Any]) -> str:
+        """Canvases of the charts of this run (aggregated in metrics['charts'])."""
+        if 'charts' not in metrics:
+            return ""
+        
+        return """
+        <div class="chart-container">
+            <h3>Score Distribution</h3>
+            <canvas id="scoreHistogramChart" width="400" height="200"></canvas>
+        </div>
+        <div class="chart-container">
+            <h3>Fact Retention Distribution</h3>
+            <canvas id="factHistogramChart" width="400" height="200"></canvas>
+        </div>
+        <div class="chart-container">
+            <h3>Score by Candidate</h3>
+            <canvas id="scoreSeriesChart" width="400" height="200"></canvas>
+        </div>
+        <div class="chart-container">
+            <h3>Worst Performers</h3>
+            <canvas id="worstPerformersChart" width="400" height="200"></canvas>
+        </div>"""
+    
+    def _generate_head(self, title: str, assets: Optional[Dict[str, str]] = None,
+                       include_charts: bool = True) -> str:
         """Genera la sección head del HTML."""
+        assets = assets or {}
+        if not include_charts:
+            chart_js = ""
+        elif 'chart' in assets:
+            chart_js = f"""
+        <!-- Chart.js (bundle local) -->
+        <script src="{assets['chart']}"></script>"""
+        elif 'chart_source' in assets:
+            # '</script' inside the code would close the block too early
+            chart_source = assets['chart_source'].replace('</script', '<\\/script')
+            chart_js = f"""
+        <!-- Chart.js (embebido) -->
+        <script>{chart_source}</script>"""
+        else:
+            # Chart.js from the CDN is loaded async at the end of the page (_generate_chart_loader)
+            chart_js = ""
+        if 'css' in assets:
+            styles = f'<link rel="stylesheet" href="{assets["css"]}">'
+        else:
+            styles = f"""<style>
+        {self._static_template('_get_css_styles')}
+    </style>"""
         return f"""<head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-        <!-- Chart.js CDN -->
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <!-- PDF Generation Libraries -->
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js"></script>
-        <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
-    <style>
-        {self._get_css_styles()}
-    </style>
+    <title>{title}</title>{chart_js}
+    {styles}
 </head>"""
     
     def _generate_header(self, metrics: Dict[str, Any], title: str) -> str:
@@ -438,15 +1358,62 @@ class HTMLReporter:
     
     def _generate_results_table(self, results: List[Dict[str, Any]], show_details: bool) -> str:
         """Genera la tabla de resultados."""
-        if not results:
-            return """<div class="no-results">
+        return ''.join(self._iter_results_table(results, show_details, len(results)))
+    
+    def _iter_results_table(self, results, show_details: bool, total_candidates: int,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE, details_dir: Optional[Path] = None,
+                            first_id: int = 1, data_chunks=None):
+        """
+        Generates the results table in fragments.
+        
+        The table is written without rows: the results are embedded as
+        columnar JSON in chunks of chunk_size (one <script type="application/json">
+        per chunk) and the browser renders only the visible page. This way
+        the report is written to disk without building it in memory.
+        
+        Args:
+            results: Normalized results (any iterable)
+            show_details: Include details per candidate
+            total_candidates: Total number of results
+            chunk_size: Rows per fragment
+            details_dir: Directory of the split details (None: embedded)
+            first_id: Id of the first result (pages of a sharded report)
+            data_chunks: Function that receives the ResultsIndex and yields the
+                data chunks (default: _iter_data_chunks over results)
+        """
+        if not total_candidates:
+            yield """<div class="no-results">
     <h2>Results</h2>
     <p>No results to display.</p>
 </div>"""
+            return
         
+        yield self._generate_table_start(total_candidates)
+        
+        # Table data and, at the end, its sort permutations and search index
+        index = ResultsIndex()
+        if data_chunks is None:
+            yield from self._iter_data_chunks(results, index, show_details, chunk_size, details_dir, first_id)
+        else:
+            yield from data_chunks(index)
+        yield self._render_json_script(index.to_payload(), 'id="resultsIndex"')
+        
+        # Scenario texts, once per scenario (details reference them by id)
+        yield self._generate_scenarios_script()
+        
+        yield """
+</div>"""
+    
+    def _generate_table_start(self, total_candidates: int) -> str:
+        """Opens the results section: search, table without rows and pagination."""
         # Header de la tabla
         table_header = """<div class="results-section">
     <h2>Detailed Results</h2>
+    <div class="results-search">
+        <input type="search" id="resultsSearch" class="search-input"
+               placeholder="Search candidate text and failure reasons..." autocomplete="off">
+        <span class="search-info" id="searchInfo"></span>
+    </div>
     <div class="table-container">
         <table class="results-table" id="resultsTable">
             <thead>
@@ -469,75 +1436,145 @@ class HTMLReporter:
                     <th>Actions</th>
                 </tr>
             </thead>
-            <tbody>"""
-        
-        # Filas de la tabla
-        table_rows = []
-        for i, result in enumerate(results, 1):
-            score = result.get('retention_score', 0.0)
-            all_retained = result.get('all_retained', False)
-            facts_retained = result.get('facts_retained', 0)
-            total_facts = result.get('total_facts', 0)
-            
-            # Determinar clase de status
-            if all_retained:
-                status_class = 'success'
-                status_icon = '✓'
-                status_text = 'PASS'
-            else:
-                status_class = 'danger'
-                status_icon = '✗'
-                status_text = 'FAIL'
-            
-            # Score class
-            score_class = self._get_score_class(score)
-            
-            # Date (use timestamp if available, otherwise current date)
-            timestamp = result.get('timestamp', datetime.now().isoformat())
-            if isinstance(timestamp, str):
-                try:
-                    dt = datetime.fromisoformat(timestamp)
-                    date_str = dt.strftime('%d/%m/%Y %H:%M')
-                except ValueError:
-                    date_str = 'N/A'
-            else:
-                date_str = 'N/A'
-            
-            # Expandable details
-            details_id = f"details_{i}"
-            details_content = self._generate_candidate_details(result) if show_details else ""
-            
-            # Create button and details row separately
-            button_html = f'<button onclick="toggleDetails(\'{details_id}\')" class="btn-details" id="btn-{details_id}">View Details</button>' if show_details else 'N/A'
-            details_row = f'<tr id="{details_id}" class="details-row" data-candidate-id="{i}" style="display: none;"><td colspan="6">{details_content}</td></tr>' if show_details else ''
-            
-            row = f"""<tr class="result-row" data-candidate-id="{i}">
-                <td class="candidate-id">{i}</td>
-                <td class="score-cell {score_class}">{score:.3f}</td>
-                <td class="status-cell {status_class}">
-                    {status_icon} {status_text}
-                </td>
-                <td class="facts-cell">{facts_retained}/{total_facts}</td>
-                <td class="date-cell">{date_str}</td>
-                <td class="actions-cell">
-                    {button_html}
-                </td>
-            </tr>
-            {details_row}"""
-            
-            table_rows.append(row)
-    
-        total_candidates = len(results)
+            <tbody id="resultsBody">"""
+        
+        # The browser renders the rows (only the visible page) from the
+        # columnar data embedded after the table
         pagination_html = self._generate_pagination_html(total_candidates)
-
-        table_footer = f"""</tbody>
+        
+        return table_header + f"""
+            </tbody>
         </table>
         {pagination_html}
-    </div>
-</div>"""
+    </div>"""
+    
+    def _iter_data_chunks(self, results, index: ResultsIndex, show_details: bool,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, details_dir: Optional[Path] = None,
+                          first_id: int = 1, first_block: int = 0):
+        """
+        Data chunks of the table, chunk_size results per chunk.
         
-        return table_header + '\n'.join(table_rows) + table_footer
-
+        Adds every row to index. first_block is the number of the first chunk
+        (it continues the numbering of the split details files).
+        """
+        chunk = []
+        block = first_block
+        start = first_id
+        for i, result in enumerate(results, first_id):
+            row = self._row_payload(result, show_details)
+            index.add(row, result)
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield self._render_data_chunk(start, chunk, block, details_dir)
+                block += 1
+                start = i + 1
+                chunk = []
+        if chunk:
+            yield self._render_data_chunk(start, chunk, block, details_dir)
+    
+    def _iter_parallel_data_chunks(self, results: List[Dict[str, Any]], scenario: Dict[str, Any],
+                                   index: ResultsIndex, show_details: bool, chunk_size: int,
+                                   details_dir: Optional[Path], first_id: int, workers: int):
+        """
+        Data chunks rendered in a process pool.
+        
+        The results are split into contiguous ranges of whole chunks (the
+        chunks match those of the sequential pass); each process returns the
+        HTML of its range and its ResultsIndex, which are written and added
+        to index in order. The scenarios are already in self.scenarios (first
+        pass), so ids and timestamps match. The options and the scenario
+        table reach each process once, through the pool initializer.
+        """
+        # Several ranges per process to balance the load
+        blocks = (len(results) + chunk_size - 1) // chunk_size
+        range_size = max(1, blocks // (workers * 4)) * chunk_size
+        context = {
+            'scenario': scenario,
+            'scenarios': self.scenarios.to_state(),
+            'show_details': show_details,
+            'chunk_size': chunk_size,
+            'details_dir': str(details_dir) if details_dir else None,
+        }
+        starts = iter(range(0, len(results), range_size))
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_range_worker,
+                                 initargs=(context,)) as pool:
+            def submit(first):
+                return pool.submit(_render_chunk_range, results[first:first + range_size],
+                                   first_id + first, first // chunk_size)
+            
+            # At most workers * 2 ranges in flight, so memory does not grow with the results
+            pending.extend(submit(first) for first in itertools.islice(starts, workers * 2))
+            while pending:
+                fragment, range_index = pending.popleft().result()
+                pending.extend(submit(first) for first in itertools.islice(starts, 1))
+                index.extend(range_index)
+                yield fragment
+    
+    def _generate_scenarios_script(self) -> str:
+        """JSON block with the texts of each scenario."""
+        scenario_texts = [self._generate_scenario_texts(entry) for entry in self.scenarios.entries]
+        return self._render_json_script(scenario_texts, 'id="resultsScenarios"')
+    
+    def _row_payload(self, result: Dict[str, Any], show_details: bool) -> tuple:
+        """Row values of a result, in the order of RESULTS_COLUMNS."""
+        # Date (use timestamp if available, otherwise current date)
+        timestamp = self._result_timestamp(result)
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        date_str = _format_date(timestamp) if isinstance(timestamp, str) else 'N/A'
+        
+        return (
+            round(result.get('retention_score', 0.0), 3),
+            1 if result.get('all_retained', False) else 0,
+            result.get('facts_retained', 0),
+            result.get('total_facts', 0),
+            date_str,
+            self._generate_candidate_details(result) if show_details else None,
+        )
+    
+    def _result_timestamp(self, result: Dict[str, Any]) -> Optional[str]:
+        """Timestamp of a result (its own or its scenario's)."""
+        timestamp = result.get('timestamp')
+        if timestamp is None and 'scenario_id' in result:
+            timestamp = self.scenarios.get(result['scenario_id'])['timestamp']
+        return timestamp
+    
+    def _render_data_chunk(self, start: int, rows: List[tuple], block: int = 0,
+                           details_dir: Optional[Path] = None) -> str:
+        """
+        Columnar data chunk embedded in the report.
+        
+        With details_dir, the chunk details are written to
+        details_dir/details-NNNN.js (as a call to window.__trueLiesDetails)
+        and the chunk only keeps the relative path of that file.
+        
+        Args:
+            start: Id (1-based) of the first row of the chunk
+            rows: Values per row (see _row_payload)
+            block: Number (0-based) of the chunk
+            details_dir: Directory of the split details
+        """
+        columns = {'start': start}
+        for name, values in zip(RESULTS_COLUMNS, zip(*rows)):
+            columns[name] = list(values)
+        if details_dir is not None and any(columns['details']):
+            details_file = details_dir / f"details-{block + 1:04d}.js"
+            details = json.dumps(columns['details'], ensure_ascii=False, separators=(',', ':'))
+            details_file.write_text(f"window.__trueLiesDetails({block}, {details});\n", encoding='utf-8')
+            columns['details_src'] = f"{details_dir.name}/{details_file.name}"
+            del columns['details']
+        elif not any(columns['details']):
+            del columns['details']
+        return self._render_json_script(columns, 'class="results-data"')
+    
+    def _render_json_script(self, data: Any, attributes: str) -> str:
+        """Embeds JSON data in a <script type="application/json">."""
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        # '</' would close the <script> too early
+        payload = payload.replace('</', '<\\/')
+        return f'\n    <script type="application/json" {attributes}>{payload}</script>'
+    
     def _generate_pagination_html(self, total_candidates: int) -> str:
         """Genera los controles de paginación."""
         return f"""
@@ -564,6 +1601,83 @@ class HTMLReporter:
         </div>
         """
     
+    def _generate_page_navigation(self, page: int, page_count: int, index_name: str) -> str:
+        """Generates the navigation bar of a page of a sharded report (page is 0-based)."""
+        previous_link = f'<a href="page-{page:04d}.html" class="page-nav-link">‹ Previous</a>' if page > 0 else ''
+        next_link = f'<a href="page-{page + 2:04d}.html" class="page-nav-link">Next ›</a>' if page + 1 < page_count else ''
+        return f"""
+        <nav class="page-navigation">
+            <a href="../{index_name}" class="page-nav-link">« Index</a>
+            {previous_link}
+            <span class="page-nav-info">Page {page + 1} of {page_count}</span>
+            {next_link}
+        </nav>"""
+    
+    def _generate_pages_index(self, pages: List[tuple]) -> str:
+        """Generates the page table of the index of a sharded report."""
+        rows = []
+        for number, (href, first_id, accumulator) in enumerate(pages, 1):
+            page_metrics = accumulator.to_metrics()
+            last_id = first_id + accumulator.total - 1
+            rows.append(f"""
+                <tr>
+                    <td><a href="{href}" class="page-nav-link">Page {number}</a></td>
+                    <td>{first_id}-{last_id}</td>
+                    <td>{page_metrics['passed']}/{page_metrics['total_candidates']}</td>
+                    <td>{page_metrics['pass_rate']:.1f}%</td>
+                    <td class="{self._get_score_class(page_metrics['avg_score'])}">{page_metrics['avg_score']:.3f}</td>
+                </tr>""")
+        return f"""<div class="results-section">
+    <h2>Result Pages</h2>
+    <div class="table-container">
+        <table class="results-table pages-table">
+            <thead>
+                <tr>
+                    <th>Page</th>
+                    <th>Candidates</th>
+                    <th>Passed</th>
+                    <th>Pass Rate</th>
+                    <th>Avg Score</th>
+                </tr>
+            </thead>
+            <tbody>{''.join(rows)}
+            </tbody>
+        </table>
+    </div>
+</div>"""
+    
+    def _generate_scenario_texts(self, entry: Dict[str, Any]) -> str:
+        """Generates the query and reference of a scenario (shared by its candidates)."""
+        texts = []
+        if entry['query']:
+            texts.append(f"""
+                <div class="text-section">
+                    <h5>🔍 Query:</h5>
+                    <div class="text-content query-text">{entry['query']}</div>
+                </div>
+                """)
+        if entry['reference_text']:
+            texts.append(f"""
+                <div class="text-section">
+                    <h5>📋 Reference (Baseline):</h5>
+                    <div class="text-content reference-text">{entry['reference_text']}</div>
+                </div>
+                """)
+        return ''.join(texts)
+    
+    def _generate_dedup_info(self, result: Dict[str, Any]) -> str:
+        """Generates the dedup lines (how many candidates a result represents)."""
+        if 'represents' not in result:
+            return ''
+        if result.get('duplicate_of'):
+            info = f"Duplicate of Candidate {result['duplicate_of']}"
+        else:
+            info = f"{result['represents']} candidate(s)"
+        lines = f"\n                <div><strong>Represents:</strong> {info}</div>"
+        if result.get('cluster_size', 1) > 1:
+            lines += f"\n                <div><strong>Near-duplicate Cluster:</strong> {result['cluster_size']} candidates</div>"
+        return lines
+    
     def _generate_candidate_details(self, result: Dict[str, Any]) -> str:
         """Generates expandable details for a candidate."""
         details = []
@@ -590,7 +1704,7 @@ class HTMLReporter:
                 <div><strong>Retention Score:</strong> {retention_score}</div>
                 <div><strong>Facts Retained:</strong> {facts_retained}/{total_facts}</div>
                 <div><strong>All Retained:</strong> {'✓ Yes' if all_retained else '✗ No'}</div>
-                <div><strong>Timestamp:</strong> {result.get('timestamp', 'N/A')}</div>
+                <div><strong>Timestamp:</strong> {self._result_timestamp(result) or 'N/A'}</div>{self._generate_dedup_info(result)}
             </div>
         """)
         
@@ -703,6 +1817,11 @@ class HTMLReporter:
             <div class="conversation-texts">
             """)
             
+            if 'scenario_id' in result:
+                # Query and reference are filled in by the browser (see _generate_scenario_texts)
+                details.append(f"""
+                <div class="scenario-texts" data-scenario-id="{result['scenario_id']}"></div>
+                """)
             if 'query' in result and result['query']:
                 details.append(f"""
                 <div class="text-section">
@@ -786,197 +1905,417 @@ class HTMLReporter:
         
         return '\n'.join(details)
     
-    def _get_sorting_javascript(self) -> str:
-        """Genera el JavaScript para el sorting de la tabla."""
+    def _get_sorting_javascript(self) -> str:
+        """Generates the JavaScript of the table data and its sorting."""
+        return """
+        // Datos de la tabla de resultados: columnas cargadas de los bloques
+        // JSON embebidos. El orden de visualización es una permutación
+        // precalculada (o su filtrado por la búsqueda), recorrida al revés
+        // cuando el orden es descendente.
+        window.resultsTable = {
+            columns: null,
+            firstId: 1,
+            detailChunks: {},
+            scenarios: [],
+            index: null,
+            permutations: {},
+            sortColumn: 0,
+            sortDir: 'asc',
+            matches: null,
+            order: []
+        };
+        
+        function loadResultsData() {
+            const state = window.resultsTable;
+            if (state.columns) return state;
+            
+            const columns = { id: [], score: [], pass: [], facts: [], total: [], date: [], details: [] };
+            document.querySelectorAll('script.results-data').forEach((block, blockNumber) => {
+                const chunk = JSON.parse(block.textContent);
+                const count = chunk.score.length;
+                if (chunk.details_src) {
+                    // Detalles en un archivo aparte: la columna guarda el número de bloque
+                    state.detailChunks[blockNumber] = {
+                        src: chunk.details_src,
+                        offset: columns.id.length,
+                        requested: false,
+                        callbacks: []
+                    };
+                }
+                for (let k = 0; k < count; k++) {
+                    columns.id.push(chunk.start + k);
+                    columns.score.push(chunk.score[k]);
+                    columns.pass.push(chunk.pass[k]);
+                    columns.facts.push(chunk.facts[k]);
+                    columns.total.push(chunk.total[k]);
+                    columns.date.push(chunk.date[k]);
+                    columns.details.push(chunk.details ? chunk.details[k] : (chunk.details_src ? blockNumber : null));
+                }
+            });
+            const indexBlock = document.getElementById('resultsIndex');
+            const index = indexBlock ? JSON.parse(indexBlock.textContent) : { sort: {}, search: { tokens: [], postings: [] } };
+            // Reportes incrementales: un índice de búsqueda por tramo agregado
+            const segments = document.querySelectorAll('script.results-search-segment');
+            if (segments.length) index.search = mergeSearchSegments(segments);
+            const scenariosBlock = document.getElementById('resultsScenarios');
+            
+            state.scenarios = scenariosBlock ? JSON.parse(scenariosBlock.textContent) : [];
+            state.firstId = columns.id.length ? columns.id[0] : 1;
+            state.columns = columns;
+            state.index = index;
+            state.order = getPermutation(0);
+            return state;
+        }
+        
+        // Une los índices de búsqueda de los tramos (posiciones relativas a cada tramo)
+        function mergeSearchSegments(segments) {
+            const merged = new Map();
+            segments.forEach(block => {
+                const segment = JSON.parse(block.textContent);
+                const offset = Number(block.dataset.offset);
+                segment.tokens.forEach((token, t) => {
+                    let positions = merged.get(token);
+                    if (!positions) merged.set(token, positions = []);
+                    let position = offset;
+                    segment.postings[t].forEach(delta => {
+                        position += delta;
+                        positions.push(position);
+                    });
+                });
+            });
+            const tokens = Array.from(merged.keys()).sort();
+            const postings = tokens.map(token => {
+                let previous = 0;
+                return merged.get(token).map(position => {
+                    const delta = position - previous;
+                    previous = position;
+                    return delta;
+                });
+            });
+            return { tokens: tokens, postings: postings };
+        }
+        
+        // Int32Array little-endian codificado en base64
+        function decodeIndices(encoded) {
+            const binary = atob(encoded);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return new Int32Array(bytes.buffer);
+        }
+        
+        function getPermutation(columnIndex) {
+            const state = window.resultsTable;
+            if (!state.permutations[columnIndex]) {
+                const encoded = state.index.sort[columnIndex];
+                if (encoded !== undefined) {
+                    state.permutations[columnIndex] = decodeIndices(encoded);
+                } else {
+                    // ID: orden de carga
+                    const identity = new Int32Array(state.columns.id.length);
+                    for (let i = 0; i < identity.length; i++) identity[i] = i;
+                    if (columnIndex !== 0) sortPermutation(identity, columnIndex);
+                    state.permutations[columnIndex] = identity;
+                }
+            }
+            return state.permutations[columnIndex];
+        }
+        
+        // Sin permutación precalculada (reportes incrementales) se ordena aquí,
+        // con las mismas claves que ResultsIndex y orden estable
+        function sortPermutation(permutation, columnIndex) {
+            const columns = window.resultsTable.columns;
+            const keys = new Array(permutation.length);
+            for (let i = 0; i < keys.length; i++) {
+                if (columnIndex === 1) {
+                    keys[i] = columns.score[i];
+                } else if (columnIndex === 2) {
+                    keys[i] = columns.pass[i];
+                } else if (columnIndex === 3) {
+                    keys[i] = columns.total[i] ? columns.facts[i] / columns.total[i] : 0;
+                } else {
+                    // 'dd/mm/YYYY HH:MM' -> 'YYYYmmdd HH:MM' ('N/A' primero)
+                    const date = columns.date[i];
+                    keys[i] = date.length === 16 ? date.slice(6, 10) + date.slice(3, 5) + date.slice(0, 2) + date.slice(10) : '';
+                }
+            }
+            permutation.sort((a, b) => keys[a] < keys[b] ? -1 : (keys[a] > keys[b] ? 1 : a - b));
+        }
+        
+        // Orden visible: la permutación de la columna, filtrada si hay búsqueda
+        function updateOrder() {
+            const state = window.resultsTable;
+            const permutation = getPermutation(state.sortColumn);
+            if (!state.matches) {
+                state.order = permutation;
+                return;
+            }
+            const order = new Int32Array(state.matches.count);
+            let n = 0;
+            for (let i = 0; i < permutation.length; i++) {
+                if (state.matches.mask[permutation[i]]) order[n++] = permutation[i];
+            }
+            state.order = order;
+        }
+        
+        // Función para ordenar la tabla (cambia a la permutación precalculada)
+        function sortTable(columnIndex) {
+            const state = loadResultsData();
+            const headers = document.querySelectorAll('#resultsTable th');
+            
+            if (state.sortColumn === columnIndex && state.sortDir === 'asc') {
+                state.sortDir = 'desc';
+            } else {
+                state.sortDir = 'asc';
+                if (state.sortColumn !== columnIndex) {
+                    state.sortColumn = columnIndex;
+                    updateOrder();
+                }
+            }
+            
+            headers.forEach(header => {
+                header.classList.remove('sort-asc', 'sort-desc');
+            });
+            headers[columnIndex].classList.add('sort-' + state.sortDir);
+            
+            window.dispatchEvent(new CustomEvent('paginationRefresh'));
+        }
+        
+        // Posiciones del índice de búsqueda cuyos tokens empiezan con prefix
+        function searchPrefix(search, prefix, mask) {
+            const tokens = search.tokens;
+            let low = 0;
+            let high = tokens.length;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (tokens[mid] < prefix) low = mid + 1; else high = mid;
+            }
+            for (let t = low; t < tokens.length && tokens[t].startsWith(prefix); t++) {
+                let position = 0;
+                search.postings[t].forEach(delta => {
+                    position += delta;
+                    mask[position] = 1;
+                });
+            }
+        }
+        
+        // Búsqueda: todas las palabras de la consulta (como prefijo) deben aparecer
+        function searchResults(query) {
+            const state = loadResultsData();
+            const terms = query.toLowerCase().match(/[\\p{L}\\p{N}]+/gu);
+            if (!terms) {
+                state.matches = null;
+            } else {
+                const count = state.columns.id.length;
+                let mask = null;
+                terms.forEach(term => {
+                    const termMask = new Uint8Array(count);
+                    searchPrefix(state.index.search, term, termMask);
+                    if (mask) {
+                        for (let i = 0; i < count; i++) mask[i] &= termMask[i];
+                    } else {
+                        mask = termMask;
+                    }
+                });
+                let matched = 0;
+                for (let i = 0; i < count; i++) matched += mask[i];
+                state.matches = { mask: mask, count: matched };
+            }
+            updateOrder();
+            
+            const infoEl = document.getElementById('searchInfo');
+            if (infoEl) {
+                infoEl.textContent = state.matches ? state.matches.count + ' matching results' : '';
+            }
+            window.dispatchEvent(new CustomEvent('paginationRefresh'));
+        }
+        
+        document.addEventListener('DOMContentLoaded', function() {
+            document.getElementById('resultsSearch')?.addEventListener('input', function() {
+                searchResults(this.value);
+            });
+        });
+        """
+    
+    def _get_pagination_javascript(self) -> str:
+        """Generates the JavaScript for table pagination (renders only the visible page)."""
         return """
-        // Función para ordenar la tabla
-        function sortTable(columnIndex) {
-            console.log('sortTable called with columnIndex:', columnIndex);
-            
-            const table = document.getElementById('resultsTable');
-            if (!table) {
-                console.error('Table with id resultsTable not found');
-                return;
+        // Clase CSS del score (mismos umbrales que HTMLReporter._get_score_class)
+        function scoreClass(score) {
+            if (score >= 0.9) return 'score-excellent';
+            if (score >= 0.8) return 'score-good';
+            if (score >= 0.7) return 'score-acceptable';
+            if (score >= 0.5) return 'score-poor';
+            return 'score-fail';
+        }
+        
+        // Detalles separados (details_mode='split'): cada archivo llama a esta función
+        window.__trueLiesDetails = function(blockNumber, details) {
+            const state = window.resultsTable;
+            const chunk = state.detailChunks[blockNumber];
+            if (!chunk) return;
+            for (let k = 0; k < details.length; k++) {
+                state.columns.details[chunk.offset + k] = details[k];
             }
-            
-            const tbody = table.querySelector('tbody');
-            if (!tbody) {
-                console.error('Table tbody not found');
+            const callbacks = chunk.callbacks;
+            chunk.callbacks = [];
+            callbacks.forEach(callback => callback());
+        };
+        
+        // Carga (una vez por bloque) los detalles de una fila y llama a callback
+        function ensureDetails(idx, callback) {
+            const state = loadResultsData();
+            const blockNumber = state.columns.details[idx];
+            if (typeof blockNumber !== 'number') {
+                callback();
                 return;
             }
-            
-            const allRows = Array.from(tbody.querySelectorAll('tr'));
-            const headers = table.querySelectorAll('th');
-            
-            console.log('Found', allRows.length, 'total rows and', headers.length, 'headers');
-            
-            // Filtrar solo las filas que tienen el número correcto de celdas (6 celdas = fila principal)
-            const rows = allRows.filter(row => row.cells && row.cells.length >= 6);
-            
-            console.log('Filtered to', rows.length, 'sortable rows (with 6+ cells)');
-            
-            if (rows.length === 0) {
-                console.error('No sortable rows found in table');
-                return;
+            const chunk = state.detailChunks[blockNumber];
+            chunk.callbacks.push(callback);
+            if (!chunk.requested) {
+                chunk.requested = true;
+                const script = document.createElement('script');
+                script.src = chunk.src;
+                script.onerror = function() {
+                    chunk.requested = false;
+                    chunk.callbacks = [];
+                };
+                document.head.appendChild(script);
             }
-            
-            // Determinar el orden de sorting
-            let sortOrder = 'asc';
-            const currentHeader = headers[columnIndex];
-            
-            console.log('Current header classes:', currentHeader.classList.toString());
-            
-            // Si ya está ordenado por esta columna, cambiar el orden
-            if (currentHeader.classList.contains('sort-asc')) {
-                sortOrder = 'desc';
-                currentHeader.classList.remove('sort-asc');
-                currentHeader.classList.add('sort-desc');
-            } else if (currentHeader.classList.contains('sort-desc')) {
-                sortOrder = 'asc';
-                currentHeader.classList.remove('sort-desc');
-                currentHeader.classList.add('sort-asc');
-            } else {
-                // Limpiar clases de sorting de todos los headers
-                headers.forEach(header => {
-                    header.classList.remove('sort-asc', 'sort-desc');
+        }
+        
+        // Completa la fila de detalles al expandirla (ver toggleDetails)
+        function fillDetails(detailsRow) {
+            const idx = parseInt(detailsRow.dataset.candidateId, 10) - loadResultsData().firstId;
+            ensureDetails(idx, function() {
+                const state = window.resultsTable;
+                const details = state.columns.details[idx];
+                if (typeof details !== 'string') return;
+                const cell = detailsRow.cells[0];
+                cell.innerHTML = details;
+                // Textos del escenario, guardados una sola vez en el reporte
+                cell.querySelectorAll('.scenario-texts').forEach(container => {
+                    container.innerHTML = state.scenarios[parseInt(container.dataset.scenarioId, 10)] || '';
                 });
-                sortOrder = 'asc';
-                currentHeader.classList.add('sort-asc');
-            }
-            
-            console.log('Sorting in', sortOrder, 'order');
-            
-            // Ordenar las filas
-            console.log('Starting sort with', rows.length, 'rows');
-            rows.sort((a, b) => {
-                const aValue = a.cells[columnIndex].textContent.trim();
-                const bValue = b.cells[columnIndex].textContent.trim();
-                
-                console.log('Comparing:', aValue, 'vs', bValue);
-                
-                // Manejar diferentes tipos de datos
-                let comparison = 0;
-                
-                if (columnIndex === 0) { // ID - numérico
-                    comparison = parseInt(aValue) - parseInt(bValue);
-                } else if (columnIndex === 1) { // Score - numérico
-                    comparison = parseFloat(aValue) - parseFloat(bValue);
-                } else if (columnIndex === 3) { // Facts Retained - formato "X/Y"
-                    const aMatch = aValue.match(/(\\d+)\\/(\\d+)/);
-                    const bMatch = bValue.match(/(\\d+)\\/(\\d+)/);
-                    if (aMatch && bMatch) {
-                        const aRatio = parseInt(aMatch[1]) / parseInt(aMatch[2]);
-                        const bRatio = parseInt(bMatch[1]) / parseInt(bMatch[2]);
-                        comparison = aRatio - bRatio;
-                    } else {
-                        comparison = aValue.localeCompare(bValue);
-                    }
-                } else { // Texto - alfabético
-                    comparison = aValue.localeCompare(bValue);
-                }
-                
-                console.log('Comparison result:', comparison, 'sortOrder:', sortOrder);
-                return sortOrder === 'asc' ? comparison : -comparison;
             });
-            console.log('Sort completed');
+        }
+        
+        // Función para mostrar/ocultar detalles
+        function toggleDetails(detailsId) {
+            const detailsRow = document.getElementById(detailsId);
+            const button = document.getElementById('btn-' + detailsId);
             
-            // Log del orden después del sorting
-            console.log('Order after sorting:');
-            rows.forEach((row, index) => {
-                const cellValue = row.cells[columnIndex] ? row.cells[columnIndex].textContent.trim() : 'N/A';
-                console.log('Sorted row', index, ':', cellValue);
-            });
+            if (!detailsRow || !button) {
+                return;
+            }
             
-            // Reorganizar las filas en el DOM
-            console.log('Reorganizing rows in DOM...');
-            rows.forEach((row, index) => {
-                console.log('Moving row', index, 'to position', index);
-                tbody.appendChild(row);
-            });
+            const isOpening = detailsRow.style.display === 'none' || detailsRow.style.display === '';
             
-            // Verificar que el sorting funcionó
-            console.log('Final row order:');
-            const finalRows = Array.from(tbody.querySelectorAll('tr'));
-            finalRows.forEach((row, index) => {
-                const cellValue = row.cells[columnIndex] ? row.cells[columnIndex].textContent.trim() : 'N/A';
-                console.log('Row', index, ':', cellValue);
+            // Cerrar cualquier otro detalle abierto para mantener solo uno visible
+            const allDetailRows = document.querySelectorAll('.details-row');
+            allDetailRows.forEach(row => {
+                row.style.display = 'none';
+                const btn = document.getElementById('btn-' + row.id);
+                if (btn) {
+                    btn.textContent = 'View Details';
+                    btn.classList.remove('expanded');
+                }
             });
             
-            console.log('Table sorted by column', columnIndex, 'in', sortOrder, 'order');
-            window.dispatchEvent(new CustomEvent('paginationRefresh'));
+            if (isOpening) {
+                fillDetails(detailsRow);
+                detailsRow.style.display = 'table-row';
+                button.textContent = 'Hide Details';
+                button.classList.add('expanded');
+                // Desplazar suavemente la vista para que el inicio de la tarjeta
+                // (fila de detalles) quede alineado con la parte superior de la ventana
+                const rect = detailsRow.getBoundingClientRect();
+                const offset = 20; // pequeño margen desde el top
+                const targetY = window.scrollY + rect.top - offset;
+                window.scrollTo({
+                    top: Math.max(targetY, 0),
+                    behavior: 'smooth'
+                });
+            }
+        }
+        
+        function renderResultRow(columns, idx) {
+            const id = columns.id[idx];
+            const score = columns.score[idx];
+            const passed = columns.pass[idx] === 1;
+            const detailsId = 'details_' + id;
+            const hasDetails = columns.details[idx] !== null;
+            const button = hasDetails
+                ? '<button onclick="toggleDetails(\\'' + detailsId + '\\')" class="btn-details" id="btn-' + detailsId + '">View Details</button>'
+                : 'N/A';
+            
+            let html = '<tr class="result-row" data-candidate-id="' + id + '">'
+                + '<td class="candidate-id">' + id + '</td>'
+                + '<td class="score-cell ' + scoreClass(score) + '">' + score.toFixed(3) + '</td>'
+                + '<td class="status-cell ' + (passed ? 'success' : 'danger') + '">' + (passed ? '✓ PASS' : '✗ FAIL') + '</td>'
+                + '<td class="facts-cell">' + columns.facts[idx] + '/' + columns.total[idx] + '</td>'
+                + '<td class="date-cell">' + columns.date[idx] + '</td>'
+                + '<td class="actions-cell">' + button + '</td>'
+                + '</tr>';
+            if (hasDetails) {
+                html += '<tr id="' + detailsId + '" class="details-row" data-candidate-id="' + id + '" style="display: none;">'
+                    + '<td colspan="6"><div class="details-loading">Loading details...</div></td></tr>';
+            }
+            return html;
         }
         
-        // Asegurar que el DOM esté cargado
-        document.addEventListener('DOMContentLoaded', function() {
-            console.log('DOM loaded, sorting functions ready');
-        });
-        """
-
-    def _get_pagination_javascript(self) -> str:
-        """Genera el JavaScript para la paginación de la tabla."""
-        return """
         // Paginación
         (function() {
             function initPagination() {
-                const table = document.getElementById('resultsTable');
-                if (!table) return;
-                const tbody = table.querySelector('tbody');
+                const tbody = document.getElementById('resultsBody');
                 if (!tbody) return;
-
+                
                 let currentPage = 1;
                 let pageSize = parseInt(document.getElementById('pageSizeSelect')?.value || '25', 10);
-
-                function getResultRows() {
-                    return Array.from(tbody.querySelectorAll('tr.result-row'));
-                }
-
-                function getDetailsRow(resultRow) {
-                    let next = resultRow.nextElementSibling;
-                    while (next && !next.classList.contains('details-row')) {
-                        next = next.nextElementSibling;
-                    }
-                    return next;
+                
+                function getTotalCandidates() {
+                    return loadResultsData().order.length;
                 }
-
+                
                 function applyPagination() {
-                    const resultRows = getResultRows();
-                    const totalCandidates = resultRows.length;
-                    if (totalCandidates === 0) return;
-
+                    const state = loadResultsData();
+                    const totalCandidates = state.order.length;
+                    if (totalCandidates === 0) {
+                        tbody.innerHTML = '';
+                        updatePaginationUI(0, 1, -1, 0);
+                        return;
+                    }
+                    
                     const totalPages = Math.ceil(totalCandidates / pageSize) || 1;
                     currentPage = Math.min(Math.max(1, currentPage), totalPages);
                     const startIdx = (currentPage - 1) * pageSize;
                     const endIdx = Math.min(startIdx + pageSize, totalCandidates);
-
-                    resultRows.forEach((row, idx) => {
-                        const detailsRow = getDetailsRow(row);
-                        const visible = idx >= startIdx && idx < endIdx;
-                        row.style.display = visible ? '' : 'none';
-                        if (detailsRow) {
-                            detailsRow.style.display = visible ? 'none' : 'none';
-                            const btn = document.getElementById('btn-' + detailsRow.id);
-                            if (btn) {
-                                btn.textContent = 'View Details';
-                                btn.classList.remove('expanded');
-                            }
-                        }
-                    });
-
-                    updatePaginationUI(totalPages, startIdx, endIdx);
+                    
+                    const order = state.order;
+                    const last = order.length - 1;
+                    const descending = state.sortDir === 'desc';
+                    let html = '';
+                    for (let pos = startIdx; pos < endIdx; pos++) {
+                        html += renderResultRow(state.columns, order[descending ? last - pos : pos]);
+                    }
+                    tbody.innerHTML = html;
+                    
+                    updatePaginationUI(totalCandidates, totalPages, startIdx, endIdx);
                 }
-
-                function updatePaginationUI(totalPages, startIdx, endIdx) {
+                
+                function updatePaginationUI(totalCandidates, totalPages, startIdx, endIdx) {
                     const infoEl = document.getElementById('paginationInfo');
                     const pageNumbersEl = document.getElementById('pageNumbers');
                     if (infoEl) {
                         infoEl.textContent = 'Showing ' + (startIdx + 1) + '-' + endIdx + ' of ' + totalCandidates;
                     }
-
+                    
                     document.getElementById('btnFirst').disabled = currentPage <= 1;
                     document.getElementById('btnPrev').disabled = currentPage <= 1;
                     document.getElementById('btnNext').disabled = currentPage >= totalPages;
                     document.getElementById('btnLast').disabled = currentPage >= totalPages;
-
+                    
                     if (pageNumbersEl) {
                         const maxVisible = 5;
                         let startPage = Math.max(1, currentPage - Math.floor(maxVisible / 2));
@@ -1006,13 +2345,13 @@ class HTMLReporter:
                         });
                     }
                 }
-
+                
                 document.getElementById('pageSizeSelect')?.addEventListener('change', function() {
                     pageSize = parseInt(this.value, 10);
                     currentPage = 1;
                     applyPagination();
                 });
-
+                
                 document.getElementById('btnFirst')?.addEventListener('click', function() {
                     currentPage = 1;
                     applyPagination();
@@ -1024,24 +2363,22 @@ class HTMLReporter:
                     }
                 });
                 document.getElementById('btnNext')?.addEventListener('click', function() {
-                    const totalCandidates = getResultRows().length;
-                    const totalPages = Math.ceil(totalCandidates / pageSize) || 1;
+                    const totalPages = Math.ceil(getTotalCandidates() / pageSize) || 1;
                     if (currentPage < totalPages) {
                         currentPage++;
                         applyPagination();
                     }
                 });
                 document.getElementById('btnLast')?.addEventListener('click', function() {
-                    const totalCandidates = getResultRows().length;
-                    currentPage = Math.ceil(totalCandidates / pageSize) || 1;
+                    currentPage = Math.ceil(getTotalCandidates() / pageSize) || 1;
                     applyPagination();
                 });
-
+                
                 window.addEventListener('paginationRefresh', applyPagination);
-
+                
                 applyPagination();
             }
-
+            
             if (document.readyState === 'loading') {
                 document.addEventListener('DOMContentLoaded', initPagination);
             } else {
@@ -1049,14 +2386,13 @@ class HTMLReporter:
             }
         })();
         """
-
-    def _get_charts_javascript(self, results: List[Dict[str, Any]], metrics: Dict[str, Any]) -> str:
-        """Generates JavaScript for interactive charts."""
-        if not results:
+    
+    def _get_charts_javascript(self, results: Optional[List[Dict[str, Any]]], metrics: Dict[str, Any]) -> str:
+        """Generates JavaScript for interactive charts (only needs the metrics)."""
+        if not metrics['total_candidates']:
             return ""
         
         # Prepare data for charts
-        scores = [r.get('retention_score', 0.0) for r in results]
         passed_count = metrics['passed']
         failed_count = metrics['failed']
         
@@ -1064,18 +2400,14 @@ class HTMLReporter:
         temporal_data = self._get_temporal_data()
         comparison_data = self._get_comparison_data()
         
-        # Data for facts analysis
-        facts_data = []
-        facts_labels = []
-        for result in results:
-            test_name = result.get('test_name', 'Unknown')
-            facts_retained = result.get('facts_retained', 0)
-            total_facts = result.get('total_facts', 1)
-            facts_percentage = (facts_retained / total_facts) * 100 if total_facts > 0 else 0
-            facts_data.append(facts_percentage)
-            facts_labels.append(test_name[:20] + "..." if len(test_name) > 20 else test_name)
-        
         return f"""
+        // Sin Chart.js (CDN inaccesible y sin copia local) se ocultan los gráficos;
+        // la tabla ya quedó inicializada
+        if (typeof Chart === 'undefined') {{
+            document.querySelector('.charts-section').style.display = 'none';
+            throw new Error('Chart.js is not available: charts are disabled');
+        }}
+        
         // Real data for charts
         const temporalData = {json.dumps(temporal_data)};
         const comparisonData = {json.dumps(comparison_data)};
@@ -1224,8 +2556,8 @@ class HTMLReporter:
             }}
         }});
         
-        // Función para actualizar el target dinámicamente
-        function updateTarget(newTarget) {{
+        // Función para actualizar el target dinámicamente (global: la usa el input)
+        window.updateTarget = function (newTarget) {{
             currentTarget = parseFloat(newTarget);
             if (window.chartInstances.weeklyTrend) {{
                 const labels = window.chartInstances.weeklyTrend.data.labels;
@@ -1234,7 +2566,7 @@ class HTMLReporter:
                 window.chartInstances.weeklyTrend.data.datasets[1].label = 'Target (' + currentTarget + '%)';
                 window.chartInstances.weeklyTrend.update();
             }}
-        }}
+        }};
         
         // Gráfico de tendencia de similarity scores
         const similarityTrendCtx = document.getElementById('similarityTrendChart').getContext('2d');
@@ -1290,45 +2622,10 @@ class HTMLReporter:
             }}
         }});
         
+        {self._get_run_charts_javascript(metrics)}
+        
         // Variables globales para los gráficos (ya inicializadas arriba)
         
-        // Función para mostrar/ocultar detalles
-        function toggleDetails(detailsId) {{
-            const detailsRow = document.getElementById(detailsId);
-            const button = document.getElementById('btn-' + detailsId);
-            
-            if (!detailsRow || !button) {{
-                return;
-            }}
-            
-            const isOpening = detailsRow.style.display === 'none' || detailsRow.style.display === '';
-            
-            // Cerrar cualquier otro detalle abierto para mantener solo uno visible
-            const allDetailRows = document.querySelectorAll('.details-row');
-            allDetailRows.forEach(row => {{
-                row.style.display = 'none';
-                const btn = document.getElementById('btn-' + row.id);
-                if (btn) {{
-                    btn.textContent = 'View Details';
-                    btn.classList.remove('expanded');
-                }}
-            }});
-            
-            if (isOpening) {{
-                detailsRow.style.display = 'table-row';
-                button.textContent = 'Hide Details';
-                button.classList.add('expanded');
-                // Desplazar suavemente la vista para que el inicio de la tarjeta
-                // (fila de detalles) quede alineado con la parte superior de la ventana
-                const rect = detailsRow.getBoundingClientRect();
-                const offset = 20; // pequeño margen desde el top
-                const targetY = window.scrollY + rect.top - offset;
-                window.scrollTo({{
-                    top: Math.max(targetY, 0),
-                    behavior: 'smooth'
-                }});
-            }}
-        }}
         
         
         
@@ -1490,6 +2787,103 @@ class HTMLReporter:
         }}
         """
     
+    def _get_run_charts_javascript(self, metrics: Dict[str, Any]) -> str:
+        """Charts of this run, built from the aggregated series in metrics['charts']."""
+        if 'charts' not in metrics:
+            return ""
+        
+        return f"""// Series del run agregadas en Python (tamaño fijo)
+        const runCharts = {json.dumps(metrics['charts'])};
+        
+        new Chart(document.getElementById('scoreHistogramChart').getContext('2d'), {{
+            type: 'bar',
+            data: {{
+                labels: runCharts.histogram_labels,
+                datasets: [{{
+                    label: 'Candidates',
+                    data: runCharts.score_histogram,
+                    backgroundColor: '#667eea'
+                }}]
+            }},
+            options: {{
+                responsive: true,
+                animation: false,
+                plugins: {{ legend: {{ display: false }} }},
+                scales: {{ y: {{ beginAtZero: true }} }}
+            }}
+        }});
+        
+        new Chart(document.getElementById('factHistogramChart').getContext('2d'), {{
+            type: 'bar',
+            data: {{
+                labels: runCharts.histogram_labels,
+                datasets: [{{
+                    label: 'Candidates',
+                    data: runCharts.fact_retention_histogram,
+                    backgroundColor: '#28a745'
+                }}]
+            }},
+            options: {{
+                responsive: true,
+                animation: false,
+                plugins: {{ legend: {{ display: false }} }},
+                scales: {{ y: {{ beginAtZero: true }} }}
+            }}
+        }});
+        
+        // Serie reducida con LTTB: x es el id del candidato
+        new Chart(document.getElementById('scoreSeriesChart').getContext('2d'), {{
+            type: 'line',
+            data: {{
+                datasets: [{{
+                    label: 'Score',
+                    data: runCharts.score_series.ids.map((id, i) => ({{ x: id, y: runCharts.score_series.scores[i] }})),
+                    borderColor: '#667eea',
+                    borderWidth: 1,
+                    pointRadius: 0,
+                    fill: false
+                }}]
+            }},
+            options: {{
+                responsive: true,
+                animation: false,
+                parsing: false,
+                plugins: {{ legend: {{ display: false }} }},
+                scales: {{
+                    x: {{ type: 'linear', title: {{ display: true, text: 'Candidate' }} }},
+                    y: {{ beginAtZero: true, max: 1 }}
+                }}
+            }}
+        }});
+        
+        new Chart(document.getElementById('worstPerformersChart').getContext('2d'), {{
+            type: 'bar',
+            data: {{
+                labels: runCharts.worst_performers.labels,
+                datasets: [{{
+                    label: 'Score',
+                    data: runCharts.worst_performers.scores,
+                    backgroundColor: '#dc3545'
+                }}]
+            }},
+            options: {{
+                indexAxis: 'y',
+                responsive: true,
+                animation: false,
+                plugins: {{
+                    legend: {{ display: false }},
+                    tooltip: {{
+                        callbacks: {{
+                            title: function(items) {{
+                                return 'Candidate #' + runCharts.worst_performers.ids[items[0].dataIndex];
+                            }}
+                        }}
+                    }}
+                }},
+                scales: {{ x: {{ beginAtZero: true, max: 1 }} }}
+            }}
+        }});"""
+    
     def _get_score_class(self, score: float) -> str:
         """Obtiene la clase CSS para el score."""
         if score >= 0.9:
@@ -1532,6 +2926,20 @@ class HTMLReporter:
             padding: 20px;
         }
         
+        /* Reporte incremental: el resumen va al final del archivo y se muestra arriba */
+        .container.incremental-report {
+            display: flex;
+            flex-direction: column;
+        }
+        
+        .incremental-report > .report-header {
+            order: -2;
+        }
+        
+        .incremental-report > .charts-section {
+            order: -1;
+        }
+        
         .report-header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
@@ -1608,6 +3016,54 @@ class HTMLReporter:
             overflow-x: auto;
         }
         
+        .results-search {
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            margin-bottom: 15px;
+        }
+        
+        .search-input {
+            flex: 1;
+            max-width: 420px;
+            padding: 8px 12px;
+            border: 1px solid #ced4da;
+            border-radius: 4px;
+            font-size: 0.9rem;
+        }
+        
+        .search-info {
+            font-size: 0.9rem;
+            color: #6c757d;
+        }
+        
+        .page-navigation {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            margin-bottom: 20px;
+        }
+        
+        .page-nav-link {
+            color: #007bff;
+            text-decoration: none;
+            font-weight: 500;
+        }
+        
+        .page-nav-link:hover {
+            text-decoration: underline;
+        }
+        
+        .page-nav-info {
+            color: #6c757d;
+        }
+        
+        .details-loading {
+            padding: 15px;
+            color: #6c757d;
+            font-style: italic;
+        }
+        
         .pagination-controls {
             display: flex;
             justify-content: space-between;
@@ -2157,6 +3613,53 @@ class HTMLReporter:
         """
 
 
+def _render_shard(job: Dict[str, Any]) -> MetricsAccumulator:
+    """
+    Renders one page of a sharded report (also runs in worker processes).
+    
+    Returns:
+        MetricsAccumulator: Metrics of the page's results
+    """
+    reporter = HTMLReporter()
+    reporter.scenarios = ScenarioTable(job['timestamp'])
+    accumulator = reporter._accumulate(reporter._iter_normalized(job['results'], job['scenario']), job['first_id'])
+    reporter._write_page(
+        job['results'], Path(job['page_path']), accumulator.to_metrics(), job['title'],
+        job['show_details'], job['scenario'], job['chunk_size'], job['details_mode'],
+        first_id=job['first_id'], navigation=job['navigation'], include_charts=False, assets=job['assets']
+    )
+    return accumulator
+
+
+# State of each process of the row rendering pool (see _init_chunk_range_worker)
+_CHUNK_RANGE_CONTEXT = None
+
+
+def _init_chunk_range_worker(context: Dict[str, Any]) -> None:
+    """Receives the options and scenario state shared by every range, once per process."""
+    global _CHUNK_RANGE_CONTEXT
+    reporter = HTMLReporter()
+    reporter.scenarios = ScenarioTable.from_state(context['scenarios'])
+    details_dir = Path(context['details_dir']) if context['details_dir'] else None
+    _CHUNK_RANGE_CONTEXT = (reporter, context, details_dir)
+
+
+def _render_chunk_range(results: List[Dict[str, Any]], first_id: int, first_block: int) -> tuple:
+    """
+    Renders the data chunks of a contiguous range of results (runs in worker processes).
+    
+    Returns:
+        tuple: (HTML of the range's data chunks, ResultsIndex of its rows)
+    """
+    reporter, context, details_dir = _CHUNK_RANGE_CONTEXT
+    index = ResultsIndex()
+    fragments = reporter._iter_data_chunks(
+        reporter._iter_normalized(results, context['scenario']), index, context['show_details'],
+        context['chunk_size'], details_dir, first_id, first_block
+    )
+    return ''.join(fragments), index
+
+
 class ResultsHistory:
     """
     Manages historical validation results for temporal analysis.
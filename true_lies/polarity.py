@@ -6,6 +6,8 @@ Patrones de Polaridad Universales
 Patrones de polaridad para detectar sentimientos en el texto.
 """
 
+from .cache import memoize, text_hash, fingerprint
+
 # Patrones de polaridad universales
 POLARITY_PATTERNS = {
     'positive': [
@@ -51,6 +53,40 @@ POLARITY_PATTERNS = {
     ]
 }
 
+# Huella del léxico: (firma barata, huella), ver patterns_fingerprint
+_patterns_fingerprint = (None, None)
+
+
+def _patterns_signature():
+    """Firma barata del léxico: cambia al agregar o quitar patrones o reemplazar una lista."""
+    return tuple((polarity, id(patterns), len(patterns)) for polarity, patterns in POLARITY_PATTERNS.items())
+
+
+def patterns_fingerprint() -> str:
+    """
+    Huella de POLARITY_PATTERNS para las claves de caché.
+    
+    Se calcula al importar y solo se recalcula si cambia la firma del léxico
+    o tras invalidate_patterns_fingerprint() (para cambios que no la alteran,
+    como reemplazar un patrón por otro en el lugar).
+    """
+    global _patterns_fingerprint
+    signature = _patterns_signature()
+    if _patterns_fingerprint[0] != signature:
+        _patterns_fingerprint = (signature, fingerprint(POLARITY_PATTERNS))
+    return _patterns_fingerprint[1]
+
+
+def invalidate_patterns_fingerprint() -> None:
+    """Fuerza a recalcular la huella del léxico después de modificar POLARITY_PATTERNS."""
+    global _patterns_fingerprint
+    _patterns_fingerprint = (None, None)
+
+
+patterns_fingerprint()
+
+
+@memoize('detect_polarity', lambda text: (text_hash(text), patterns_fingerprint()))
 def detect_polarity(text):
     """
     Detecta la polaridad del texto basado en patrones predefinidos.
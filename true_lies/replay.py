@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Replay de Transcripciones de Producción
+=======================================
+
+Motor de replay que valida retención sobre logs de chat en JSONL, con
+turnos de muchas conversaciones intercalados y sin ordenar.
+
+Cada línea del log es un turno:
+    {"conversation_id": "c-1", "turn": 3, "user_input": "...",
+     "bot_response": "...", "expected_facts": {"loan_amount": "360000"}}
+
+El log se lee en streaming. Mientras entra en memoria, los turnos se agrupan
+por conversación en un dict; si supera max_records_in_memory (o si se piden
+varios workers), los turnos se particionan por hash del id de conversación
+en archivos temporales y cada partición se procesa por separado, opcionalmente
+en procesos paralelos. Una partición con más de max_records_in_memory turnos
+se vuelve a dividir antes de procesarla.
+
+Por conversación se reproducen todos los turnos menos el último con
+ConversationValidator y se valida la retención en la respuesta final del bot.
+Los resultados se escriben en streaming como JSONL.
+
+Uso básico:
+    from true_lies.replay import replay_transcripts
+    
+    summary = replay_transcripts('chats.jsonl', 'retention.jsonl',
+                                 facts_to_check=['client_name', 'loan_amount'],
+                                 workers=4)
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .conversation import ConversationValidator
+
+DEFAULT_MAX_RECORDS_IN_MEMORY = 100_000
+DEFAULT_PARTITIONS = 16
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Lee un archivo JSONL registro por registro (ignora líneas vacías)."""
+    with open(path, 'r', encoding='utf-8') as source:
+        for line in source:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _partition_of(conversation_id: Any, partitions: int, divisor: int = 1) -> int:
+    """
+    Partición estable entre procesos (hash() de Python no lo es).
+    
+    divisor > 1 usa los bits altos del hash, independientes de los que ya
+    eligieron la partición de origen al re-particionar.
+    """
+    return (zlib.crc32(str(conversation_id).encode('utf-8')) // divisor) % partitions
+
+
+def _bounded_partitions(path: str, count: int, id_field: str, max_records: int,
+                        divisor: int) -> List[str]:
+    """
+    Divide una partición con más de max_records turnos hasta que cada pieza entra en memoria.
+    
+    Una pieza que no se puede dividir (una sola conversación más larga que
+    el límite) se procesa entera.
+    """
+    if count <= max_records:
+        return [path]
+    pieces = 2 * -(-count // max_records)
+    source = Path(path)
+    piece_paths = [str(source.with_name(f'{source.stem}-{i:04d}.jsonl')) for i in range(pieces)]
+    counts = [0] * pieces
+    piece_files = [open(piece_path, 'w', encoding='utf-8') for piece_path in piece_paths]
+    try:
+        with open(path, 'r', encoding='utf-8') as partition:
+            for line in partition:
+                if not line.strip():
+                    continue
+                index = _partition_of(json.loads(line).get(id_field), pieces, divisor)
+                piece_files[index].write(line)
+                counts[index] += 1
+    finally:
+        for piece_file in piece_files:
+            piece_file.close()
+    
+    if max(counts) == count:
+        for piece_path in piece_paths:
+            os.remove(piece_path)
+        return [path]
+    os.remove(path)
+    bounded = []
+    for piece_path, piece_count in zip(piece_paths, counts):
+        bounded.extend(_bounded_partitions(piece_path, piece_count, id_field, max_records, divisor * pieces))
+    return bounded
+
+
+def _turn_order(turn: Any) -> tuple:
+    """
+    Clave de orden de un turno que admite tipos mezclados.
+    
+    Los números (y los strings numéricos, como "2") se ordenan por valor,
+    después el resto como texto y al final los turnos sin valor.
+    """
+    if turn is None:
+        return (2, 0.0, '')
+    try:
+        return (0, float(turn), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(turn))
+
+
+def replay_conversation(conversation_id: Any, records: List[Dict[str, Any]],
+                        config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reproduce una conversación y valida la retención en su último turno.
+    
+    Args:
+        conversation_id: Id de la conversación
+        records: Turnos de la conversación en orden de llegada
+        config: Configuración del replay (ver replay_transcripts)
+    
+    Returns:
+        dict: Resultado de la conversación (retention es None si tiene un solo turno)
+    """
+    turn_field = config['turn_field']
+    if turn_field:
+        records = sorted(records, key=lambda record: _turn_order(record.get(turn_field)))
+    
+    # El historial no se usa en el replay: una ventana de un turno acota la memoria
+    validator = ConversationValidator(
+        fact_types=config['fact_types'],
+        track_retention=config['track_retention'],
+        max_turns_in_memory=1
+    )
+    for record in records[:-1]:
+        validator.add_turn(record.get('user_input', ''), record.get('bot_response', ''),
+                           record.get('expected_facts') or {})
+    
+    result = {'conversation_id': conversation_id, 'turns': len(records), 'retention': None}
+    if len(records) < 2:
+        result['reason'] = 'Conversation has a single turn'
+        return result
+    
+    final = records[-1]
+    facts_to_check = config['facts_to_check'] or list(validator.conversation_facts)
+    result['retention'] = validator.validate_retention(final.get('bot_response', ''), facts_to_check)
+    
+    if config['track_retention']:
+        validator.add_turn(final.get('user_input', ''), final.get('bot_response', ''),
+                           final.get('expected_facts') or {})
+        curve = validator.get_retention_curve()
+        result['retention_curve'] = curve['curve']
+        result['forgotten_at'] = {name: info['forgotten_at'] for name, info in curve['facts'].items()}
+    return result
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {'conversations': 0, 'turns': 0, 'checked': 0, 'retention_sum': 0.0, 'all_retained': 0}
+
+
+def _add_stats(stats: Dict[str, Any], result: Dict[str, Any]) -> None:
+    stats['conversations'] += 1
+    stats['turns'] += result['turns']
+    if result['retention'] is not None:
+        stats['checked'] += 1
+        stats['retention_sum'] += result['retention']['retention_score']
+        stats['all_retained'] += 1 if result['retention']['all_retained'] else 0
+
+
+def _write_groups(groups: Dict[Any, List[Dict[str, Any]]], output, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Evalúa conversaciones agrupadas y escribe un resultado JSONL por conversación."""
+    stats = _new_stats()
+    for conversation_id, records in groups.items():
+        result = replay_conversation(conversation_id, records, config)
+        output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+        _add_stats(stats, result)
+    return stats
+
+
+def _replay_partition(partition_path: str, output_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Procesa una partición en disco (se ejecuta también en procesos worker)."""
+    groups = {}
+    for record in iter_jsonl(partition_path):
+        groups.setdefault(record.get(config['id_field']), []).append(record)
+    with open(output_path, 'w', encoding='utf-8') as output:
+        return _write_groups(groups, output, config)
+
+
+def replay_transcripts(source: Union[str, Path, Iterable[Dict[str, Any]]],
+                       output: Union[str, Path, Any],
+                       facts_to_check: Optional[List[str]] = None,
+                       workers: Optional[int] = None,
+                       max_records_in_memory: int = DEFAULT_MAX_RECORDS_IN_MEMORY,
+                       partitions: int = DEFAULT_PARTITIONS,
+                       id_field: str = 'conversation_id',
+                       turn_field: Optional[str] = 'turn',
+                       fact_types: Optional[Dict[str, str]] = None,
+                       track_retention: bool = False,
+                       tmp_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Valida retención sobre un log de turnos intercalados de muchas conversaciones.
+    
+    Args:
+        source: Ruta a un archivo JSONL o iterable de registros (dicts)
+        output: Ruta o archivo abierto donde escribir un resultado JSONL por conversación
+        facts_to_check: Facts a verificar en la respuesta final (None: todos los acumulados)
+        workers: Procesos para evaluar particiones en paralelo (None o 1: en este proceso)
+        max_records_in_memory: Turnos a agrupar en memoria antes de particionar en disco
+        partitions: Cantidad inicial de particiones en disco (las que superan
+            max_records_in_memory se vuelven a dividir)
+        id_field: Campo con el id de la conversación
+        turn_field: Campo con el orden del turno (los turnos sin él quedan al
+            final, en el orden del log; None: se usa el orden del log)
+        fact_types: Tipos explícitos por fact (ver ConversationValidator)
+        track_retention: Incluir curva de retención y 'forgotten_at' por conversación
+        tmp_dir: Directorio para las particiones temporales
+    
+    Returns:
+        dict: Resumen (conversaciones, turnos, particiones, retención media)
+    """
+    config = {
+        'facts_to_check': list(facts_to_check) if facts_to_check else None,
+        'id_field': id_field,
+        'turn_field': turn_field,
+        'fact_types': dict(fact_types or {}),
+        'track_retention': track_retention,
+    }
+    records = iter_jsonl(source) if isinstance(source, (str, Path)) else iter(source)
+    parallel = bool(workers and workers > 1)
+    
+    owns_output = isinstance(output, (str, Path))
+    output_file = open(output, 'w', encoding='utf-8') if owns_output else output
+    try:
+        with tempfile.TemporaryDirectory(prefix='true_lies_replay_', dir=tmp_dir) as workdir:
+            groups = {}
+            partition_files = None
+            buffered = 0
+            
+            for record in records:
+                conversation_id = record.get(id_field)
+                if partition_files is None:
+                    groups.setdefault(conversation_id, []).append(record)
+                    buffered += 1
+                    if buffered <= max_records_in_memory and not parallel:
+                        continue
+                    # Spill: a partir de aquí todo va a particiones en disco
+                    partition_files = [
+                        open(Path(workdir) / f'part-{i:04d}.jsonl', 'w', encoding='utf-8')
+                        for i in range(partitions)
+                    ]
+                    partition_counts = [0] * partitions
+                    for group_id, group in groups.items():
+                        index = _partition_of(group_id, partitions)
+                        for buffered_record in group:
+                            partition_files[index].write(json.dumps(buffered_record, ensure_ascii=False, default=str) + '\n')
+                        partition_counts[index] += len(group)
+                    groups = {}
+                    continue
+                index = _partition_of(conversation_id, partitions)
+                partition_files[index].write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                partition_counts[index] += 1
+            
+            if partition_files is None:
+                stats = _write_groups(groups, output_file, config)
+                used_partitions = 0
+            else:
+                # Las particiones con más de max_records_in_memory turnos se
+                # vuelven a dividir para que ninguna se cargue entera en memoria
+                partition_paths = []
+                for partition_file, count in zip(partition_files, partition_counts):
+                    partition_file.close()
+                    partition_paths.extend(_bounded_partitions(
+                        partition_file.name, count, id_field, max_records_in_memory, partitions
+                    ))
+                jobs = [
+                    (partition_path, str(Path(workdir) / f'result-{i:04d}.jsonl'))
+                    for i, partition_path in enumerate(partition_paths)
+                ]
+                if parallel:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        futures = [pool.submit(_replay_partition, part, out, config) for part, out in jobs]
+                        partition_stats = [future.result() for future in futures]
+                else:
+                    partition_stats = [_replay_partition(part, out, config) for part, out in jobs]
+                
+                stats = _new_stats()
+                for (_, result_path), part_stats in zip(jobs, partition_stats):
+                    for key in stats:
+                        stats[key] += part_stats[key]
+                    with open(result_path, 'r', encoding='utf-8') as part_output:
+                        shutil.copyfileobj(part_output, output_file)
+                used_partitions = len(jobs)
+    finally:
+        if owns_output:
+            output_file.close()
+    
+    checked = stats['checked']
+    return {
+        'conversations': stats['conversations'],
+        'turns': stats['turns'],
+        'checked_conversations': checked,
+        'partitions': used_partitions,
+        'mean_retention': stats['retention_sum'] / checked if checked else 0.0,
+        'all_retained_rate': stats['all_retained'] / checked if checked else 0.0,
+    }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Caché Persistente de Resultados
+===============================
+
+Caché en disco (SQLite) de resultados de validación, direccionada por
+contenido, para re-validaciones incrementales en CI.
+
+La clave es (huella del escenario, hash del candidato). La huella del
+escenario incluye hechos, referencia, mapeos, umbral, backend de similitud,
+versión de la librería y una huella del código de scoring, de modo que
+cualquier cambio en el código que calcula los resultados invalida la caché
+automáticamente.
+
+Uso básico:
+    from true_lies import validate_llm_candidates
+    from true_lies.result_cache import ResultCache
+    
+    with ResultCache('.true_lies_cache/results.sqlite') as cache:
+        validate_llm_candidates(scenario, candidates, result_cache=cache)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .cache import fingerprint
+
+# Incrementar manualmente ante cambios de semántica que no cambian el código
+# de los módulos de scoring (por ejemplo, datos externos).
+SCORING_VERSION = 1
+
+# Módulos cuyo código determina los resultados cacheados
+SCORING_MODULES = (
+    'validation_core.py',
+    'semantic.py',
+    'polarity.py',
+    'utils.py',
+    'extractors.py',
+    'backends.py',
+    'conversation.py',
+    'gazetteer.py',
+    'turn_history.py',
+)
+
+DEFAULT_CACHE_PATH = '.true_lies_cache/results.sqlite'
+
+# Máximo de parámetros por consulta IN (límite conservador de SQLite)
+_QUERY_CHUNK = 500
+
+
+@lru_cache(maxsize=1)
+def scoring_code_fingerprint() -> str:
+    """
+    Huella de la versión del código de scoring.
+    
+    Combina SCORING_VERSION, la versión de la librería y el contenido de
+    los módulos que calculan los resultados.
+    """
+    from . import __version__
+    
+    digest = hashlib.sha256(f"{SCORING_VERSION}:{__version__}".encode('utf-8'))
+    package_dir = Path(__file__).parent
+    for module_name in SCORING_MODULES:
+        module_path = package_dir / module_name
+        digest.update(module_name.encode('utf-8'))
+        if module_path.exists():
+            digest.update(module_path.read_bytes())
+    return digest.hexdigest()
+
+
+def _backend_id(backend: Any) -> str:
+    """Identificador estable del backend de similitud (incluye sus parámetros)."""
+    from .backends import resolve_backend
+    
+    backend = resolve_backend(backend)
+    if hasattr(backend, 'fingerprint'):
+        return backend.fingerprint()
+    return getattr(backend, 'name', type(backend).__name__)
+
+
+def scenario_fingerprint(scenario: Dict[str, Any], threshold: float, backend: Any = None) -> str:
+    """
+    Huella estable de un escenario de validación de candidatos.
+    
+    Args:
+        scenario: Escenario creado con create_scenario
+        threshold: Umbral de similitud
+        backend: Backend de similitud (nombre o instancia, opcional). Se
+            resuelve a la instancia que se usaría al validar, así la huella
+            cambia también con sus parámetros (ej: n_features).
+    """
+    if backend is None:
+        backend = scenario.get('similarity_backend')
+    return fingerprint({
+        'facts': scenario.get('facts', {}),
+        'semantic_reference': scenario.get('semantic_reference', ''),
+        'semantic_mappings': scenario.get('semantic_mappings', {}),
+        'threshold': threshold,
+        'backend': _backend_id(backend),
+        'code': scoring_code_fingerprint(),
+    })
+
+
+def conversation_fingerprint(turns: Sequence[Dict[str, Any]], facts_to_check: Sequence[str]) -> str:
+    """
+    Huella estable de una conversación de prueba (sin la respuesta final).
+    
+    Args:
+        turns: Turnos de la conversación (user_input, bot_response, expected_facts)
+        facts_to_check: Facts a verificar en la respuesta final
+    """
+    return fingerprint({
+        'turns': [
+            {
+                'user_input': turn.get('user_input', ''),
+                'bot_response': turn.get('bot_response', ''),
+                'expected_facts': turn.get('expected_facts', {}),
+            }
+            for turn in turns
+        ],
+        'facts_to_check': list(facts_to_check),
+        'code': scoring_code_fingerprint(),
+    })
+
+
+def candidate_hash(candidate: Any) -> str:
+    """Hash del contenido de un candidato."""
+    data = candidate if isinstance(candidate, str) else repr(candidate)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de resultados en SQLite, segura entre hilos.
+    
+    Al abrirse compara la huella del código de scoring con la guardada;
+    si cambió, descarta todas las entradas.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            path: Ruta del archivo SQLite
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' scenario_fp TEXT NOT NULL,'
+            ' candidate_hash TEXT NOT NULL,'
+            ' result TEXT NOT NULL,'
+            ' PRIMARY KEY (scenario_fp, candidate_hash)'
+            ') WITHOUT ROWID'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._invalidate_if_code_changed()
+    
+    def _invalidate_if_code_changed(self) -> None:
+        code_version = scoring_code_fingerprint()
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'code_version'").fetchone()
+            if row is None or row[0] != code_version:
+                self._conn.execute('DELETE FROM results')
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('code_version', ?)",
+                    (code_version,)
+                )
+                self._conn.commit()
+    
+    def get(self, scenario_fp: str, candidate: Any) -> Optional[Dict[str, Any]]:
+        """Devuelve el resultado cacheado o None."""
+        return self.get_many(scenario_fp, [candidate]).get(candidate_hash(candidate))
+    
+    def get_many(self, scenario_fp: str, candidates: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca varios candidatos de un mismo escenario.
+        
+        Returns:
+            dict: {candidate_hash: resultado} solo para los encontrados
+        """
+        hashes = list(dict.fromkeys(candidate_hash(c) for c in candidates))
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), _QUERY_CHUNK):
+                chunk = hashes[start:start + _QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT candidate_hash, result FROM results '
+                    f'WHERE scenario_fp = ? AND candidate_hash IN ({placeholders})',
+                    [scenario_fp, *chunk]
+                ).fetchall()
+                for key, payload in rows:
+                    found[key] = json.loads(payload)
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+    
+    def put(self, scenario_fp: str, candidate: Any, result: Dict[str, Any]) -> None:
+        """Guarda un resultado (se confirma en commit() o al cerrar)."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (scenario_fp, candidate_hash, result) VALUES (?, ?, ?)',
+                (scenario_fp, candidate_hash(candidate), json.dumps(result, ensure_ascii=False, default=str))
+            )
+            self._pending += 1
+    
+    def put_many(self, scenario_fp: str, items: Iterable[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Guarda varios pares (candidato, resultado) en una sola transacción."""
+        rows = [
+            (scenario_fp, candidate_hash(candidate), json.dumps(result, ensure_ascii=False, default=str))
+            for candidate, result in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO results (scenario_fp, candidate_hash, result) VALUES (?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+            self._pending = 0
+    
+    def commit(self) -> None:
+        """Confirma las escrituras pendientes."""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+    
+    def clear(self) -> None:
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._conn.execute('DELETE FROM results')
+            self._conn.commit()
+            self._pending = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos y fallos desde que se abrió la caché."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+    
+    def close(self) -> None:
+        """Confirma escrituras pendientes y cierra la conexión."""
+        self.commit()
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_result_cache(result_cache: Any) -> Tuple[Optional[ResultCache], bool]:
+    """
+    Normaliza el argumento result_cache de las APIs públicas.
+    
+    Acepta None, una ruta o una instancia de ResultCache.
+    
+    Returns:
+        tuple: (caché o None, True si fue abierta aquí y debe cerrarse)
+    """
+    if result_cache is None or result_cache is False:
+        return None, False
+    if isinstance(result_cache, ResultCache):
+        return result_cache, False
+    if result_cache is True:
+        return ResultCache(), True
+    return ResultCache(str(result_cache)), True
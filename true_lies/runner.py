@@ -2,13 +2,20 @@
 Runner for executing validation scenarios and printing formatted reports
 """
 
-from .validation_core import validate_against_reference_dynamic
+from .validation_core import (
+    component_fingerprints,
+    revalidate_candidates_batch,
+    semantic_metrics_from_result,
+    validate_candidates_batch,
+)
+from .dedup import deduplicate_candidates
 from .scenario import create_scenario
+from .result_cache import candidate_hash, open_result_cache, scenario_fingerprint
 import json
 from pathlib import Path
 
 
-def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_report=False, html_output_file=None, html_title=None):
+def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_report=False, html_output_file=None, html_title=None, backend=None, result_cache=None, previous_run=None, dedup=False, approximate=False, html_details_mode='inline', html_shard_size=None, html_workers=None, html_asset_mode='inline', html_chart_js=None):
     """
     Validates candidates using a scenario created with create_scenario and optionally generates HTML report.
     
@@ -19,6 +26,26 @@ def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_
         generate_html_report: Whether to generate HTML report automatically
         html_output_file: HTML output file path (default: auto-generated)
         html_title: HTML report title (default: auto-generated)
+        backend: Similarity backend name or instance (default: scenario's or global default)
+        result_cache: Optional persistent result cache (ResultCache instance or SQLite path).
+            Unchanged (scenario, candidate) pairs are read from it instead of re-validated.
+        previous_run: Optional result of an earlier validate_llm_candidates call. Candidates
+            it already covers only recompute the components (facts, semantic, polarity)
+            whose fingerprints changed since that run.
+        dedup: Validate exact duplicates (after normalize_text_advanced) once and fan the
+            result out; near-duplicates are clustered with MinHash + LSH and reported.
+        approximate: Implies dedup. Only cluster leaders get similarity scoring; the other
+            members reuse their leader's semantic score (facts and polarity are still
+            checked per candidate).
+        html_details_mode: 'inline' (details embedded in the report) or 'split' (details in
+            chunk files next to the report, loaded when a row is expanded)
+        html_shard_size: Results per report page; larger runs get an index page plus pages
+            of this size (default: single file)
+        html_workers: Processes rendering the report in parallel (pages of a sharded
+            report, or ranges of rows of a single file)
+        html_asset_mode: 'inline' (CSS/JS embedded in the report) or 'bundle' (shared
+            content-hashed asset files next to the report)
+        html_chart_js: Path of a local Chart.js build, for reports viewed offline
     
     Returns:
         dict: Validation results with optional HTML report path
@@ -37,14 +64,20 @@ def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_
         print(f"🗂️  Semantic Mapping: {len(scenario['semantic_mappings'])} synonym groups")
     print("-" * 80)
 
-    for i, candidate in enumerate(candidates, 1):
-        # Validate using the scenario
-        result = validate_against_reference_dynamic(
-            candidate_text=candidate,
-            reference_scenario=scenario,
-            similarity_threshold=threshold
+    dedup_plan = None
+    if dedup or approximate:
+        dedup_plan = deduplicate_candidates(candidates)
+        batch_results = _validate_deduplicated(
+            scenario, candidates, threshold, backend, result_cache, previous_run, dedup_plan, approximate
         )
-        
+        stats = dedup_plan['stats']
+        print(f"🔁 Dedup: {stats['unique']} unique of {stats['candidates']} "
+              f"({stats['exact_duplicates']} exact duplicates), "
+              f"{stats['multi_member_clusters']} near-duplicate clusters (largest: {stats['largest_cluster']})")
+    else:
+        batch_results = _validate_batch(scenario, candidates, threshold, backend, result_cache, previous_run)
+
+    for i, (candidate, result) in enumerate(zip(candidates, batch_results), 1):
         # Count results
         if result['factual_accuracy']:
             factual_pass += 1
@@ -52,17 +85,27 @@ def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_
             fully_valid += 1
         
         # Store result
-        results.append({
+        entry = {
             'index': i,
             'candidate': candidate,
             'result': result,
             'is_valid': result['is_valid']
-        })
+        }
+        if dedup_plan is not None:
+            entry.update(_dedup_fields(dedup_plan, i - 1))
+        results.append(entry)
         
         # Print formatted result with candidate text
         status = "✅ VALID" if result['is_valid'] else "❌ INVALID"
         print(f"Candidate {i}: {status} Similarity: {result['similarity_score']:.3f}")
         print(f"  📝 Text: {candidate}")
+        if dedup_plan is not None:
+            if entry['duplicate_of']:
+                print(f"  🔁 Duplicate of candidate {entry['duplicate_of']}")
+            elif entry['represents'] > 1:
+                print(f"  🔁 Represents {entry['represents']} candidates")
+            if entry['cluster_size'] > 1:
+                print(f"  🧩 Cluster {entry['cluster']} ({entry['cluster_size']} near-duplicates)")
         
         # Print factual details
         for fact_name in scenario['facts'].keys():
@@ -118,7 +161,12 @@ def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_
             output_file=html_output_file,
             title=html_title,
             scenario=scenario,
-            save_to_history=True
+            save_to_history=True,
+            details_mode=html_details_mode,
+            shard_size=html_shard_size,
+            workers=html_workers,
+            asset_mode=html_asset_mode,
+            chart_js=html_chart_js
         )
         
         print(f"\n📊 HTML REPORT GENERATED:")
@@ -133,10 +181,133 @@ def validate_llm_candidates(scenario, candidates, threshold=0.65, generate_html_
             'factual_accuracy': factual_pass/total_candidates,
             'overall_accuracy': fully_valid/total_candidates
         },
-        'html_report_path': html_report_path
+        'html_report_path': html_report_path,
+        'component_fingerprints': component_fingerprints(scenario, backend),
+        'dedup': dedup_plan['stats'] if dedup_plan is not None else None
+    }
+
+
+def _validate_batch(scenario, candidates, threshold, backend, result_cache, previous_run):
+    """Validates candidates through the previous run and/or the result cache."""
+    if previous_run is not None:
+        return _revalidate_previous_run(scenario, candidates, threshold, backend, result_cache, previous_run)
+    return _validate_with_result_cache(scenario, candidates, threshold, backend, result_cache)
+
+
+def _validate_deduplicated(scenario, candidates, threshold, backend, result_cache, previous_run, plan, approximate):
+    """
+    Validates one representative per exact-duplicate group and fans results out.
+    
+    In approximate mode only near-duplicate cluster leaders are scored by the
+    similarity backend; the other representatives reuse their leader's
+    semantic metrics and are marked with 'approximated'.
+    """
+    unique = plan['unique']
+    if approximate:
+        scored = [i for i in unique if plan['cluster_of'][i] == i]
+        followers = [i for i in unique if plan['cluster_of'][i] != i]
+    else:
+        scored, followers = unique, []
+    
+    unique_results = dict(zip(scored, _validate_batch(
+        scenario, [candidates[i] for i in scored], threshold, backend, result_cache, previous_run
+    )))
+    
+    if followers:
+        approximated = validate_candidates_batch(
+            [candidates[i] for i in followers], scenario, threshold, backend,
+            semantic_metrics=[semantic_metrics_from_result(unique_results[plan['cluster_of'][i]]) for i in followers]
+        )
+        for i, result in zip(followers, approximated):
+            result['approximated'] = True
+            unique_results[i] = result
+    
+    return [dict(unique_results[plan['exact_of'][i]]) for i in range(len(candidates))]
+
+
+def _dedup_fields(plan, position):
+    """Report fields describing which candidates a result stands for (1-based)."""
+    representative = plan['exact_of'][position]
+    leader = plan['cluster_of'][position]
+    return {
+        'represents': plan['exact_counts'][representative] if representative == position else 0,
+        'duplicate_of': representative + 1 if representative != position else None,
+        'cluster': leader + 1,
+        'cluster_size': len(plan['clusters'][leader]),
     }
 
 
+def _revalidate_previous_run(scenario, candidates, threshold, backend, result_cache, previous_run):
+    """
+    Re-validates candidates against an edited scenario, reusing a previous run.
+    
+    Candidates present in previous_run only recompute the components whose
+    fingerprints changed; new candidates go through the regular path.
+    """
+    previous_fingerprints = previous_run.get('component_fingerprints')
+    previous_by_text = {entry['candidate']: entry['result'] for entry in previous_run.get('results', [])}
+    
+    known = [i for i, candidate in enumerate(candidates) if candidate in previous_by_text]
+    new = [i for i, candidate in enumerate(candidates) if candidate not in previous_by_text]
+    batch_results = [None] * len(candidates)
+    
+    if known:
+        known_texts = [candidates[i] for i in known]
+        revalidated, summary = revalidate_candidates_batch(
+            known_texts, [previous_by_text[text] for text in known_texts],
+            previous_fingerprints, scenario, threshold, backend
+        )
+        for i, result in zip(known, revalidated):
+            batch_results[i] = result
+        recomputed = list(summary['recomputed_facts'])
+        if summary['semantic_recomputed']:
+            recomputed.append('semantic')
+        if summary['polarity_recomputed']:
+            recomputed.append('polarity')
+        print(f"♻️  Previous run: {len(known)} candidates reused, recomputed: {', '.join(recomputed) or 'nothing'}")
+    
+    if new:
+        fresh = _validate_with_result_cache(scenario, [candidates[i] for i in new], threshold, backend, result_cache)
+        for i, result in zip(new, fresh):
+            batch_results[i] = result
+    
+    return batch_results
+
+
+def _validate_with_result_cache(scenario, candidates, threshold, backend, result_cache):
+    """
+    Validates candidates, reusing results stored in the persistent cache.
+    
+    Only candidates missing from the cache are validated, all together in
+    one batch so the similarity backend encodes the reference once.
+    """
+    cache, owns_cache = open_result_cache(result_cache)
+    if cache is None:
+        return validate_candidates_batch(candidates, scenario, threshold, backend)
+    
+    try:
+        scenario_fp = scenario_fingerprint(scenario, threshold, backend)
+        cached = cache.get_many(scenario_fp, candidates)
+        hashes = [candidate_hash(candidate) for candidate in candidates]
+        
+        pending = {}
+        for key, candidate in zip(hashes, candidates):
+            if key not in cached and key not in pending:
+                pending[key] = candidate
+        
+        if pending:
+            fresh = validate_candidates_batch(list(pending.values()), scenario, threshold, backend)
+            cache.put_many(scenario_fp, zip(pending.values(), fresh))
+            cached.update(zip(pending.keys(), fresh))
+        
+        print(f"💾 Result cache: {len(candidates) - len(pending)} reused, {len(pending)} validated")
+        # Each candidate gets its own copy so callers can annotate results freely
+        return [dict(cached[key]) for key in hashes]
+    finally:
+        if owns_cache:
+            cache.close()
+
+
 def run_validation_scenario(scenario_name, reference_text, reference_values, candidates, threshold=0.7, domain=None, semantic_path=None, field_configs=None):
     """
     Legacy function for backward compatibility.
@@ -6,7 +6,7 @@ Factory Function para Crear Escenarios Dinámicos
 Funciones para crear y manejar escenarios de validación.
 """
 
-def create_scenario(facts, semantic_reference, semantic_mappings=None):
+def create_scenario(facts, semantic_reference, semantic_mappings=None, similarity_backend=None):
     """
     Factory function para crear escenarios dinámicos.
     
@@ -14,12 +14,17 @@ def create_scenario(facts, semantic_reference, semantic_mappings=None):
         facts: Diccionario con hechos configurados
         semantic_reference: Texto de referencia semántica
         semantic_mappings: Mapeos semánticos (opcional)
+        similarity_backend: Nombre del backend de similitud (opcional,
+            por defecto se usa el backend global)
     
     Returns:
         dict: Escenario configurado
     """
-    return {
+    scenario = {
         'facts': facts,
         'semantic_reference': semantic_reference,
         'semantic_mappings': semantic_mappings or {}
     }
+    if similarity_backend:
+        scenario['similarity_backend'] = similarity_backend
+    return scenario
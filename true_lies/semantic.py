@@ -6,6 +6,10 @@ Funciones Semánticas
 Funciones para manejo de mapeos semánticos y similitud.
 """
 
+from .cache import memoize, text_hash, config_fingerprint
+
+
+@memoize('apply_semantic_mappings', lambda text, mappings: (text_hash(text), config_fingerprint(mappings)))
 def apply_semantic_mappings(text, mappings):
     """
     Aplica mapeos semánticos para normalizar sinónimos en el texto.
@@ -165,6 +169,10 @@ def calculate_semantic_similarity(text1, text2, fact_weights=None):
     return metrics["final_score"]
 
 
+@memoize(
+    'calculate_semantic_similarity_metrics',
+    lambda text1, text2, fact_weights=None: (text_hash(text1), text_hash(text2), config_fingerprint(fact_weights)),
+)
 def calculate_semantic_similarity_metrics(text1, text2, fact_weights=None):
     """
     Calcula la similitud semántica y devuelve todas las métricas intermedias.
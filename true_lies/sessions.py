@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Almacén de Sesiones de Conversación
+===================================
+
+Mantiene un ConversationValidator por sesión para validar junto a un
+chatbot en vivo, con memoria acotada.
+
+Cuando se supera el límite (cantidad de sesiones o tamaño estimado en
+bytes), las sesiones inactivas se desalojan en orden LRU a disco (con
+ConversationValidator.to_bytes) y se restauran de forma transparente la
+próxima vez que se piden.
+
+Uso básico:
+    from true_lies import ConversationSessionStore
+    
+    store = ConversationSessionStore(max_sessions=1000, storage_dir='.sessions')
+    
+    with store.session(session_id) as conv:
+        conv.add_turn(user_input, bot_response, expected_facts)
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .conversation import ConversationValidator
+
+
+def estimate_validator_size(validator: ConversationValidator) -> int:
+    """
+    Tamaño aproximado en bytes de un validador.
+    
+    Suma el tamaño de los facts acumulados y de los turnos en memoria;
+    no pretende ser exacto, solo proporcional al consumo real.
+    """
+    size = sys.getsizeof(validator.conversation_facts)
+    for name, value in validator.conversation_facts.items():
+        size += sys.getsizeof(name) + sys.getsizeof(value)
+    for turn in validator.turn_history.iter_in_memory():
+        size += sys.getsizeof(turn.user_input) + sys.getsizeof(turn.bot_response)
+        size += sys.getsizeof(turn.expected_facts) + sys.getsizeof(turn.extracted_facts)
+    return size
+
+
+class ConversationSessionStore:
+    """
+    Sesiones de conversación con desalojo LRU a disco, seguro entre hilos.
+    
+    Las sesiones en uso dentro de session() quedan fijadas y no se desalojan.
+    Las sesiones desalojadas se serializan con el lock global tomado y se
+    escriben a disco fuera de él: mientras tanto la sesión puede volver a
+    pedirse y se recupera de memoria.
+    """
+    
+    def __init__(self, max_sessions: Optional[int] = None, max_bytes: Optional[int] = None,
+                 storage_dir: Optional[str] = None,
+                 validator_factory: Callable[[], ConversationValidator] = ConversationValidator):
+        """
+        Args:
+            max_sessions: Sesiones a mantener en memoria (None: sin límite)
+            max_bytes: Tamaño estimado total en memoria (None: sin límite)
+            storage_dir: Directorio para las sesiones desalojadas
+                (por defecto, un directorio temporal)
+            validator_factory: Crea el validador de una sesión nueva
+        """
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.validator_factory = validator_factory
+        self._storage_dir = Path(storage_dir) if storage_dir else None
+        self._lock = threading.RLock()
+        self._sessions = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._pinned = {}
+        # Lock exclusivo por sesión -> [lock, hilos que lo usan o esperan]
+        self._session_locks = {}
+        # Sesiones desalojadas que se están escribiendo -> (validador, marca)
+        self._writing = {}
+        # Sesiones en disco -> clase del validador a restaurar
+        self._on_disk = {}
+        self.hits = 0
+        self.restores = 0
+        self.evictions = 0
+    
+    # ------------------------------------------------------------------
+    # Acceso
+    # ------------------------------------------------------------------
+    
+    def get(self, session_id: Any) -> ConversationValidator:
+        """
+        Devuelve el validador de una sesión (restaurándolo o creándolo si hace falta).
+        
+        El validador devuelto no queda fijado: otra llamada puede desalojarlo
+        a disco y los cambios que se le hagan después no se guardan. Para
+        modificar la sesión usar session(), que la fija mientras dura el
+        bloque, da acceso exclusivo entre hilos y actualiza su tamaño
+        estimado al terminar.
+        """
+        with self._lock:
+            validator = self._load(session_id)
+            victims = self._claim_victims()
+        self._write_evicted(victims)
+        return validator
+    
+    @contextmanager
+    def session(self, session_id: Any) -> Iterator[ConversationValidator]:
+        """
+        Context manager que entrega el validador de una sesión con acceso exclusivo.
+        
+        Mientras dura el bloque la sesión no se desaloja; al salir se
+        actualiza su tamaño estimado y se aplican los límites. El lock de la
+        sesión existe solo mientras algún hilo lo usa o lo espera.
+        """
+        with self._lock:
+            entry = self._session_locks.get(session_id)
+            if entry is None:
+                entry = self._session_locks[session_id] = [threading.RLock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                with self._lock:
+                    validator = self._load(session_id)
+                    self._pinned[session_id] = self._pinned.get(session_id, 0) + 1
+                try:
+                    yield validator
+                finally:
+                    with self._lock:
+                        self._pinned[session_id] -= 1
+                        if not self._pinned[session_id]:
+                            del self._pinned[session_id]
+                        if session_id in self._sessions:
+                            self._set_size(session_id, estimate_validator_size(validator))
+                        victims = self._claim_victims()
+                    self._write_evicted(victims)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._session_locks[session_id]
+    
+    def _load(self, session_id: Any) -> ConversationValidator:
+        """Obtiene la sesión de memoria, de disco o la crea (con el lock tomado)."""
+        validator = self._sessions.get(session_id)
+        if validator is not None:
+            self._sessions.move_to_end(session_id)
+            self.hits += 1
+            return validator
+        if session_id in self._writing:
+            # Desalojo en curso: se cancela y la sesión sigue en memoria
+            validator = self._writing.pop(session_id)[0]
+            self.hits += 1
+        elif session_id in self._on_disk:
+            path = self._path_for(session_id)
+            validator = self._on_disk.pop(session_id).from_bytes(path.read_bytes())
+            path.unlink()
+            self.restores += 1
+        else:
+            validator = self.validator_factory()
+        self._sessions[session_id] = validator
+        self._set_size(session_id, estimate_validator_size(validator))
+        return validator
+    
+    def _set_size(self, session_id: Any, size: Optional[int]) -> None:
+        """Actualiza el tamaño estimado de una sesión (None: la quita)."""
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+        if size is not None:
+            self._sizes[session_id] = size
+            self._total_bytes += size
+    
+    # ------------------------------------------------------------------
+    # Desalojo
+    # ------------------------------------------------------------------
+    
+    def _path_for(self, session_id: Any) -> Path:
+        if self._storage_dir is None:
+            self._storage_dir = Path(tempfile.mkdtemp(prefix='true_lies_sessions_'))
+        self._storage_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(repr(session_id).encode('utf-8')).hexdigest()
+        return self._storage_dir / f'{digest}.session'
+    
+    def _over_limits(self) -> bool:
+        if self.max_sessions is not None and len(self._sessions) > self.max_sessions:
+            return True
+        if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+            return True
+        return False
+    
+    def _claim_victims(self) -> List[tuple]:
+        """Saca de memoria las sesiones no fijadas a desalojar, de la menos a la más reciente."""
+        victims = []
+        while self._over_limits():
+            victim = next((sid for sid in self._sessions if sid not in self._pinned), None)
+            if victim is None:
+                break
+            victims.append(self._claim(victim))
+        return victims
+    
+    def _claim(self, session_id: Any) -> tuple:
+        """
+        Quita una sesión de memoria y la marca como en escritura (con el lock tomado).
+        
+        La sesión se serializa acá, con el lock tomado: apenas se suelta,
+        _load puede cancelar el desalojo y entregar el validador a otro hilo
+        que lo modifique mientras se escribe.
+        """
+        validator = self._sessions[session_id]
+        data = validator.to_bytes()
+        del self._sessions[session_id]
+        self._set_size(session_id, None)
+        token = object()
+        self._writing[session_id] = (validator, token)
+        return session_id, type(validator), data, token, self._path_for(session_id)
+    
+    def _write_evicted(self, victims: List[tuple]) -> None:
+        """
+        Escribe en disco las sesiones desalojadas (ya serializadas), sin el lock global.
+        
+        Cada sesión se escribe en un archivo temporal que reemplaza al
+        definitivo solo si su desalojo sigue vigente (no se volvió a pedir
+        ni se eliminó mientras tanto).
+        """
+        for session_id, validator_class, data, token, path in victims:
+            temporary = path.with_name(f'{path.name}.{id(token):x}.tmp')
+            temporary.write_bytes(data)
+            with self._lock:
+                current = self._writing.get(session_id)
+                if current is not None and current[1] is token:
+                    del self._writing[session_id]
+                    os.replace(temporary, path)
+                    self._on_disk[session_id] = validator_class
+                    self.evictions += 1
+                    continue
+            temporary.unlink()
+    
+    def evict(self, session_id: Any) -> bool:
+        """
+        Guarda una sesión en disco y la quita de memoria.
+        
+        Returns:
+            bool: True si la sesión estaba en memoria y se desalojó
+        """
+        with self._lock:
+            if session_id not in self._sessions or session_id in self._pinned:
+                return False
+            victim = self._claim(session_id)
+        self._write_evicted([victim])
+        return True
+    
+    def remove(self, session_id: Any) -> None:
+        """Elimina una sesión (de memoria y de disco)."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._writing.pop(session_id, None)
+            self._set_size(session_id, None)
+            if session_id in self._on_disk:
+                self._path_for(session_id).unlink(missing_ok=True)
+                del self._on_disk[session_id]
+    
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    
+    def __contains__(self, session_id: Any) -> bool:
+        with self._lock:
+            return session_id in self._sessions or session_id in self._writing or session_id in self._on_disk
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions) + len(self._writing) + len(self._on_disk)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Sesiones en memoria y en disco, bytes estimados y contadores."""
+        with self._lock:
+            return {
+                'in_memory': len(self._sessions),
+                'on_disk': len(self._on_disk),
+                'estimated_bytes': self._total_bytes,
+                'hits': self.hits,
+                'restores': self.restores,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Historial Compacto de Turnos
+============================
+
+Registro compacto de turnos (Turn, con __slots__ y nombres de facts
+internados) y un historial con ventana acotada para sesiones largas.
+
+El historial guarda en memoria solo los últimos K turnos; los anteriores se
+descartan o, si se configura un archivo de spill, se agregan a un log JSONL
+en disco desde donde pueden volver a leerse.
+
+Uso básico:
+    from true_lies import ConversationValidator
+    
+    conv = ConversationValidator(max_turns_in_memory=200, spill_path='session.turns.jsonl')
+"""
+
+import json
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+def _intern_keys(facts: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia un dict de facts con los nombres internados (se comparten entre turnos)."""
+    return {sys.intern(name) if isinstance(name, str) else name: value for name, value in facts.items()}
+
+
+class Turn:
+    """
+    Un turno de la conversación.
+    
+    Admite acceso tipo dict (turn['user_input']) para mantener compatibilidad
+    con el historial anterior basado en diccionarios.
+    """
+    
+    __slots__ = ('index', 'user_input', 'bot_response', 'expected_facts', 'extracted_facts')
+    
+    FIELDS = ('user_input', 'bot_response', 'expected_facts', 'extracted_facts')
+    
+    def __init__(self, index: int, user_input: str, bot_response: str,
+                 expected_facts: Dict[str, Any], extracted_facts: Dict[str, Any]):
+        """
+        Args:
+            index: Número de turno (desde 1)
+            user_input: Entrada del usuario
+            bot_response: Respuesta del bot
+            expected_facts: Facts esperados del turno
+            extracted_facts: Facts detectados en el turno
+        """
+        self.index = index
+        self.user_input = user_input
+        self.bot_response = bot_response
+        self.expected_facts = _intern_keys(expected_facts)
+        self.extracted_facts = _intern_keys(extracted_facts)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+    
+    def keys(self):
+        return self.FIELDS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación como diccionario (formato del historial anterior)."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    @classmethod
+    def from_dict(cls, index: int, data: Dict[str, Any]) -> 'Turn':
+        return cls(index, data['user_input'], data['bot_response'],
+                   data.get('expected_facts', {}), data.get('extracted_facts', {}))
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Turn):
+            return self.index == other.index and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"Turn(index={self.index}, user_input={self.user_input[:30]!r}, facts={list(self.extracted_facts)})"
+
+
+class TurnHistory:
+    """
+    Historial de turnos con ventana acotada en memoria.
+    
+    len() devuelve el total de turnos de la conversación y la iteración recorre
+    todos los disponibles (primero el log en disco, luego la memoria), así que
+    con spill_path ambos coinciden. Sin spill_path los turnos que salen de la
+    ventana se descartan: la iteración empieza en first_in_memory y len()
+    sigue contándolos. El acceso por índice funciona para cualquier turno en
+    memoria o en el log.
+    """
+    
+    def __init__(self, max_turns_in_memory: Optional[int] = None, spill_path: Optional[str] = None):
+        """
+        Args:
+            max_turns_in_memory: Turnos a mantener en memoria (None: todos)
+            spill_path: Log JSONL donde guardar los turnos que salen de la ventana
+                (None: se descartan). El archivo se reinicia al crear el historial.
+        """
+        if max_turns_in_memory is not None and max_turns_in_memory < 1:
+            raise ValueError("max_turns_in_memory must be at least 1")
+        self.max_turns_in_memory = max_turns_in_memory
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._turns = deque()
+        self._total = 0
+        self._first_in_memory = 1
+        # Offsets de cada turno en el log (8 bytes por turno)
+        self._offsets = array('q')
+        if self.spill_path:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self.spill_path.write_text('', encoding='utf-8')
+    
+    def append(self, turn: Turn) -> None:
+        """Agrega un turno, desalojando el más antiguo si la ventana está llena."""
+        self._turns.append(turn)
+        self._total += 1
+        if self.max_turns_in_memory is not None and len(self._turns) > self.max_turns_in_memory:
+            self._spill(self._turns.popleft())
+            self._first_in_memory += 1
+    
+    def _spill(self, turn: Turn) -> None:
+        if self.spill_path is None:
+            return
+        line = json.dumps(turn.to_dict(), ensure_ascii=False, default=str) + '\n'
+        with open(self.spill_path, 'ab') as log:
+            self._offsets.append(log.tell())
+            log.write(line.encode('utf-8'))
+    
+    def _read_spilled(self, index: int) -> Turn:
+        with open(self.spill_path, 'rb') as log:
+            log.seek(self._offsets[index - 1])
+            return Turn.from_dict(index, json.loads(log.readline()))
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def __bool__(self) -> bool:
+        return self._total > 0
+    
+    def __iter__(self) -> Iterator[Turn]:
+        return self.iter_all()
+    
+    def __getitem__(self, position: int) -> Turn:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._total))]
+        if position < 0:
+            position += self._total
+        if not 0 <= position < self._total:
+            raise IndexError("turn index out of range")
+        index = position + 1
+        if index >= self._first_in_memory:
+            return self._turns[index - self._first_in_memory]
+        if self.spill_path is None:
+            raise IndexError(f"turn {index} was dropped from memory (configure spill_path to keep it)")
+        return self._read_spilled(index)
+    
+    def iter_all(self) -> Iterator[Turn]:
+        """Recorre todos los turnos disponibles: primero el log en disco, luego la memoria."""
+        if self.spill_path is not None and self._offsets:
+            with open(self.spill_path, 'rb') as log:
+                for index, line in enumerate(log, 1):
+                    if index >= self._first_in_memory:
+                        break
+                    yield Turn.from_dict(index, json.loads(line))
+        yield from self._turns
+    
+    def iter_in_memory(self) -> Iterator[Turn]:
+        """Recorre solo los turnos en memoria (sin leer el log en disco)."""
+        return iter(self._turns)
+    
+    @property
+    def in_memory(self) -> int:
+        """Cantidad de turnos en memoria."""
+        return len(self._turns)
+    
+    @property
+    def first_in_memory(self) -> int:
+        """Número del turno más antiguo en memoria."""
+        return self._first_in_memory
+    
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Estado serializable (JSON) del historial.
+        
+        Incluye los turnos en memoria; los del log en disco se referencian
+        por ruta y offsets, sin copiarlos.
+        """
+        return {
+            'max_turns_in_memory': self.max_turns_in_memory,
+            'spill_path': str(self.spill_path) if self.spill_path else None,
+            'total': self._total,
+            'first_in_memory': self._first_in_memory,
+            'offsets': self._offsets.tolist(),
+            'turns': [[getattr(turn, field) for field in Turn.FIELDS] for turn in self._turns],
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TurnHistory':
+        """Restaura un historial exportado con export_state (sin reiniciar el log)."""
+        history = cls(state['max_turns_in_memory'])
+        history.spill_path = Path(state['spill_path']) if state['spill_path'] else None
+        history._total = state['total']
+        history._first_in_memory = state['first_in_memory']
+        history._offsets = array('q', state['offsets'])
+        history._turns = deque(
+            Turn(index, *fields) for index, fields in enumerate(state['turns'], state['first_in_memory'])
+        )
+        return history
+    
+    def clear(self) -> None:
+        """Vacía el historial (y el log en disco)."""
+        self._turns.clear()
+        self._total = 0
+        self._first_in_memory = 1
+        self._offsets = array('q')
+        if self.spill_path:
+            self.spill_path.write_text('', encoding='utf-8')
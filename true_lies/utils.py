@@ -9,6 +9,8 @@ Solo contiene extractores genéricos y la función extract_fact como en la image
 import re
 from difflib import SequenceMatcher
 
+from .cache import memoize, text_hash, config_fingerprint
+
 # ============================================================================
 # EXTRACTORES GENÉRICOS REUTILIZABLES
 # ============================================================================
@@ -490,6 +492,7 @@ GENERIC_EXTRACTORS = {
 # FUNCIÓN PRINCIPAL DE EXTRACCIÓN
 # ============================================================================
 
+@memoize('extract_fact', lambda text, fact_config: (text_hash(text), config_fingerprint(fact_config)))
 def extract_fact(text, fact_config):
     """
     Extrae un hecho específico del texto usando un extractor configurado.
@@ -4,13 +4,82 @@ Validación Dinámica Basada en Hechos Configurados, Semántica y Polaridad
 ========================================================================
 
 Función principal de validación como se muestra en las imágenes.
+
+La validación se divide en componentes independientes (cada hecho, el
+componente semántico y la polaridad). Cada componente tiene una huella
+de su configuración, lo que permite re-validar un run guardado contra un
+escenario editado recalculando solo los componentes que cambiaron.
 """
 
 from .utils import extract_fact
-from .semantic import apply_semantic_mappings, calculate_semantic_similarity_metrics
-from .polarity import detect_polarity
+from .semantic import apply_semantic_mappings
+from .polarity import detect_polarity, patterns_fingerprint
+from .backends import resolve_backend
+from .cache import fingerprint
+
+
+def compile_scenario(reference_scenario, backend=None):
+    """
+    Precalcula todo lo que depende solo del escenario.
+    
+    Un escenario compilado puede pasarse a las funciones de validación en
+    lugar del escenario original para no repetir este trabajo por candidato.
+    
+    Args:
+        reference_scenario: Escenario creado con create_scenario
+        backend: Backend de similitud (nombre o instancia). Si es None se usa
+            el del escenario ('similarity_backend') o el backend por defecto.
+    
+    Returns:
+        dict: Escenario compilado
+    """
+    if reference_scenario.get('_compiled'):
+        return reference_scenario
+    
+    if backend is None:
+        backend = reference_scenario.get('similarity_backend')
+    backend = resolve_backend(backend)
+    
+    facts = reference_scenario['facts']
+    semantic_reference = reference_scenario['semantic_reference']
+    mappings = reference_scenario.get('semantic_mappings', {})
+    fact_weights = _build_fact_weights(facts)
+    backend_id = backend.fingerprint() if hasattr(backend, 'fingerprint') else getattr(backend, 'name', type(backend).__name__)
+    
+    return {
+        '_compiled': True,
+        'scenario': reference_scenario,
+        'facts': facts,
+        'semantic_reference': semantic_reference,
+        'reference_text': semantic_reference.lower(),
+        'semantic_mappings': mappings,
+        'fact_weights': fact_weights,
+        'backend': backend,
+        'reference_polarity': detect_polarity(semantic_reference),
+        'fingerprints': {
+            'facts': {name: fingerprint(config) for name, config in facts.items()},
+            'semantic': fingerprint({
+                'reference': semantic_reference,
+                'mappings': mappings,
+                'fact_weights': fact_weights,
+                'backend': backend_id,
+            }),
+            'polarity': patterns_fingerprint(),
+        },
+    }
 
-def validate_against_reference_dynamic(candidate_text, reference_scenario, similarity_threshold=0.8):
+
+def component_fingerprints(reference_scenario, backend=None):
+    """
+    Huellas por componente de un escenario.
+    
+    Returns:
+        dict: {'facts': {fact_name: huella}, 'semantic': huella, 'polarity': huella}
+    """
+    return compile_scenario(reference_scenario, backend)['fingerprints']
+
+
+def validate_against_reference_dynamic(candidate_text, reference_scenario, similarity_threshold=0.8, backend=None):
     """
     Validación dinámica basada en hechos configurados, semántica y polaridad.
     
@@ -18,38 +87,136 @@ def validate_against_reference_dynamic(candidate_text, reference_scenario, simil
         candidate_text: Texto candidato a validar
         reference_scenario: Escenario de referencia con hechos y mapeos
         similarity_threshold: Umbral de similitud (default: 0.8)
+        backend: Backend de similitud (nombre o instancia). Si es None se usa
+            el del escenario ('similarity_backend') o el backend por defecto.
     
     Returns:
         dict: Resultados de la validación
     """
-    facts = reference_scenario['facts']
-    fact_results = {}
+    return validate_candidates_batch(
+        [candidate_text], reference_scenario, similarity_threshold, backend
+    )[0]
+
+
+def validate_candidates_batch(candidate_texts, reference_scenario, similarity_threshold=0.8, backend=None, semantic_metrics=None):
+    """
+    Valida varios candidatos contra el mismo escenario.
     
-    # Validar cada hecho configurado
-    for fact_name, fact_config in facts.items():
-        extracted = extract_fact(candidate_text, fact_config)
-        expected = fact_config['expected']
-        
-        # Calcular precisión
-        if isinstance(extracted, list):
-            accuracy = expected in extracted
-        else:
-            accuracy = extracted == expected
-        
-        fact_results[f'{fact_name}_accuracy'] = accuracy
-        fact_results[f'extracted_{fact_name}'] = extracted
+    El componente semántico se calcula con una única llamada
+    score_batch al backend, de modo que los backends vectoriales
+    codifican la referencia una sola vez por lote.
     
-    # Precisión factual general
-    factual_accuracy = all(fact_results.get(f'{name}_accuracy', False) for name in facts.keys())
+    Args:
+        candidate_texts: Lista de textos candidatos
+        reference_scenario: Escenario de referencia (o escenario compilado)
+        similarity_threshold: Umbral de similitud (default: 0.8)
+        backend: Backend de similitud (nombre o instancia, opcional)
+        semantic_metrics: Métricas semánticas ya calculadas, una por candidato
+            (opcional). Si se pasan, no se llama al backend.
+    
+    Returns:
+        list: Un diccionario de resultados por candidato, en el mismo orden
+    """
+    compiled = compile_scenario(reference_scenario, backend)
+    facts = compiled['facts']
+    
+    if semantic_metrics is None:
+        semantic_metrics_list = _score_semantic(candidate_texts, compiled)
+    else:
+        semantic_metrics_list = semantic_metrics
+    
+    results = []
+    for text, semantic_metrics in zip(candidate_texts, semantic_metrics_list):
+        fact_results = {}
+        for fact_name, fact_config in facts.items():
+            _evaluate_fact(text, fact_name, fact_config, fact_results)
+        results.append(_assemble_result(
+            fact_results, facts, semantic_metrics,
+            compiled['reference_polarity'], detect_polarity(text), similarity_threshold
+        ))
+    return results
+
+
+def revalidate_candidates_batch(candidate_texts, previous_results, previous_fingerprints,
+                                reference_scenario, similarity_threshold=0.8, backend=None):
+    """
+    Re-valida resultados guardados contra un escenario (posiblemente editado).
+    
+    Solo se recalculan los componentes cuya huella cambió respecto de
+    previous_fingerprints; el resto se reutiliza de previous_results.
+    El umbral no tiene huella: cambiarlo solo recalcula la decisión final.
+    
+    Args:
+        candidate_texts: Textos candidatos (los mismos que produjeron previous_results)
+        previous_results: Resultados anteriores, uno por candidato
+        previous_fingerprints: Huellas por componente del run anterior
+        reference_scenario: Escenario actual (o escenario compilado)
+        similarity_threshold: Umbral de similitud (default: 0.8)
+        backend: Backend de similitud (nombre o instancia, opcional)
+    
+    Returns:
+        tuple: (resultados, resumen de componentes recalculados)
+    """
+    compiled = compile_scenario(reference_scenario, backend)
+    facts = compiled['facts']
+    current = compiled['fingerprints']
+    previous_fingerprints = previous_fingerprints or {}
+    previous_fact_fps = previous_fingerprints.get('facts', {})
     
-    # Similitud semántica con mapeos y pesos de hechos
-    reference_text = reference_scenario['semantic_reference'].lower()
-    candidate_mapped = apply_semantic_mappings(
-        candidate_text, 
-        reference_scenario.get('semantic_mappings', {})
-    )
+    changed_facts = [name for name in facts if previous_fact_fps.get(name) != current['facts'][name]]
+    semantic_changed = previous_fingerprints.get('semantic') != current['semantic']
+    polarity_changed = previous_fingerprints.get('polarity') != current['polarity']
     
-    # Crear pesos de hechos basados en los valores extraídos
+    if semantic_changed:
+        semantic_metrics_list = _score_semantic(candidate_texts, compiled)
+    else:
+        semantic_metrics_list = [semantic_metrics_from_result(r) for r in previous_results]
+    
+    results = []
+    for text, previous, semantic_metrics in zip(candidate_texts, previous_results, semantic_metrics_list):
+        fact_results = {}
+        for fact_name, fact_config in facts.items():
+            if fact_name in changed_facts:
+                _evaluate_fact(text, fact_name, fact_config, fact_results)
+            else:
+                fact_results[f'{fact_name}_accuracy'] = previous[f'{fact_name}_accuracy']
+                fact_results[f'extracted_{fact_name}'] = previous[f'extracted_{fact_name}']
+        
+        candidate_polarity = detect_polarity(text) if polarity_changed else previous['candidate_polarity']
+        results.append(_assemble_result(
+            fact_results, facts, semantic_metrics,
+            compiled['reference_polarity'], candidate_polarity, similarity_threshold
+        ))
+    
+    summary = {
+        'recomputed_facts': changed_facts,
+        'reused_facts': [name for name in facts if name not in changed_facts],
+        'semantic_recomputed': semantic_changed,
+        'polarity_recomputed': polarity_changed,
+    }
+    return results, summary
+
+
+def _score_semantic(candidate_texts, compiled):
+    """Similitud semántica con mapeos y pesos de hechos (en lote)."""
+    mappings = compiled['semantic_mappings']
+    candidates_mapped = [apply_semantic_mappings(text, mappings) for text in candidate_texts]
+    return compiled['backend'].score_batch(compiled['reference_text'], candidates_mapped, compiled['fact_weights'])
+
+
+def semantic_metrics_from_result(result):
+    """Reconstruye las métricas semánticas guardadas en un resultado."""
+    return {
+        'final_score': result['similarity_score'],
+        'precision': result.get('semantic_precision', 0.0),
+        'recall': result.get('semantic_recall', 0.0),
+        'token_f1': result.get('semantic_f1', 0.0),
+        'sequence_score': result.get('semantic_sequence_score', 0.0),
+    }
+
+
+def _build_fact_weights(facts):
+    """Crea pesos de hechos basados en los valores esperados."""
     fact_weights = {}
     for fact_name, fact_config in facts.items():
         expected_value = fact_config.get('expected', '')
@@ -62,21 +229,38 @@ def validate_against_reference_dynamic(candidate_text, reference_scenario, simil
                 for word in expected_value.lower().split():
                     if len(word) > 2:  # Solo palabras significativas
                         fact_weights[word] = 1.5
+    return fact_weights
+
+
+def _evaluate_fact(candidate_text, fact_name, fact_config, fact_results):
+    """Extrae un hecho y guarda su precisión en fact_results."""
+    extracted = extract_fact(candidate_text, fact_config)
+    expected = fact_config['expected']
     
-    semantic_metrics = calculate_semantic_similarity_metrics(reference_text, candidate_mapped, fact_weights)
-    similarity_score = semantic_metrics["final_score"]
+    # Calcular precisión
+    if isinstance(extracted, list):
+        accuracy = expected in extracted
+    else:
+        accuracy = extracted == expected
+    
+    fact_results[f'{fact_name}_accuracy'] = accuracy
+    fact_results[f'extracted_{fact_name}'] = extracted
+
+
+def _assemble_result(fact_results, facts, semantic_metrics, reference_polarity, candidate_polarity, similarity_threshold):
+    """Combina hechos, métricas semánticas y polaridad en el resultado final."""
+    # Precisión factual general
+    factual_accuracy = all(fact_results.get(f'{name}_accuracy', False) for name in facts.keys())
     
-    # Validación de polaridad con lógica personalizada
-    reference_polarity = detect_polarity(reference_scenario['semantic_reference'])
-    candidate_polarity = detect_polarity(candidate_text)
+    similarity_score = semantic_metrics["final_score"]
     
-    # Lógica de polaridad personalizada:
+    # Validación de polaridad con lógica personalizada:
     # Falla cuando:
     # 1. Se esperaba positivo y se encuentra negativo
-    # 2. Se esperaba negativo y se encuentra positivo  
+    # 2. Se esperaba negativo y se encuentra positivo
     # 3. Se esperaba negativo y se encuentra neutral
     # 4. Se esperaba neutral y se encuentra negativo
-    # 
+    #
     # Pasa cuando:
     # - Se esperaba positivo y da neutral (permisivo)
     # - Se esperaba neutral y da positivo (permisivo)